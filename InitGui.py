@@ -106,6 +106,7 @@ class WorkFeatureWorkbench(Workbench):
             # import WF_centerCirclePoint
             import WF_centerFacePoint
             import WF_projectedPoint
+            import WF_wireStationsPoint
             # import WF_pointFacePoint
             # import WF_lineFacePoint
 
@@ -114,6 +115,7 @@ class WorkFeatureWorkbench(Workbench):
 
             import WF_threePointsPlane
             import WF_linePointPlane
+            import WF_nPointsPlane
             # import WF_perpendicularLinePointPlane
         except ImportError:
             m_error = "Error: One of WF_ module not found,"
@@ -130,6 +132,7 @@ class WorkFeatureWorkbench(Workbench):
                                       "ShowHideInteractive",
                                       "ShowHideNo",
                                       "Refresh",
+                                      "PerformanceReport",
                                       ]
         self.appendCommandbar("General", self.General_commands_list)
         self.appendMenu(self.General_menu, self.General_commands_list)
@@ -146,7 +149,8 @@ class WorkFeatureWorkbench(Workbench):
                                     "CenterFacePoint",
                                     # "PointFacePoint",
                                     # "LineFacePoint",
-                                    "ProjectedPoint"
+                                    "ProjectedPoint",
+                                    "WireStationsPoint"
                                     ]
         self.appendCommandbar("Points", self.Point_commands_list)
         self.appendMenu(self.Point_menu, self.Point_commands_list)
@@ -167,6 +171,7 @@ class WorkFeatureWorkbench(Workbench):
                              "Planes"]
         self.m_Plane_commands_list = ["ThreePointsPlane",   # done but to test
                                       "LinePointPlane",  # done but to test
+                                      "NPointsPlane",
                                       # "PerpendicularLinePointPlane",
                                       ]
         self.appendCommandbar("Planes", self.m_Plane_commands_list)
@@ -194,11 +199,16 @@ class WorkFeatureWorkbench(Workbench):
         App.Console.PrintMessage(m_msg + "\n")
         m_msg = "WorkFeature Release is : {0:s}".format(str(WF_Release))
         App.Console.PrintMessage(m_msg + "\n")
+        # Classify the selection as the user selects
+        if WF.selectionObserver():
+            import WF_selection
+            WF_selection.startObserver()
 
     def Deactivated(self):
         """ Run when the workbench is deactivated.
         """
-        # do something here if needed...
+        import WF_selection
+        WF_selection.stopObserver()
         m_msg = "WorkFeature workbench Deactivated !"
         App.Console.PrintMessage(m_msg + "\n")
 
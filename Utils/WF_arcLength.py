@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Arc length parameterization of (curved) Edges.
+
+The cumulative length of an Edge is tabulated once at M_SAMPLES regular
+parameters (Gauss-Legendre quadrature of |C'(u)| on each interval).
+The parameter at a given distance along the Edge is then found by a
+binary search into the table, refined by a few Newton steps on the
+exact curve. The distance of a point along the Edge (distanceOf) uses
+Newton steps on the closest point condition, bracketed by the table
+samples around the closest one (the Edge needs derivative2At).
+Tables are cached per Edge (see getArcLengthTable), so thousands of
+stations on the same Edge cost one table build plus cheap lookups.
+
+>>> m_table = getArcLengthTable(edge)
+>>> m_points = m_table.pointsAt([0.0, 2.5, 5.0])        # (3,3) array
+>>> m_points = m_table.pointsAtFractions([0.5])         # middle of edge
+"""
+from collections import OrderedDict
+import numpy as np
+import WF
+
+###############
+# Number of intervals of the tables
+M_SAMPLES = 64
+# Maximum number of Newton steps of a lookup
+M_NEWTON_ITERATIONS = 4
+# Maximum number of tables kept into the cache
+M_CACHE_SIZE = 256
+###############
+# Gauss-Legendre 3 points on [0, 1]
+_GAUSS_X = 0.5 + 0.5 * np.array([-np.sqrt(0.6), 0.0, np.sqrt(0.6)])
+_GAUSS_W = np.array([5.0, 8.0, 5.0]) / 18.0
+# Edge key -> ArcLengthTable
+_TABLES = OrderedDict()
+
+
+def setSamples(value):
+    """ Sets the number of intervals of new tables.
+    """
+    global M_SAMPLES
+    M_SAMPLES = max(int(value), 1)
+
+
+def getSamples():
+    """ Returns the number of intervals of new tables.
+    """
+    return M_SAMPLES
+
+
+def setCacheSize(value):
+    """ Sets the maximum number of tables kept into the cache
+    (0 disables the cache).
+    """
+    global M_CACHE_SIZE
+    M_CACHE_SIZE = max(int(value), 0)
+    while len(_TABLES) > M_CACHE_SIZE:
+        _TABLES.popitem(last=False)
+
+
+def getCacheSize():
+    """ Returns the maximum number of tables kept into the cache.
+    """
+    return M_CACHE_SIZE
+
+
+def clearTables():
+    """ Empties the cache of tables.
+    """
+    _TABLES.clear()
+
+
+def _toArray(vector):
+    return np.array([vector[0], vector[1], vector[2]], dtype=float)
+
+
+class ArcLengthTable():
+    """ Cumulative length table of an Edge.
+
+    *edge*    : the Edge (any curve with valueAt and derivative1At).
+    *samples* : number of intervals of the table (M_SAMPLES by default).
+    """
+
+    def __init__(self, edge, samples=None):
+        if samples is None:
+            samples = M_SAMPLES
+        self.edge = edge
+        self.first = edge.FirstParameter
+        self.last = edge.LastParameter
+        self.params = np.linspace(self.first, self.last, samples + 1)
+        self.step = self.params[1] - self.params[0]
+        m_lengths = [self._partial(m_i, self.params[m_i + 1])
+                     for m_i in range(samples)]
+        self.lengths = np.concatenate(([0.0], np.cumsum(m_lengths)))
+        self.length = self.lengths[-1]
+        self.points = np.array([_toArray(edge.valueAt(m_u))
+                                for m_u in self.params])
+
+    def _speed(self, param):
+        return self.edge.derivative1At(param).Length
+
+    def _partial(self, index, param):
+        """ Length of the Edge in between params[index] and param.
+        """
+        m_start = self.params[index]
+        m_du = param - m_start
+        return m_du * sum(m_w * self._speed(m_start + m_x * m_du)
+                          for m_x, m_w in zip(_GAUSS_X, _GAUSS_W))
+
+    def _interval(self, params):
+        m_index = np.searchsorted(self.params, params, side='right') - 1
+        return np.clip(m_index, 0, len(self.params) - 2)
+
+    def lengthAt(self, params):
+        """ Returns the distances along the Edge (from FirstParameter)
+        of the given parameters, as a (N,) array.
+        """
+        m_params = np.clip(np.asarray(params, dtype=float).reshape(-1),
+                           self.first, self.last)
+        m_index = self._interval(m_params)
+        return np.array([self.lengths[m_i] + self._partial(m_i, m_u)
+                         for m_i, m_u in zip(m_index, m_params)])
+
+    def parameterAt(self, distances):
+        """ Returns the parameters at the given distances along the Edge
+        (from FirstParameter), as a (N,) array.
+        The distances are clamped to [0, length].
+        """
+        m_dist = np.clip(np.asarray(distances, dtype=float).reshape(-1),
+                         0.0, self.length)
+        # Binary search into the table then linear interpolation
+        m_index = np.clip(
+            np.searchsorted(self.lengths, m_dist, side='right') - 1,
+            0, len(self.params) - 2)
+        m_ds = self.lengths[m_index + 1] - self.lengths[m_index]
+        m_ratio = np.where(m_ds > 0.0,
+                           (m_dist - self.lengths[m_index]) /
+                           np.where(m_ds > 0.0, m_ds, 1.0),
+                           0.0)
+        m_params = self.params[m_index] + m_ratio * self.step
+
+        # Local Newton refinement on the exact curve
+        m_tolerance = max(WF.tolerance(), 1e-12 * self.length)
+        for m_k, (m_i, m_d) in enumerate(zip(m_index, m_dist)):
+            m_u = m_params[m_k]
+            for _ in range(M_NEWTON_ITERATIONS):
+                m_error = self.lengths[m_i] + self._partial(m_i, m_u) - m_d
+                if abs(m_error) <= m_tolerance:
+                    break
+                m_speed = self._speed(m_u)
+                if m_speed == 0.0:
+                    break
+                m_u = min(max(m_u - m_error / m_speed, self.params[m_i]),
+                          self.params[m_i + 1])
+            m_params[m_k] = m_u
+        return m_params
+
+    def pointsAt(self, distances):
+        """ Returns the points at the given distances along the Edge
+        (from FirstParameter), as a (N,3) array.
+        """
+        return np.array([_toArray(self.edge.valueAt(m_u))
+                         for m_u in self.parameterAt(distances)]
+                        ).reshape(-1, 3)
+
+    def pointsAtFractions(self, fractions):
+        """ Returns the points at the given fractions of the length
+        of the Edge (0.5 is the middle), as a (N,3) array.
+        """
+        return self.pointsAt(np.asarray(fractions, dtype=float) *
+                             self.length)
+
+    def distanceOf(self, point):
+        """ Returns the distance along the Edge (from FirstParameter)
+        of the point of the Edge closest to point (App.Vector or triplet).
+        """
+        m_point = _toArray(point)
+        # Closest sample of the table : the closest point is in between
+        # its neighbouring samples
+        m_delta = self.points - m_point
+        m_k = int(np.argmin(np.einsum('ij,ij->i', m_delta, m_delta)))
+        m_low = self.params[max(m_k - 1, 0)]
+        m_high = self.params[min(m_k + 1, len(self.params) - 1)]
+        m_u = self._closestParameter(m_point, self.params[m_k],
+                                     m_low, m_high)
+        return float(self.lengthAt([m_u])[0])
+
+    def _slope(self, point, param):
+        """ Returns f(u) = (C(u) - point).C'(u) (half the derivative of
+        the squared distance to point) and its derivative
+        f'(u) = C'(u).C'(u) + (C(u) - point).C''(u).
+        """
+        m_delta = _toArray(self.edge.valueAt(param)) - point
+        m_d1 = _toArray(self.edge.derivative1At(param))
+        m_d2 = _toArray(self.edge.derivative2At(param))
+        return m_delta.dot(m_d1), m_d1.dot(m_d1) + m_delta.dot(m_d2)
+
+    def _closestParameter(self, point, param, low, high):
+        """ Returns the parameter in [low, high] of the point of the Edge
+        closest to point, from param : Newton steps on f(u) = 0 (see
+        _slope), kept into the bracket by bisection.
+        """
+        m_f_low = self._slope(point, low)[0]
+        m_f_high = self._slope(point, high)[0]
+        # The distance only grows (or only decreases) on the bracket
+        if m_f_low >= 0.0:
+            return low
+        if m_f_high <= 0.0:
+            return high
+        m_tolerance = 1e-12 * (self.last - self.first)
+        m_u = param
+        for _ in range(8 * M_NEWTON_ITERATIONS):
+            m_f, m_df = self._slope(point, m_u)
+            if m_f == 0.0:
+                break
+            if m_f < 0.0:
+                low = m_u
+            else:
+                high = m_u
+            m_next = m_u - m_f / m_df if m_df > 0.0 else low - 1.0
+            if not low < m_next < high:
+                m_next = 0.5 * (low + high)
+            m_step = m_next - m_u
+            m_u = m_next
+            if abs(m_step) <= m_tolerance:
+                break
+        return m_u
+
+
+def getArcLengthTable(edge):
+    """ Returns the (cached) arc length table of the Edge.
+    """
+    m_key = (edge.hashCode(), edge.FirstParameter, edge.LastParameter,
+             M_SAMPLES)
+    m_table = _TABLES.get(m_key)
+    if m_table is None:
+        m_table = ArcLengthTable(edge)
+        if M_CACHE_SIZE == 0:
+            return m_table
+        _TABLES[m_key] = m_table
+        while len(_TABLES) > M_CACHE_SIZE:
+            _TABLES.popitem(last=False)
+    else:
+        _TABLES.move_to_end(m_key)
+    return m_table
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Batch (NumPy) versions of the WF_geometry helpers.
+
+All functions work on (N,3) arrays of points/directions and return
+arrays of results together with a boolean validity mask, so thousands
+of points can be processed in one call instead of one App.Vector at a time.
+Tolerance semantics are the same as WF_geometry (i.e. WF.tolerance()).
+"""
+import numpy as np
+import FreeCAD as App
+import WF
+
+
+def _tolerance(tolerance):
+    if tolerance is None:
+        return WF.tolerance()
+    return tolerance
+
+
+def toArray(vectors):
+    """ Return a (N,3) float array from a list of App.Vector (or triplets).
+    """
+    if isinstance(vectors, np.ndarray):
+        return vectors.astype(float).reshape(-1, 3)
+    m_list = [(v[0], v[1], v[2]) for v in vectors]
+    return np.array(m_list, dtype=float).reshape(-1, 3)
+
+
+def toVectors(array, mask=None):
+    """ Return a list of App.Vector from a (N,3) array.
+    If a mask is given, None is returned for the invalid rows.
+    """
+    m_array = np.asarray(array, dtype=float).reshape(-1, 3)
+    if mask is None:
+        return [App.Vector(x, y, z) for x, y, z in m_array.tolist()]
+    return [App.Vector(x, y, z) if m_valid else None
+            for (x, y, z), m_valid in zip(m_array.tolist(), mask.tolist())]
+
+
+def edgesEndPoints(edges):
+    """ Return the first points, last points and lengths of a list of edges.
+
+    RETURN:
+    -------
+    starts, ends, lengths : ((N,3) array, (N,3) array, (N,) array)
+    """
+    m_num = len(edges)
+    starts = np.empty((m_num, 3))
+    ends = np.empty((m_num, 3))
+    lengths = np.empty(m_num)
+    for m_i, m_edge in enumerate(edges):
+        vector_a = m_edge.Vertexes[0].Point
+        vector_b = m_edge.Vertexes[-1].Point
+        starts[m_i] = (vector_a.x, vector_a.y, vector_a.z)
+        ends[m_i] = (vector_b.x, vector_b.y, vector_b.z)
+        lengths[m_i] = m_edge.Length
+    return starts, ends, lengths
+
+
+def isEqualVectorsBatch(vects_a, vects_b, tolerance=None):
+    """ Return a mask, True where the 2 points are equal.
+    """
+    m_tolerance = _tolerance(tolerance)
+    m_diff = np.abs(toArray(vects_b) - toArray(vects_a))
+    return np.all(m_diff <= m_tolerance, axis=1)
+
+
+def isColinearVectorsBatch(vects_a, vects_b, vects_c, tolerance=None):
+    """ Return a mask, True where the 3 points are aligned.
+    """
+    m_tolerance = _tolerance(tolerance)
+    m_a = toArray(vects_a)
+    vector_1 = toArray(vects_b) - m_a
+    vector_2 = toArray(vects_c) - toArray(vects_b)
+    vector_3 = np.cross(vector_1, vector_2)
+    return np.all(np.abs(vector_3) <= m_tolerance, axis=1)
+
+
+def alongTwoPointsPointBatch(vects_a, vects_b, index, number):
+    """ Return the points at index/number of the Lines defined by
+    vects_a and vects_b.
+    index and number can be scalars or (N,) arrays.
+
+    RETURN:
+    -------
+    points, valid : ((N,3) array, (N,) boolean array)
+    valid is False for null Lines (the first point is returned).
+    """
+    m_a = toArray(vects_a)
+    m_ab = toArray(vects_b) - m_a
+    m_length = np.sqrt(np.einsum('ij,ij->i', m_ab, m_ab))
+    m_index = np.broadcast_to(np.asarray(index, dtype=float), m_length.shape)
+    m_number = np.broadcast_to(np.asarray(number, dtype=float), m_length.shape)
+
+    distance = m_length / 2
+    m_div = m_number != 0
+    distance = np.where(m_div,
+                        m_index * m_length / np.where(m_div, m_number, 1.0),
+                        distance)
+    valid = m_length > 0.0
+    m_scale = np.where(valid, distance / np.where(valid, m_length, 1.0), 0.0)
+    return m_a + m_ab * m_scale[:, np.newaxis], valid
+
+
+def alongLinePointBatch(starts, ends, lengths, index, number, tolerance=None):
+    """ Return the points at index/number of the Lines.
+    starts, ends, lengths are the first points, last points and
+    lengths of the Lines (see edgesEndPoints).
+    index and number can be scalars or (N,) arrays.
+
+    RETURN:
+    -------
+    points, valid : ((N,3) array, (N,) boolean array)
+    valid is False when first and last points are equal.
+    """
+    m_a = toArray(starts)
+    m_ab = toArray(ends) - m_a
+    m_lengths = np.asarray(lengths, dtype=float).reshape(-1)
+    m_chord = np.sqrt(np.einsum('ij,ij->i', m_ab, m_ab))
+    m_index = np.broadcast_to(np.asarray(index, dtype=float), m_chord.shape)
+    m_number = np.broadcast_to(np.asarray(number, dtype=float), m_chord.shape)
+
+    distance = m_chord / 2
+    m_div = m_number != 0
+    distance = np.where(m_div,
+                        m_index * m_lengths / np.where(m_div, m_number, 1.0),
+                        distance)
+    valid = np.logical_not(isEqualVectorsBatch(m_a, ends, tolerance))
+    valid &= m_chord > 0.0
+    m_scale = np.where(valid, distance / np.where(valid, m_chord, 1.0), 0.0)
+    return m_a + m_ab * m_scale[:, np.newaxis], valid
+
+
+def intersecLinePlaneBatch(vects_a, vects_b, plane_normals, plane_points,
+                           tolerance=None):
+    """ Return the intersections between the Lines defined by vects_a
+    and vects_b and the Planes defined by plane_normals and plane_points.
+
+    RETURN:
+    -------
+    points, valid : ((N,3) array, (N,) boolean array)
+    valid is False for null Lines and for Lines parallel to the Plane
+    without intersection.
+    If the full Line is included in the Plane, the first point is returned.
+    """
+    m_a = toArray(vects_a)
+    m_u = toArray(vects_b) - m_a
+    m_n = np.broadcast_to(toArray(plane_normals), m_a.shape)
+    m_p = np.broadcast_to(toArray(plane_points), m_a.shape)
+
+    # Plane Equation: a * x + b * y + c * z + d = 0
+    m_d = -np.einsum('ij,ij->i', m_n, m_p)
+    m_na = np.einsum('ij,ij->i', m_n, m_a) + m_d
+    m_nu = np.einsum('ij,ij->i', m_n, m_u)
+
+    valid = np.logical_not(isEqualVectorsBatch(m_a, vects_b, tolerance))
+    m_cross = m_nu != 0.0
+    m_k = np.where(m_cross, -m_na / np.where(m_cross, m_nu, 1.0), 0.0)
+    points = m_a + m_u * m_k[:, np.newaxis]
+    # Line parallel to the Plane: valid only if included into the Plane
+    valid &= m_cross | (m_na == 0.0)
+    return points, valid
+
+
+def projectPointPlaneBatch(points, plane_normal, plane_point):
+    """ Return the orthogonal projections of points onto the Plane
+    defined by plane_normal and plane_point, as a (N,3) array.
+    """
+    m_p = toArray(points)
+    m_n = toArray([plane_normal])[0]
+    m_o = toArray([plane_point])[0]
+    m_nn = m_n.dot(m_n)
+    if m_nn == 0.0:
+        raise ValueError("Null normal of the projection plane !")
+    m_k = (m_p - m_o).dot(m_n) / m_nn
+    return m_p - np.outer(m_k, m_n)
+
+
+def closestPointsSegmentsBatch(vects_a, vects_b, vects_c, vects_d):
+    """ Return the closest points between the segments [vects_a, vects_b]
+    and [vects_c, vects_d] (see WF_geometry.closestPointsSegments).
+    The segments [vects_a, vects_b] must not be null.
+
+    RETURN:
+    -------
+    points_p, points_q : ((N,3) array, (N,3) array)
+    the points on [vects_a, vects_b] and on [vects_c, vects_d].
+    """
+    m_a = toArray(vects_a)
+    m_c = np.broadcast_to(toArray(vects_c), m_a.shape)
+    m_d1 = np.broadcast_to(toArray(vects_b), m_a.shape) - m_a
+    m_d2 = np.broadcast_to(toArray(vects_d), m_a.shape) - m_c
+    m_r = m_a - m_c
+    a = np.einsum('ij,ij->i', m_d1, m_d1)
+    e = np.einsum('ij,ij->i', m_d2, m_d2)
+    f = np.einsum('ij,ij->i', m_d2, m_r)
+    c = np.einsum('ij,ij->i', m_d1, m_r)
+    b = np.einsum('ij,ij->i', m_d1, m_d2)
+
+    m_denom = a * e - b * b
+    m_cross = m_denom != 0.0
+    s = np.where(m_cross,
+                 np.clip((b * f - c * e) / np.where(m_cross, m_denom, 1.0),
+                         0.0, 1.0),
+                 0.0)
+    m_point = e == 0.0
+    t = np.where(m_point, 0.0, (b * s + f) / np.where(m_point, 1.0, e))
+    # [vects_c, vects_d] reduced to a point counts as t < 0
+    m_low = (t < 0.0) | m_point
+    m_high = t > 1.0
+    s = np.where(m_low, np.clip(-c / a, 0.0, 1.0), s)
+    s = np.where(m_high, np.clip((b - c) / a, 0.0, 1.0), s)
+    t = np.clip(t, 0.0, 1.0)
+    return m_a + m_d1 * s[:, np.newaxis], m_c + m_d2 * t[:, np.newaxis]
+
+
+def intersectPerpendicularLineBatch(vects_a, vects_b, points_c):
+    """ Return the projections of points_c onto lines [vects_a, vects_b].
+
+    RETURN:
+    -------
+    T, distance, Tprime, valid :
+        ((N,3) array, (N,) array, (N,3) array, (N,) boolean array)
+    T the projections, distance between points_c and projections,
+    Tprime the symmetric points of points_c versus the Lines.
+    valid is False for null Lines.
+    """
+    m_a = toArray(vects_a)
+    m_u = toArray(vects_b) - m_a
+    m_c = np.broadcast_to(toArray(points_c), m_a.shape)
+
+    m_uu = np.einsum('ij,ij->i', m_u, m_u)
+    valid = m_uu != 0.0
+    m_k = np.where(valid,
+                   np.einsum('ij,ij->i', m_u, m_c - m_a) /
+                   np.where(valid, m_uu, 1.0),
+                   0.0)
+    points_t = m_a + m_u * m_k[:, np.newaxis]
+    m_v = points_t - m_c
+    distance = np.sqrt(np.einsum('ij,ij->i', m_v, m_v))
+    return points_t, distance, points_t + m_v, valid
+
+
+# Offsets of the 26 neighbour cells of a grid cell
+_NEIGHBOURS = [(m_i, m_j, m_k)
+               for m_i in (-1, 0, 1)
+               for m_j in (-1, 0, 1)
+               for m_k in (-1, 0, 1)
+               if (m_i, m_j, m_k) != (0, 0, 0)]
+
+
+def _axisRanks(keys):
+    """ Return, for each axis and each offset -1, 0, 1, the ranks of the
+    cell coordinates keys + offset into the sorted occupied coordinates
+    of the axis and a mask, False where the coordinate is not occupied.
+    Also return the number of occupied coordinates of each axis.
+    """
+    m_ranks = []
+    m_sizes = []
+    for m_d in range(3):
+        m_axis, m_rank = np.unique(keys[:, m_d], return_inverse=True)
+        m_rank = m_rank.reshape(-1)
+        m_last = len(m_axis) - 1
+        # The occupied neighbour coordinates are the neighbours
+        # into the sorted coordinates
+        m_prev = np.maximum(m_rank - 1, 0)
+        m_next = np.minimum(m_rank + 1, m_last)
+        m_ranks.append([
+            (m_prev, m_axis[m_prev] == keys[:, m_d] - 1),
+            (m_rank, np.ones(len(m_rank), dtype=bool)),
+            (m_next, m_axis[m_next] == keys[:, m_d] + 1)])
+        m_sizes.append(len(m_axis))
+    return m_ranks, m_sizes
+
+
+def uniquePointsIndex(points, tolerance=None):
+    """ Return the indexes of the distinct points, in their original order
+    (the first occurrence of each point is kept).
+    Points closer than tolerance on each axis are equal (same semantics
+    as isEqualVectorsBatch).
+
+    The points are bucketed on a grid of cells of size tolerance: points
+    of the same cell are equal and only the first point of each cell is
+    compared with the first points of the occupied neighbour cells.
+    So the cost is O(N log N) (sort of the cells) instead of the O(N^2)
+    of pairwise comparisons.
+
+    RETURN:
+    -------
+    index : (M,) integer array, M <= N
+    """
+    m_points = toArray(points)
+    m_num = len(m_points)
+    if m_num < 2:
+        return np.arange(m_num)
+    m_tolerance = _tolerance(tolerance)
+    # Cells never smaller than the float resolution of the coordinates
+    # (keeps the integer cell coordinates in range)
+    m_cell = max(m_tolerance, 1e-15 * np.abs(m_points).max(), 1e-300)
+    m_keys = np.floor(m_points / m_cell).astype(np.int64)
+
+    # A cell is coded by the ranks of its coordinates on each axis
+    # First point of each occupied cell (cells are sorted by code)
+    m_ranks, (_, m_ny, m_nz) = _axisRanks(m_keys)
+    m_codes = (m_ranks[0][1][0] * m_ny + m_ranks[1][1][0]) * m_nz + \
+        m_ranks[2][1][0]
+    m_cells, m_first = np.unique(m_codes, return_index=True)
+    m_ranks = [[(m_rank[m_first], m_exists[m_first])
+                for m_rank, m_exists in m_offsets]
+               for m_offsets in m_ranks]
+    m_first_points = m_points[m_first]
+
+    # A cell is merged into a neighbour cell whose first point comes
+    # before its own and is equal to it
+    m_merged = np.zeros(len(m_cells), dtype=bool)
+    for m_i, m_j, m_k in _NEIGHBOURS:
+        m_rank_x, m_exists_x = m_ranks[0][m_i + 1]
+        m_rank_y, m_exists_y = m_ranks[1][m_j + 1]
+        m_rank_z, m_exists_z = m_ranks[2][m_k + 1]
+        m_index = np.nonzero(m_exists_x & m_exists_y & m_exists_z)[0]
+        if len(m_index) == 0:
+            continue
+        m_query = (m_rank_x[m_index] * m_ny + m_rank_y[m_index]) * m_nz + \
+            m_rank_z[m_index]
+        m_pos = np.minimum(np.searchsorted(m_cells, m_query),
+                           len(m_cells) - 1)
+        m_found = (m_cells[m_pos] == m_query) & \
+            (m_first[m_pos] < m_first[m_index])
+        m_diff = np.abs(m_first_points[m_pos] - m_first_points[m_index])
+        m_merged[m_index] |= m_found & np.all(m_diff <= m_tolerance, axis=1)
+
+    return np.sort(m_first[~m_merged])
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Headless benchmark of WF commands.
+
+Synthetic documents of growing size are generated, then WF commands
+are driven with programmatic selections (see WF_selection.setSelection).
+For each command and size are recorded : wall time, created objects
+per second, time of a full recompute of the created features and peak
+Python memory allocated by the command (tracemalloc, measured on a
+second run so tracing does not slow down the timings).
+Results are written into a JSON file to compare releases.
+
+Run with FreeCADCmd :
+    WF_BENCHMARK_SIZES=10,100,1000 WF_BENCHMARK_OUTPUT=bench.json \\
+    FreeCADCmd Utils/WF_benchmark.py
+or from the Python console :
+    import WF_benchmark
+    WF_benchmark.run(sizes=[10, 100], output="bench.json")
+"""
+import os
+import sys
+import json
+import math
+import time
+import platform
+import tracemalloc
+import FreeCAD as App
+import Part
+
+PATH_WF = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH_WF_UTILS = os.path.join(PATH_WF, 'Utils')
+for m_path in [PATH_WF, PATH_WF_UTILS]:
+    if not sys.path.__contains__(str(m_path)):
+        sys.path.append(str(m_path))
+
+import WF
+import WF_Objects_base
+from WF_selection import setSelection
+from WF_print import print_msg
+
+###############
+M_SIZES = [10, 100, 1000]
+M_DOC_NAME = "WF_Benchmark"
+###############
+
+
+def makeSyntheticDocument(edges=100, vertexes=100, faces=0,
+                          name=M_DOC_NAME):
+    """ Creates a new document with :
+        "Edges"    : a compound of *edges* line segments,
+        "Vertexes" : a compound of *vertexes* points along an helix
+                     (so any 3 of them are not aligned),
+        "Faces"    : a compound of *faces* planar faces.
+    Returns the document.
+    """
+    m_doc = App.newDocument(name)
+
+    if edges > 0:
+        m_shapes = [Part.makeLine(App.Vector(i, 0.0, 0.0),
+                                  App.Vector(i, 10.0, float(i % 7)))
+                    for i in range(edges)]
+        m_obj = m_doc.addObject("Part::Feature", "Edges")
+        m_obj.Shape = Part.makeCompound(m_shapes)
+
+    if vertexes > 0:
+        m_shapes = []
+        for i in range(vertexes):
+            m_angle = 0.1 * i
+            m_shapes.append(Part.Vertex(App.Vector(10.0 * math.cos(m_angle),
+                                                   10.0 * math.sin(m_angle),
+                                                   0.05 * i)))
+        m_obj = m_doc.addObject("Part::Feature", "Vertexes")
+        m_obj.Shape = Part.makeCompound(m_shapes)
+
+    if faces > 0:
+        m_shapes = [Part.makePlane(1.0, 1.0, App.Vector(2.0 * i, 0.0, 0.0))
+                    for i in range(faces)]
+        m_obj = m_doc.addObject("Part::Feature", "Faces")
+        m_obj.Shape = Part.makeCompound(m_shapes)
+
+    m_doc.recompute()
+    return m_doc
+
+
+def _names(kind, number):
+    return [kind + str(i + 1) for i in range(number)]
+
+
+def _centerLinePoint(doc, size):
+    from WF_centerLinePoint import center_line_point_command
+    setSelection([(doc.Edges, _names("Edge", size))])
+    center_line_point_command()
+
+
+def _alongLinePoint(doc, size):
+    from WF_alongLinePoint import along_line_point_command
+    setSelection([(doc.Edges, ["Edge1"]),
+                  (doc.Vertexes, _names("Vertex", size))])
+    along_line_point_command()
+
+
+def _centerFacePoint(doc, size):
+    from WF_centerFacePoint import run as center_face_point_command
+    setSelection([(doc.Faces, _names("Face", size))])
+    center_face_point_command()
+
+
+def _twoPointsLine(doc, size):
+    from WF_twoPointsLine import two_points_line_command
+    setSelection([(doc.Vertexes, _names("Vertex", size))])
+    two_points_line_command()
+
+
+def _threePointsPlane(doc, size):
+    from WF_threePointsPlane import three_points_plane_command
+    # The command builds one plane from exactly 3 points
+    for i in range(0, size - 2, 3):
+        setSelection([(doc.Vertexes, ["Vertex" + str(i + 1),
+                                      "Vertex" + str(i + 2),
+                                      "Vertex" + str(i + 3)])])
+        three_points_plane_command()
+
+
+def _nPointsLine(doc, size):
+    from WF_nPointsLine import n_points_line_command
+    setSelection([(doc.Vertexes, _names("Vertex", size))])
+    n_points_line_command()
+
+
+def _nPointsPlane(doc, size):
+    from WF_nPointsPlane import n_points_plane_command
+    setSelection([(doc.Vertexes, _names("Vertex", size))])
+    n_points_plane_command()
+
+
+# name -> (function, synthetic document parameters from size)
+M_SCENARIOS = {
+    "center_line_point": (_centerLinePoint,
+                          lambda size: {'edges': size, 'vertexes': 0}),
+    "along_line_point": (_alongLinePoint,
+                         lambda size: {'edges': 1, 'vertexes': size}),
+    "center_face_point": (_centerFacePoint,
+                          lambda size: {'edges': 0, 'vertexes': 0,
+                                        'faces': size}),
+    "two_points_line": (_twoPointsLine,
+                        lambda size: {'edges': 0, 'vertexes': size}),
+    "three_points_plane": (_threePointsPlane,
+                           lambda size: {'edges': 0, 'vertexes': size}),
+    "n_points_line": (_nPointsLine,
+                      lambda size: {'edges': 0, 'vertexes': size}),
+    "n_points_plane": (_nPointsPlane,
+                       lambda size: {'edges': 0, 'vertexes': size}),
+}
+
+
+def peakMemory(name, size):
+    """ Runs one scenario on a new synthetic document of the given size
+    and returns the peak Python memory allocated by the command in kB
+    (memory allocated by OpenCASCADE is not traced).
+    """
+    m_function, m_params = M_SCENARIOS[name]
+    m_doc = makeSyntheticDocument(**m_params(size))
+    WF_Objects_base.clearCache()
+    m_tracing = tracemalloc.is_tracing()
+    try:
+        if not m_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        m_start = tracemalloc.get_traced_memory()[0]
+        m_function(m_doc, size)
+        m_peak = tracemalloc.get_traced_memory()[1] - m_start
+    finally:
+        if not m_tracing:
+            tracemalloc.stop()
+        setSelection(None)
+        App.closeDocument(m_doc.Name)
+    return m_peak / 1024.0
+
+
+def _features(doc):
+    return [m_obj for m_obj in doc.Objects
+            if "Parametric" in m_obj.PropertiesList]
+
+
+def runScenario(name, size, memory=True):
+    """ Runs one scenario on a new synthetic document of the given size.
+    If memory is True, the scenario is run a second time to measure
+    its peak memory (see peakMemory).
+    Returns a dictionary of measures.
+    """
+    m_function, m_params = M_SCENARIOS[name]
+    m_doc = makeSyntheticDocument(**m_params(size))
+    WF_Objects_base.clearCache()
+    try:
+        m_start = time.perf_counter()
+        m_function(m_doc, size)
+        m_wall = time.perf_counter() - m_start
+
+        # Dynamic features are really executed by the recompute
+        # (not restored from the result cache)
+        m_features = _features(m_doc)
+        for m_obj in m_features:
+            m_obj.Parametric = 'Dynamic'
+        WF_Objects_base.clearCache()
+        for m_obj in m_features:
+            m_obj.touch()
+        m_start = time.perf_counter()
+        m_doc.recompute()
+        m_recompute = time.perf_counter() - m_start
+    finally:
+        setSelection(None)
+        App.closeDocument(m_doc.Name)
+
+    m_number = len(m_features)
+    return {'scenario': name,
+            'size': size,
+            'objects': m_number,
+            'wall': m_wall,
+            'objectsPerSecond': m_number / m_wall if m_wall > 0 else None,
+            'recompute': m_recompute,
+            'peakMemory': peakMemory(name, size) if memory else None}
+
+
+def run(sizes=None, scenarios=None, output=None):
+    """ Runs the scenarios (all by default) for each size and
+    writes the results into *output* (JSON) if given.
+    Returns the results.
+    """
+    if sizes is None:
+        sizes = M_SIZES
+    if scenarios is None:
+        scenarios = sorted(M_SCENARIOS)
+
+    m_results = {'release': WF.release(),
+                 'freecad': list(App.Version()[:3]),
+                 'python': platform.python_version(),
+                 'platform': platform.platform(),
+                 'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+                 'results': []}
+    for m_name in scenarios:
+        for m_size in sizes:
+            m_result = runScenario(m_name, m_size)
+            m_results['results'].append(m_result)
+            print_msg("{0:s} N={1:d} : {2:d} objects in {3:.3f} s, "
+                      "recompute {4:.3f} s".format(m_name, m_size,
+                                                   m_result['objects'],
+                                                   m_result['wall'],
+                                                   m_result['recompute']))
+
+    if output is not None:
+        with open(output, 'w') as m_file:
+            json.dump(m_results, m_file, indent=2, sort_keys=True)
+        print_msg("Benchmark results saved to " + str(output))
+    return m_results
+
+
+if __name__ == '__main__':
+    m_sizes = os.environ.get("WF_BENCHMARK_SIZES")
+    if m_sizes:
+        m_sizes = [int(m_size) for m_size in m_sizes.split(",")]
+    run(sizes=m_sizes,
+        output=os.environ.get("WF_BENCHMARK_OUTPUT", "wf_benchmark.json"))
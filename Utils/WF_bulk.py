@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Bulk creation of WF features.
+
+All features created inside a BulkBuilder are created into one single
+transaction (one undo step) with their execute suspended; they are then
+computed by one recompute scoped to the new features.
+
+    with BulkBuilder(M_MACRO) as m_builder:
+        ...
+            with BulkBuilder(M_MACRO) as m_bulk:
+                selfobj = makeXFeature(group)
+                ...
+                m_bulk.add(selfobj)
+        ...
+
+The execute suspension is always released when the with block exits,
+even on an exception.
+
+Builders are re-entrant : a builder started while another one is active
+joins it, and only the outermost one commits and recomputes.
+"""
+import FreeCAD as App
+import WF
+from WF_Objects_base import suspendExecute, resumeExecute
+from WF_print import print_msg
+
+# Stack of the active builders, the outermost first
+_BUILDERS = []
+
+
+class BulkBuilder():
+    """ Group the creation of WF features into one transaction
+    and one recompute.
+    """
+
+    def __init__(self, macro, doc=None):
+        """
+        *macro* : the name of the transaction (undo step).
+        *doc*   : the FreeCAD document, by default the active one.
+        """
+        self.macro = macro
+        self.doc = doc
+        self.objects = []
+        self.__started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish()
+        return False
+
+    def isOutermost(self):
+        return bool(_BUILDERS) and _BUILDERS[0] is self
+
+    def start(self):
+        """ Open the transaction and suspend the features execute.
+        """
+        if self.__started:
+            return
+        self.__started = True
+        if self.doc is None:
+            self.doc = App.ActiveDocument
+        if not _BUILDERS and self.doc is not None:
+            self.doc.openTransaction(self.macro)
+        _BUILDERS.append(self)
+        suspendExecute()
+
+    def add(self, selfobj):
+        """ Register a created feature, to be computed at the end.
+        """
+        _BUILDERS[0].objects.append(selfobj)
+
+    def finish(self):
+        """ Resume the features execute; if outermost, compute the
+        created features and commit the transaction.
+        """
+        if not self.__started:
+            return
+        self.__started = False
+        resumeExecute()
+        m_outermost = self.isOutermost()
+        _BUILDERS.remove(self)
+        if not m_outermost or self.doc is None:
+            return
+
+        try:
+            self.recompute()
+        finally:
+            self.doc.commitTransaction()
+        if WF.verbose():
+            print_msg(str(len(self.objects)) + " objects created !")
+
+    def recompute(self):
+        """ Recompute only the created features (and their dependents).
+        """
+        m_objs = [m_obj for m_obj in self.objects
+                  if m_obj.Document is not None]
+        if not m_objs:
+            return
+        try:
+            self.doc.recompute(m_objs)
+        except TypeError:
+            # FreeCAD releases without scoped recompute : the new
+            # features are touched, so they are computed once
+            self.doc.recompute()
@@ -3,6 +3,7 @@ import os.path
 from WF_config import PATH_WF_ICONS
 import FreeCAD as App
 from WF_gui import raiseComboView
+from WF_selection import SelectionSnapshot, hasSelection
 if App.GuiUp:
     import FreeCADGui as Gui
 
@@ -33,16 +34,18 @@ class Command:
                 'ToolTip': self.tool_tip}
 
     def Activated(self):
-        m_act_doc = App.activeDocument()
-        if m_act_doc is not None:
-            if len(Gui.Selection.getSelectionEx(m_act_doc.Name)) == 0:
-                try:
-                    Gui.Control.showDialog(self.panel())
-                    raiseComboView()
-                except Exception as err:
-                    App.Console.PrintError(
-                        "ERROR: Not able to launch a QT dialog !\n")
-        self.run()
+        # One selection snapshot for the panel and the command
+        with SelectionSnapshot():
+            m_act_doc = App.activeDocument()
+            if m_act_doc is not None:
+                if not hasSelection():
+                    try:
+                        Gui.Control.showDialog(self.panel())
+                        raiseComboView()
+                    except Exception as err:
+                        App.Console.PrintError(
+                            "ERROR: Not able to launch a QT dialog !\n")
+            self.run()
 
     def IsActive(self):
         if App.ActiveDocument:
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Best fit of Lines, Planes (and principal axes) to clouds of points.
+
+The points are never stored all together : they are read by chunks and
+only the mean and the 3x3 scatter matrix of the cloud are accumulated
+(pairwise merge of Chan et al.), so memory stays O(chunk size) and
+clouds of millions of points can be fitted.
+The principal axes are the eigenvectors of the scatter matrix; the
+square roots of its eigenvalues are the singular values of the thin SVD
+of the mean-centered data.
+
+Clouds with outliers can be fitted with ransacLine (RANSAC) : the
+inliers are counted over all points for a batch of candidate Lines at
+once, then the Line is fitted to the inliers only.
+"""
+import numpy as np
+
+###############
+# Number of points processed at once
+M_CHUNK_SIZE = 65536
+# RANSAC : maximum number of candidate Lines
+M_RANSAC_ITERATIONS = 200
+# RANSAC : number of candidate Lines scored at once
+M_RANSAC_BATCH = 8
+# RANSAC : inlier distance
+M_RANSAC_TOLERANCE = 0.1
+# RANSAC : probability of success for the early exit
+M_RANSAC_CONFIDENCE = 0.999
+###############
+
+
+def setChunkSize(value):
+    """ Sets the number of points processed at once.
+    """
+    global M_CHUNK_SIZE
+    M_CHUNK_SIZE = max(int(value), 1)
+
+
+def getChunkSize():
+    """ Returns the number of points processed at once.
+    """
+    return M_CHUNK_SIZE
+
+
+def setRansacIterations(value):
+    """ Sets the maximum number of candidate Lines of ransacLine.
+    """
+    global M_RANSAC_ITERATIONS
+    M_RANSAC_ITERATIONS = max(int(value), 1)
+
+
+def getRansacIterations():
+    """ Returns the maximum number of candidate Lines of ransacLine.
+    """
+    return M_RANSAC_ITERATIONS
+
+
+def setRansacTolerance(value):
+    """ Sets the inlier distance of ransacLine.
+    """
+    global M_RANSAC_TOLERANCE
+    M_RANSAC_TOLERANCE = abs(float(value))
+
+
+def getRansacTolerance():
+    """ Returns the inlier distance of ransacLine.
+    """
+    return M_RANSAC_TOLERANCE
+
+
+def setRansacConfidence(value):
+    """ Sets the probability of success used by ransacLine to stop early
+    (in ]0, 1[).
+    """
+    global M_RANSAC_CONFIDENCE
+    M_RANSAC_CONFIDENCE = min(max(float(value), 0.5), 0.999999)
+
+
+def getRansacConfidence():
+    """ Returns the probability of success used by ransacLine to stop early.
+    """
+    return M_RANSAC_CONFIDENCE
+
+
+class ScatterAccumulator():
+    """ Streaming accumulation of the number of points, the mean and
+    the scatter matrix sum((p - mean) (p - mean)^T) of a cloud of points.
+
+    >>> m_acc = ScatterAccumulator()
+    >>> m_acc.add(chunk1)    # (M,3) arrays
+    >>> m_acc.add(chunk2)
+    >>> center, singular, axes = m_acc.principalAxes()
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = np.zeros(3)
+        self.scatter = np.zeros((3, 3))
+
+    def add(self, points):
+        """ Adds a chunk of points ((M,3) array).
+        """
+        m_points = np.asarray(points, dtype=float).reshape(-1, 3)
+        m_count = len(m_points)
+        if m_count == 0:
+            return
+        m_mean = m_points.mean(axis=0)
+        m_centered = m_points - m_mean
+        self._merge(m_count, m_mean, m_centered.T.dot(m_centered))
+
+    def merge(self, other):
+        """ Adds the points accumulated by an other accumulator.
+        """
+        if other.count:
+            self._merge(other.count, other.mean, other.scatter)
+
+    def _merge(self, count, mean, scatter):
+        m_total = self.count + count
+        m_delta = mean - self.mean
+        self.scatter = self.scatter + scatter + \
+            np.outer(m_delta, m_delta) * (self.count * count / float(m_total))
+        self.mean = self.mean + m_delta * (count / float(m_total))
+        self.count = m_total
+
+    def addVectors(self, vectors, chunk_size=None):
+        """ Adds points from any iterable of App.Vector (or triplets),
+        read by chunks of chunk_size points.
+        """
+        for m_chunk in iterChunks(vectors, chunk_size):
+            self.add(m_chunk)
+
+    def principalAxes(self):
+        """ Returns the principal axes of the points.
+
+        RETURN:
+        -------
+        center, singular, axes : ((3,) array, (3,) array, (3,3) array)
+        center is the mean of the points, axes[i] the i-th principal
+        direction and singular[i] the matching singular value
+        (in decreasing order, as numpy.linalg.svd of the centered data).
+        """
+        return (self.mean,) + principalAxes(self.scatter)
+
+
+def iterChunks(vectors, chunk_size=None):
+    """ Yields the points of vectors by (M,3) arrays of at most
+    chunk_size points.
+
+    *vectors*    : iterable of App.Vector (or triplets), or (N,3) array.
+    """
+    if chunk_size is None:
+        chunk_size = M_CHUNK_SIZE
+    if isinstance(vectors, np.ndarray):
+        m_points = vectors.reshape(-1, 3)
+        for m_i in range(0, len(m_points), chunk_size):
+            yield m_points[m_i:m_i + chunk_size]
+        return
+    # The buffer is reused : each chunk must be used before the next one
+    m_buffer = np.empty((chunk_size, 3))
+    m_i = 0
+    for m_vector in vectors:
+        m_buffer[m_i] = (m_vector[0], m_vector[1], m_vector[2])
+        m_i += 1
+        if m_i == chunk_size:
+            yield m_buffer
+            m_i = 0
+    if m_i:
+        yield m_buffer[:m_i]
+
+
+def principalAxes(scatter):
+    """ Returns the singular values (decreasing) and the principal
+    directions (as rows) of a 3x3 scatter matrix.
+    """
+    m_values, m_vectors = np.linalg.eigh(scatter)
+    m_order = np.argsort(m_values)[::-1]
+    singular = np.sqrt(np.clip(m_values[m_order], 0.0, None))
+    return singular, m_vectors[:, m_order].T
+
+
+def fitLine(vectors, chunk_size=None):
+    """ Best fit Line (in the least squares sense) of points.
+
+    *vectors*    : iterable of App.Vector (or triplets), or (N,3) array.
+    *chunk_size* : number of points processed at once.
+
+    RETURN:
+    -------
+    center, singular, axes : see ScatterAccumulator.principalAxes;
+    the Line goes through center along axes[0].
+    """
+    m_acc = ScatterAccumulator()
+    m_acc.addVectors(vectors, chunk_size)
+    return m_acc.principalAxes()
+
+
+def fitPlane(vectors, chunk_size=None):
+    """ Best fit Plane (in the least squares sense) of points.
+
+    *vectors*    : iterable of App.Vector (or triplets), or (N,3) array.
+    *chunk_size* : number of points processed at once.
+
+    RETURN:
+    -------
+    center, singular, axes, rms : see ScatterAccumulator.principalAxes;
+    the Plane goes through center, axes[0] and axes[1] are in the Plane
+    and axes[2] is its normal.
+    rms is the root mean square distance of the points to the Plane.
+    """
+    m_acc = ScatterAccumulator()
+    m_acc.addVectors(vectors, chunk_size)
+    m_center, m_singular, m_axes = m_acc.principalAxes()
+    m_rms = 0.0
+    if m_acc.count:
+        m_rms = m_singular[2] / np.sqrt(m_acc.count)
+    return m_center, m_singular, m_axes, m_rms
+
+
+def maxPlaneDeviation(vectors, center, normal, chunk_size=None):
+    """ Returns the maximum distance of points to a Plane
+    (0.0 if there is no point).
+
+    *vectors*    : iterable of App.Vector (or triplets), or (N,3) array.
+    *center*     : a point of the Plane.
+    *normal*     : the unit normal of the Plane.
+    """
+    m_center = np.asarray(center, dtype=float)
+    m_normal = np.asarray(normal, dtype=float)
+    m_max = 0.0
+    for m_chunk in iterChunks(vectors, chunk_size):
+        m_dist = np.abs((m_chunk - m_center).dot(m_normal))
+        m_max = max(m_max, float(m_dist.max()))
+    return m_max
+
+
+def _linesDistances2(points, starts, directions):
+    """ Return the (N,K) squared distances of N points to K Lines
+    (unit directions).
+    """
+    m_pa = points.dot(starts.T)
+    m_pu = points.dot(directions.T)
+    m_aa = np.einsum('ij,ij->i', starts, starts)
+    m_au = np.einsum('ij,ij->i', starts, directions)
+    m_pp = np.einsum('ij,ij->i', points, points)
+    return m_pp[:, np.newaxis] - 2.0 * m_pa + m_aa - (m_pu - m_au) ** 2
+
+
+def _inliers(points, start, direction, tolerance):
+    """ Return the inliers mask of points versus one Line.
+    """
+    m_d2 = _linesDistances2(points, start[np.newaxis, :],
+                            direction[np.newaxis, :])[:, 0]
+    return m_d2 <= tolerance * tolerance
+
+
+def ransacLine(points, iterations=None, tolerance=None, confidence=None,
+               seed=0):
+    """ Robust best fit Line (RANSAC) of points with outliers.
+
+    Random Lines through 2 points are scored by their number of inliers
+    (points closer than tolerance), over all points and a batch of
+    M_RANSAC_BATCH Lines at once. The search stops after *iterations*
+    Lines, or as soon as enough Lines were tried to find, with the given
+    *confidence*, a Line as good as the best one (adaptive RANSAC).
+    The Line is then fitted (least squares) to the inliers of the best one.
+
+    *points*     : (N,3) array.
+    *iterations* : maximum number of Lines tried (M_RANSAC_ITERATIONS).
+    *tolerance*  : inlier distance (M_RANSAC_TOLERANCE).
+    *confidence* : probability of success for the early exit
+                   (M_RANSAC_CONFIDENCE).
+    *seed*       : seed of the random generator, so a same set of points
+                   always gives the same Line.
+
+    RETURN:
+    -------
+    center, singular, axes, inliers : as fitLine, plus the number of
+    inliers of the fitted Line.
+    """
+    if iterations is None:
+        iterations = M_RANSAC_ITERATIONS
+    if tolerance is None:
+        tolerance = M_RANSAC_TOLERANCE
+    if confidence is None:
+        confidence = M_RANSAC_CONFIDENCE
+
+    m_points = np.asarray(points, dtype=float).reshape(-1, 3)
+    m_number = len(m_points)
+    if m_number < 3:
+        return fitLine(m_points) + (m_number,)
+    # Centered coordinates keep the distances accurate
+    m_origin = m_points.mean(axis=0)
+    m_points = m_points - m_origin
+
+    m_random = np.random.RandomState(seed)
+    m_best_count = 0
+    m_best = None
+    m_done = 0
+    m_needed = iterations
+    while m_done < min(iterations, m_needed):
+        m_batch = min(M_RANSAC_BATCH, iterations - m_done)
+        m_pairs = m_random.randint(0, m_number, size=(m_batch, 2))
+        m_starts = m_points[m_pairs[:, 0]]
+        m_dirs = m_points[m_pairs[:, 1]] - m_starts
+        m_lengths = np.sqrt(np.einsum('ij,ij->i', m_dirs, m_dirs))
+        m_valid = m_lengths > 0.0
+        m_dirs = m_dirs / np.where(m_valid, m_lengths, 1.0)[:, np.newaxis]
+
+        # Inliers of the batch of Lines, over all points (by chunks)
+        m_counts = np.zeros(m_batch, dtype=int)
+        for m_i in range(0, m_number, M_CHUNK_SIZE):
+            m_d2 = _linesDistances2(m_points[m_i:m_i + M_CHUNK_SIZE],
+                                    m_starts, m_dirs)
+            m_counts += np.count_nonzero(m_d2 <= tolerance * tolerance,
+                                         axis=0)
+        m_counts[~m_valid] = 0
+        m_done += m_batch
+
+        m_j = int(np.argmax(m_counts))
+        if m_counts[m_j] > m_best_count:
+            m_best_count = int(m_counts[m_j])
+            m_best = (m_starts[m_j], m_dirs[m_j])
+            m_ratio = m_best_count / float(m_number)
+            if m_ratio >= 1.0:
+                break
+            # Number of Lines needed to draw, with the given confidence,
+            # 2 inliers at least once
+            m_needed = np.log(1.0 - confidence) / \
+                np.log(1.0 - m_ratio * m_ratio)
+
+    if m_best is None:
+        m_center, m_singular, m_axes = fitLine(m_points)
+        return m_center + m_origin, m_singular, m_axes, 0
+
+    # Least squares fit of the inliers, then inliers of the fitted Line
+    m_mask = _inliers(m_points, m_best[0], m_best[1], tolerance)
+    m_center, m_singular, m_axes = fitLine(m_points[m_mask])
+    m_mask_fit = _inliers(m_points, m_center, m_axes[0], tolerance)
+    if np.count_nonzero(m_mask_fit) >= np.count_nonzero(m_mask):
+        m_mask = m_mask_fit
+        m_center, m_singular, m_axes = fitLine(m_points[m_mask])
+
+    return (m_center + m_origin, m_singular, m_axes,
+            int(np.count_nonzero(m_mask)))
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import FreeCAD as App
+import Part
 import WF
 from WF_print import printError_msg, print_msg
+from WF_arcLength import getArcLengthTable
 if App.GuiUp:
     import FreeCADGui as Gui
 
@@ -21,13 +23,16 @@ def init_min_max():
     return min_val, max_val
 
 
-def isColinearVectors(vect_a, vect_b, vect_c):
+def isColinearVectors(vect_a, vect_b, vect_c, tolerance=None):
     """ Return true if the 3 points are aligned.
+    By default tolerance is WF.tolerance().
     """
     Vector_1 = vect_b - vect_a
     Vector_2 = vect_c - vect_b
     Vector_3 = Vector_1.cross(Vector_2)
-    m_tolerance = WF.tolerance()
+    m_tolerance = tolerance
+    if m_tolerance is None:
+        m_tolerance = WF.tolerance()
 
     if abs(Vector_3.x) <= m_tolerance and abs(
             Vector_3.y) <= m_tolerance and abs(Vector_3.z) <= m_tolerance:
@@ -36,11 +41,14 @@ def isColinearVectors(vect_a, vect_b, vect_c):
     return False
 
 
-def isEqualVectors(vect_a, vect_b):
+def isEqualVectors(vect_a, vect_b, tolerance=None):
     """ Return true if the 2 points are equal.
+    By default tolerance is WF.tolerance().
     """
     Vector = vect_b - vect_a
-    m_tolerance = WF.tolerance()
+    m_tolerance = tolerance
+    if m_tolerance is None:
+        m_tolerance = WF.tolerance()
     if abs(Vector.x) <= m_tolerance and abs(
             Vector.y) <= m_tolerance and abs(Vector.z) <= m_tolerance:
         return True
@@ -49,8 +57,11 @@ def isEqualVectors(vect_a, vect_b):
 
 
 def centerLinePoint(edge):
-    """ Return the center point of the Line.
+    """ Return the center point of the Line
+    (middle of the curve for curved Edges).
     """
+    if not isStraightEdge(edge):
+        return curvePoint(edge, edge.Length / 2)
     Vector_A = edge.Vertexes[0].Point
     Vector_B = edge.Vertexes[-1].Point
     Vector_AB = Vector_B + Vector_A
@@ -75,11 +86,27 @@ def alongTwoPointsPoint(vect_a, vect_b, index, number):
     return Vector_A
 
 
+def curvePoint(edge, distance):
+    """ Return the point of a curved Edge at distance along the curve
+    (clamped to the Edge), using the arc length table of the Edge.
+    """
+    m_point = getArcLengthTable(edge).pointsAt([distance])[0]
+    return App.Vector(m_point[0], m_point[1], m_point[2])
+
+
 def alongLinePoint(edge, index, number):
     """ Return the point at index/number of the Line.
     1/2 means middle of the line.
     1/3 means one third of the line...
+    For curved Edges the point is on the curve (at index/number of
+    the Edge length).
     """
+    if not isStraightEdge(edge):
+        distance = edge.Length / 2
+        if number != 0:
+            distance = index * (edge.Length / number)
+        return curvePoint(edge, distance)
+
     Vector_A = edge.Vertexes[0].Point
     Vector_B = edge.Vertexes[-1].Point
     if isEqualVectors(Vector_A, Vector_B):
@@ -168,9 +195,11 @@ def minMaxVectorsLimits(vertexes):
     return xmax, xmin, ymax, ymin, zmax, zmin
 
 
-def intersecLinePlane(vect_a, vect_b, Plane_Normal, Plane_Point):
+def intersecLinePlane(vect_a, vect_b, Plane_Normal, Plane_Point,
+                      tolerance=None):
     """ Return the intersection between the Line L defined by vect_a and vect_b
     and the Plane defined by Plane_Normal and Plane_Point.
+    By default tolerance is WF.tolerance().
     """
     # Plane Equation is eq(0) P(x, y, z):
     # a * x + b * y + c * z + d = 0
@@ -196,11 +225,11 @@ def intersecLinePlane(vect_a, vect_b, Plane_Normal, Plane_Point):
     # points M as defined by eq(1):
     # Vector(MA) = k * Vector(U)
     # with k Real
-    if isEqualVectors(vect_a, vect_b):
+    if isEqualVectors(vect_a, vect_b, tolerance):
         print_msg("ERROR : The 2 given points are equals !")
         return None
     ax, ay, az = vect_a.x, vect_a.y, vect_a.z
-    bx, by, bz = vect_b.x, vect_b.y, B.z
+    bx, by, bz = vect_b.x, vect_b.y, vect_b.z
     ux, uy, uz = bx - ax, by - ay, bz - az
     U = App.Vector(ux, uy, uz)
 
@@ -249,6 +278,74 @@ def intersecLinePlane(vect_a, vect_b, Plane_Normal, Plane_Point):
         return T
 
 
+def planeOfFace(face):
+    """ Return (Plane_Normal, Plane_Point) of a planar Face.
+    Raise an Exception if the Face is not planar.
+    """
+    m_surface = face.Surface
+    if not isinstance(m_surface, Part.Plane):
+        raise Exception("The selected Face is not planar !")
+    return m_surface.Axis, m_surface.Position
+
+
+def isStraightEdge(edge):
+    """ Return True if the Edge is a straight Line (segment).
+    """
+    return isinstance(getattr(edge, 'Curve', None),
+                      (Part.Line, Part.LineSegment))
+
+
+def closestPointsSegments(vect_a, vect_b, vect_c, vect_d):
+    """ Return the closest points between the segments [vect_a, vect_b]
+    and [vect_c, vect_d] (closed form, see Ericson, "Real-Time Collision
+    Detection", 5.1.9).
+    [vect_a, vect_b] must not be null.
+    For parallel segments, the closest point of vect_c on [vect_a, vect_b]
+    is chosen.
+
+    RETURN:
+    -------
+    P, Q : the point on [vect_a, vect_b] and the point on [vect_c, vect_d].
+    """
+    d1 = vect_b.sub(vect_a)
+    d2 = vect_d.sub(vect_c)
+    r = vect_a.sub(vect_c)
+    a = d1.dot(d1)
+    e = d2.dot(d2)
+    f = d2.dot(r)
+    c = d1.dot(r)
+    b = d1.dot(d2)
+
+    def clamp(x):
+        return min(max(x, 0.0), 1.0)
+
+    if e == 0.0:
+        # [vect_c, vect_d] is a point
+        s, t = clamp(-c / a), 0.0
+    else:
+        denom = a * e - b * b
+        s = clamp((b * f - c * e) / denom) if denom != 0.0 else 0.0
+        t = (b * s + f) / e
+        if t < 0.0:
+            s, t = clamp(-c / a), 0.0
+        elif t > 1.0:
+            s, t = clamp((b - c) / a), 1.0
+    return vect_a.add(d1.multiply(s)), vect_c.add(d2.multiply(t))
+
+
+def edgeClosestPoint(edge, other_edge):
+    """ Return the point of edge closest to other_edge.
+    Solved in closed form for two straight Edges, with OCC
+    (distToShape) for curved Edges.
+    """
+    if isStraightEdge(edge) and isStraightEdge(other_edge):
+        return closestPointsSegments(edge.Vertexes[0].Point,
+                                     edge.Vertexes[-1].Point,
+                                     other_edge.Vertexes[0].Point,
+                                     other_edge.Vertexes[-1].Point)[0]
+    return edge.distToShape(other_edge)[1][0][0]
+
+
 def intersectPerpendicularLine(vect_a, vect_b, point_c,):
     """ Return the projection of point_c onto line [vect_a,vect_b].
 
@@ -331,12 +428,18 @@ def printPoint(point, msg=""):
 
 
 def propertiesPoint(Point_User_Name,
-                    color=(1.00, 0.67, 0.00)):
+                    color=(1.00, 0.67, 0.00),
+                    settings=None):
     """ Define the properties of a Work feature Point.
     PointColor
     PointSize
     Transparency
+    By default settings are WF.settings().
     """
+    if not App.GuiUp:
+        return
+    if settings is None:
+        settings = WF.settings()
     try:
         if isinstance(color, tuple):
             Gui.ActiveDocument.getObject(Point_User_Name).PointColor = color
@@ -346,7 +449,7 @@ def propertiesPoint(Point_User_Name,
         print_msg("Color : " + str(color) + " !")
     try:
         Gui.ActiveDocument.getObject(
-            Point_User_Name).PointSize = WF.pointSize()
+            Point_User_Name).PointSize = settings.pointSize
 
     except Exception as err:
         printError_msg(err.args[0], title="propertiesPoint")
@@ -361,14 +464,20 @@ def propertiesPoint(Point_User_Name,
 
 
 def propertiesLine(Line_User_Name,
-                   color=(1.00, 0.67, 0.00)):
+                   color=(1.00, 0.67, 0.00),
+                   settings=None):
     """ Define the properties of a Work feature Line.
     PointColor
     LineColor
     LineWidth
     PointSize
     Transparency
+    By default settings are WF.settings().
     """
+    if not App.GuiUp:
+        return
+    if settings is None:
+        settings = WF.settings()
     try:
         if isinstance(color, tuple):
             Gui.ActiveDocument.getObject(Line_User_Name).PointColor = color
@@ -385,13 +494,13 @@ def propertiesLine(Line_User_Name,
         print_msg("Color : " + str(color) + " !")
     try:
         Gui.ActiveDocument.getObject(
-            Line_User_Name).LineWidth = WF.lineThickness()
+            Line_User_Name).LineWidth = settings.lineThickness
     except Exception as err:
         printError_msg(err.args[0], title="propertiesLine")
         print_msg("Not able to set LineWidth !")
     try:
         Gui.ActiveDocument.getObject(
-            Line_User_Name).PointSize = WF.linePointSize()
+            Line_User_Name).PointSize = settings.linePointSize
     except Exception as err:
         printError_msg(err.args[0], title="propertiesLine")
         print_msg("Not able to set PointSize !")
@@ -413,6 +522,8 @@ def propertiesPlane(Plane_User_Name,
     ShapeColor
     Transparency
     """
+    if not App.GuiUp:
+        return
     try:
         if isinstance(color, tuple):
             Gui.ActiveDocument.getObject(Plane_User_Name).PointColor = color
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Resolution of WF feature links (parent object, subelement name).
+
+Subelement names (i.e. "Edge12") are parsed once and their integer
+index cached.
+The subshapes of each parent (Vertexes, Edges, Faces) are fetched once
+and kept into a table per parent, invalidated only when the parent shape
+changes; so resolving a link does not materialise the full list of
+subshapes at each execute.
+"""
+import re
+import FreeCAD as App
+
+# subelement name -> index
+_INDEXES = {}
+# (document name, object name) -> [shape key, {kind: list of subshapes},
+#                                  shape]
+# The shape is kept so its hashCode can not be reused by another shape
+# while the table is alive.
+_SUBSHAPES = {}
+
+M_KINDS = {'Vertex': 'Vertexes',
+           'Edge': 'Edges',
+           'Wire': 'Wires',
+           'Face': 'Faces',
+           'Shell': 'Shells'}
+
+
+def subElementIndex(name):
+    """ Returns the integer index of a subelement name.
+    i.e. subElementIndex("Edge12") returns 12.
+    """
+    try:
+        return _INDEXES[name]
+    except KeyError:
+        m_index = int(re.sub('[^0-9]', '', name))
+        _INDEXES[name] = m_index
+        return m_index
+
+
+def subElementKind(name):
+    """ Returns the kind of a subelement name.
+    i.e. subElementKind("Edge12") returns "Edge".
+    """
+    return name.rstrip('0123456789')
+
+
+def _shapeKey(shape):
+    return (shape.ShapeType, shape.hashCode())
+
+
+def getSubShapes(obj, kind):
+    """ Returns the list of subshapes of kind 'Vertex', 'Edge', 'Wire',
+    'Face' or 'Shell' of the object.
+    The list is cached and only rebuilt when the object shape changes.
+    """
+    m_shape = obj.Shape
+    m_id = (obj.Document.Name, obj.Name)
+    m_key = _shapeKey(m_shape)
+    m_entry = _SUBSHAPES.get(m_id)
+    if m_entry is None or m_entry[0] != m_key:
+        m_entry = [m_key, {}, m_shape]
+        _SUBSHAPES[m_id] = m_entry
+    m_tables = m_entry[1]
+    if kind not in m_tables:
+        m_tables[kind] = getattr(m_shape, M_KINDS[kind])
+    return m_tables[kind]
+
+
+def getSubShape(obj, name, kind=None):
+    """ Returns the subshape of the object from its subelement name.
+
+    *obj*  : the parent object.
+    *name* : the subelement name (i.e. "Edge12").
+    *kind* : the kind of subshape to look for; by default the kind
+             of the subelement name.
+    """
+    if kind is None:
+        kind = subElementKind(name)
+    return getSubShapes(obj, kind)[subElementIndex(name) - 1]
+
+
+def getLinkSubShape(link, kind=None):
+    """ Returns the subshape of a PropertyLinkSub value
+    (parent object, [subelement name]).
+    """
+    m_name = link[1]
+    if isinstance(m_name, (list, tuple)):
+        m_name = m_name[0]
+    return getSubShape(link[0], m_name, kind)
+
+
+def getLinkPoint(link):
+    """ Returns the point (App.Vector) of a Vertex link.
+    """
+    return getLinkSubShape(link, 'Vertex').Point
+
+
+def getLinkListSubShapes(links, kind=None):
+    """ Returns the subshapes of a PropertyLinkSubList value
+    [(parent object, subelement name(s)), ...].
+    """
+    m_shapes = []
+    for m_obj, m_names in links:
+        if not isinstance(m_names, (list, tuple)):
+            m_names = [m_names]
+        for m_name in m_names:
+            m_shapes.append(getSubShape(m_obj, m_name, kind))
+    return m_shapes
+
+
+def getLinkListPoints(links):
+    """ Returns the points (App.Vector) of a PropertyLinkSubList value
+    of Vertexes.
+    """
+    return [m_vertex.Point for m_vertex in getLinkListSubShapes(links,
+                                                                'Vertex')]
+
+
+def clearLinks(doc_name=None):
+    """ Empties the subshape tables (of one document only if given).
+    """
+    if doc_name is None:
+        _SUBSHAPES.clear()
+        return
+    for m_id in [m_id for m_id in _SUBSHAPES if m_id[0] == doc_name]:
+        del _SUBSHAPES[m_id]
+
+
+class _LinksObserver():
+    """ Document observer dropping the subshape tables of deleted
+    objects and documents.
+    """
+
+    def slotDeletedObject(self, obj):
+        _SUBSHAPES.pop((obj.Document.Name, obj.Name), None)
+
+    def slotDeletedDocument(self, doc):
+        clearLinks(doc.Name)
+
+
+if hasattr(App, "addDocumentObserver"):
+    _LINKS_OBSERVER = _LinksObserver()
+    App.addDocumentObserver(_LINKS_OBSERVER)
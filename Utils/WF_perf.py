@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Timing and call count instrumentation of WF features.
+
+When enabled, execute and onChanged of every WF_Object class are
+wrapped to record per object the number of calls, the total and the
+maximum time spent. When disabled the original methods are restored,
+so there is no overhead at all.
+
+    import WF_perf
+    WF_perf.enable()
+    ...  # recompute
+    WF_perf.printReport(top=10)
+    WF_perf.dumpJson("/tmp/wf_perf.json")
+    WF_perf.disable()
+"""
+import json
+import time
+import FreeCAD as App
+from WF_Objects_base import WF_Object
+from WF_print import print_msg
+
+M_METHODS = ["execute", "onChanged"]
+
+# (class, method name) -> original function
+_ORIGINALS = {}
+# (document name, object name) -> {'class': name, method: [calls, total, max]}
+_STATS = {}
+# (document name, object name, method) of the calls being timed
+_ACTIVE = set()
+_RECOMPUTES = [0]
+
+
+def _allClasses(cls=WF_Object):
+    m_classes = [cls]
+    for m_sub in cls.__subclasses__():
+        for m_cls in _allClasses(m_sub):
+            if m_cls not in m_classes:
+                m_classes.append(m_cls)
+    return m_classes
+
+
+def _record(selfobj, cls_name, method, duration):
+    m_key = (selfobj.Document.Name, selfobj.Name)
+    m_entry = _STATS.get(m_key)
+    if m_entry is None:
+        m_entry = {'class': cls_name}
+        _STATS[m_key] = m_entry
+    m_stat = m_entry.setdefault(method, [0, 0.0, 0.0])
+    m_stat[0] += 1
+    m_stat[1] += duration
+    m_stat[2] = max(m_stat[2], duration)
+
+
+def _wrap(func, method):
+    def wrapper(self, selfobj, *args):
+        try:
+            m_key = (selfobj.Document.Name, selfobj.Name, method)
+        except Exception:
+            return func(self, selfobj, *args)
+        # Only the outermost call (i.e. not WF_Point.onChanged called
+        # by a subclass onChanged) is timed
+        if m_key in _ACTIVE:
+            return func(self, selfobj, *args)
+        _ACTIVE.add(m_key)
+        m_start = time.perf_counter()
+        try:
+            return func(self, selfobj, *args)
+        finally:
+            _record(selfobj, self.__class__.__name__, method,
+                    time.perf_counter() - m_start)
+            _ACTIVE.discard(m_key)
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+class _RecomputeObserver():
+    """ Document observer counting the document recomputes.
+    """
+
+    def slotRecomputedDocument(self, doc):
+        _RECOMPUTES[0] += 1
+
+
+_OBSERVER = _RecomputeObserver()
+
+
+def isEnabled():
+    """ Returns True if the instrumentation is enabled.
+    """
+    return bool(_ORIGINALS)
+
+
+def enable():
+    """ Starts recording execute/onChanged calls of all WF features.
+    """
+    if isEnabled():
+        return
+    for m_cls in _allClasses():
+        for m_method in M_METHODS:
+            if m_method in m_cls.__dict__:
+                m_func = m_cls.__dict__[m_method]
+                _ORIGINALS[(m_cls, m_method)] = m_func
+                setattr(m_cls, m_method, _wrap(m_func, m_method))
+    if hasattr(App, "addDocumentObserver"):
+        App.addDocumentObserver(_OBSERVER)
+
+
+def disable():
+    """ Stops recording and restores the original methods.
+    Recorded data are kept (see reset).
+    """
+    for (m_cls, m_method), m_func in _ORIGINALS.items():
+        setattr(m_cls, m_method, m_func)
+    _ORIGINALS.clear()
+    if hasattr(App, "removeDocumentObserver"):
+        try:
+            App.removeDocumentObserver(_OBSERVER)
+        except Exception:
+            pass
+
+
+def reset():
+    """ Clears all recorded data.
+    """
+    _STATS.clear()
+    _RECOMPUTES[0] = 0
+
+
+def topObjects(top=10, method="execute"):
+    """ Returns the *top* slowest objects as a list of
+    (document name, object name, class name, calls, total, max)
+    sorted by total time.
+    """
+    m_rows = []
+    for (m_doc, m_name), m_entry in _STATS.items():
+        if method not in m_entry:
+            continue
+        m_calls, m_total, m_max = m_entry[method]
+        m_rows.append((m_doc, m_name, m_entry['class'],
+                       m_calls, m_total, m_max))
+    m_rows.sort(key=lambda m_row: m_row[4], reverse=True)
+    return m_rows[:top]
+
+
+def classTotals(method="execute"):
+    """ Returns a dictionary class name -> (calls, total time).
+    """
+    m_totals = {}
+    for m_entry in _STATS.values():
+        if method not in m_entry:
+            continue
+        m_calls, m_total = m_totals.get(m_entry['class'], (0, 0.0))
+        m_totals[m_entry['class']] = (m_calls + m_entry[method][0],
+                                      m_total + m_entry[method][1])
+    return m_totals
+
+
+def callsPerRecompute(method="execute"):
+    """ Returns the mean number of calls per document recompute
+    (None if no recompute was recorded).
+    """
+    if _RECOMPUTES[0] == 0:
+        return None
+    m_calls = sum(m_entry[method][0] for m_entry in _STATS.values()
+                  if method in m_entry)
+    return float(m_calls) / _RECOMPUTES[0]
+
+
+def report(top=10):
+    """ Returns all recorded data as a dictionary (JSON compatible).
+    """
+    m_report = {'enabled': isEnabled(),
+                'recomputes': _RECOMPUTES[0],
+                'objects': [],
+                'classes': {},
+                'top': {},
+                'callsPerRecompute': {}}
+    for (m_doc, m_name), m_entry in sorted(_STATS.items()):
+        m_object = {'document': m_doc,
+                    'name': m_name,
+                    'class': m_entry['class']}
+        for m_method in M_METHODS:
+            if m_method in m_entry:
+                m_calls, m_total, m_max = m_entry[m_method]
+                m_object[m_method] = {'calls': m_calls,
+                                      'total': m_total,
+                                      'max': m_max}
+        m_report['objects'].append(m_object)
+    for m_method in M_METHODS:
+        for m_cls, (m_calls, m_total) in classTotals(m_method).items():
+            m_class = m_report['classes'].setdefault(m_cls, {})
+            m_class[m_method] = {'calls': m_calls, 'total': m_total}
+        m_report['top'][m_method] = [m_row[1] for m_row in
+                                     topObjects(top, m_method)]
+        m_report['callsPerRecompute'][m_method] = callsPerRecompute(m_method)
+    return m_report
+
+
+def dumpJson(path, top=10):
+    """ Writes the report into a JSON file for offline comparison.
+    """
+    with open(path, 'w') as m_file:
+        json.dump(report(top), m_file, indent=2, sort_keys=True)
+
+
+def printReport(top=10):
+    """ Prints the report on console.
+    """
+    print_msg("WF Performance Report (" + str(_RECOMPUTES[0]) +
+              " recomputes)")
+    print_msg("Slowest objects (execute) :")
+    for m_doc, m_name, m_cls, m_calls, m_total, m_max in topObjects(top):
+        print_msg("  {0:s} ({1:s}) : {2:d} calls, {3:.6f} s total, "
+                  "{4:.6f} s max".format(m_name, m_cls, m_calls,
+                                         m_total, m_max))
+    print_msg("Time per class :")
+    for m_method in M_METHODS:
+        m_totals = classTotals(m_method)
+        for m_cls in sorted(m_totals, key=lambda m_c: -m_totals[m_c][1]):
+            m_calls, m_total = m_totals[m_cls]
+            print_msg("  {0:s}.{1:s} : {2:d} calls, {3:.6f} s".format(
+                m_cls, m_method, m_calls, m_total))
+    m_ratio = callsPerRecompute()
+    if m_ratio is not None:
+        print_msg("Execute calls per recompute : {0:.1f}".format(m_ratio))
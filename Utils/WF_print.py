@@ -1,11 +1,101 @@
 # -*- coding: utf-8 -*-
 import os
-import inspect
+import sys
+import functools
 import FreeCAD as App
 from PySide import QtCore, QtGui
 import WF
 
 ERROR_MSG_NOT_YET = "Not yet Developed !"
+# Maximum number of messages detailed into an error summary
+M_SUMMARY_LINES = 20
+
+# Stack of the active error collectors, the outermost first
+_COLLECTORS = []
+
+
+class ErrorCollector():
+    """ Gather the error messages printed during a command, to show
+    them into one single summary at the end (instead of one modal
+    dialog per error).
+
+    with ErrorCollector(M_MACRO):
+        ...
+
+    Collectors are re-entrant : only the outermost one reports.
+    Messages are always printed on console as they come.
+    Messages from printError_msgWithTimer are shown into their own
+    summary dialog with timer (none if the timeout is 0), the ones from
+    printError_msg into a simple summary dialog.
+    """
+
+    def __init__(self, title=None):
+        self.title = title
+        self.messages = []
+
+    def __enter__(self):
+        _COLLECTORS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _COLLECTORS.remove(self)
+        if not _COLLECTORS:
+            self.report()
+        else:
+            _COLLECTORS[0].messages.extend(self.messages)
+        return False
+
+    def add(self, message, timed=False):
+        """ Gather one message; timed is True for a message that would
+        have been shown into a dialog with timer.
+        """
+        self.messages.append((message, timed))
+
+    def report(self):
+        """ Show the summary of the gathered messages (GUI only).
+        """
+        if not self.messages or not App.GuiUp:
+            return
+        m_untimed = [m_msg for m_msg, m_timed in self.messages
+                     if not m_timed]
+        m_timed = [m_msg for m_msg, m_timed in self.messages if m_timed]
+        try:
+            if m_untimed:
+                gui_errorDialog(_summary(m_untimed), self.title)
+            # recover timeout value from preferences
+            timeout = WF.timeout()
+            if m_timed and timeout != 0:
+                gui_errorDialogWithTimer(_summary(m_timed), self.title,
+                                         timeout)
+        except Exception as err:
+            App.Console.PrintError("\nERROR: Not able to launch a QT dialog !")
+            App.Console.PrintError(str(err) + "\n")
+
+
+def _summary(messages):
+    # text of a summary dialog
+    m_msg = str(len(messages)) + " error(s) :\n\n"
+    m_msg += "\n".join(messages[:M_SUMMARY_LINES])
+    if len(messages) > M_SUMMARY_LINES:
+        m_msg += "\n... (see Report view for the full list)"
+    return m_msg
+
+
+def collectErrors(title=None):
+    """ Decorator running the function into an ErrorCollector.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with ErrorCollector(title):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _callerName():
+    # name of the function calling the print function
+    return sys._getframe(2).f_code.co_name
 
 
 class TimerMessageBox(QtGui.QMessageBox):
@@ -82,46 +172,57 @@ def print_msg(message):
 
 
 def printInfo_msg(message, title=None):
-    """ Print a message on console.
+    """ Print a message on console (and into a dialog if GUI is up).
     """
     m_msg = message
     App.Console.PrintMessage(m_msg + "\n")
+    if not App.GuiUp:
+        return
     try:
         gui_infoDialog(m_msg, title)
     except Exception as err:
         App.Console.PrintError("\nERROR: Not able to launch a QT dialog !")
-        App.Console.PrintError(err.args[0])
-        raise Exception
+        App.Console.PrintError(str(err) + "\n")
 
 
 def printError_msg(message, title=None):
     """ Print a ERROR message on console.
+    The message is also shown into a dialog if GUI is up, or gathered
+    by the current ErrorCollector if any.
     """
-    m_msg = str(inspect.stack()[1][3]) + " : " + str(message)
+    m_msg = str(_callerName()) + " : " + str(message)
     App.Console.PrintError(m_msg + "\n")
+    if _COLLECTORS:
+        _COLLECTORS[-1].add(m_msg)
+        return
+    if not App.GuiUp:
+        return
     try:
         gui_errorDialog(m_msg, title)
     except Exception as err:
         App.Console.PrintError("\nERROR: Not able to launch a QT dialog !")
-        App.Console.PrintError(err.args[0])
-        raise Exception
+        App.Console.PrintError(str(err) + "\n")
 
 
 def printError_msgWithTimer(message, title=None):
     """ Print a ERROR message on console.
+    The message is also shown into a dialog with timer if GUI is up,
+    or gathered by the current ErrorCollector if any.
     """
-    m_msg = str(inspect.stack()[1][3]) + " : " + str(message)
+    m_msg = str(_callerName()) + " : " + str(message)
     App.Console.PrintError(m_msg + "\n")
+    if _COLLECTORS:
+        _COLLECTORS[-1].add(m_msg, timed=True)
+        return
     # recover timeout value from preferences
     timeout = WF.timeout()
-    if timeout == 0:
+    if timeout == 0 or not App.GuiUp:
         return
     try:
         gui_errorDialogWithTimer(m_msg, title, timeout)
     except Exception as err:
         App.Console.PrintError("\nERROR: Not able to launch a QT dialog !")
-        App.Console.PrintError(err.args[0])
-        raise Exception
+        App.Console.PrintError(str(err) + "\n")
 
 
 def print_not_yet():
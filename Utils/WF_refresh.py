@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Dependency ordered refresh of WF parametric features.
+
+The dependency graph of WF features is built from their link inputs
+and sorted topologically, so each stale feature is recomputed exactly
+once and after its parents.
+A feature is stale when its inputs (own properties and parent shapes)
+changed since the last refresh.
+"""
+import FreeCAD as App
+import WF
+from WF_Objects_base import getParents, inputsFingerprint
+from WF_print import print_msg
+
+# (document name, object name) -> inputs fingerprint at last refresh
+_LAST_STATES = {}
+
+
+def isFeature(obj):
+    """ Return True if the object is a WF parametric feature.
+    """
+    return "Parametric" in obj.PropertiesList and hasattr(obj, 'Proxy')
+
+
+def clearStates(doc_name=None):
+    """ Forgets the last refresh states (of one document only if given).
+    """
+    if doc_name is None:
+        _LAST_STATES.clear()
+        return
+    for m_key in [m_key for m_key in _LAST_STATES if m_key[0] == doc_name]:
+        del _LAST_STATES[m_key]
+
+
+class _StatesObserver():
+    """ Document observer dropping the refresh states of deleted
+    objects and documents (document names are reused).
+    """
+
+    def slotDeletedObject(self, obj):
+        _LAST_STATES.pop((obj.Document.Name, obj.Name), None)
+
+    def slotDeletedDocument(self, doc):
+        clearStates(doc.Name)
+
+
+if hasattr(App, "addDocumentObserver"):
+    _STATES_OBSERVER = _StatesObserver()
+    App.addDocumentObserver(_STATES_OBSERVER)
+
+
+def sortFeatures(features):
+    """ Sort WF features so that parents come before children.
+
+    RETURN:
+    -------
+    ordered, cycles : (list of features, list of features)
+    cycles are the features involved into a dependency loop.
+    """
+    m_by_name = dict((m_obj.Name, m_obj) for m_obj in features)
+    m_parents = {}
+    m_children = dict((m_name, []) for m_name in m_by_name)
+    for m_obj in features:
+        m_names = [m_p.Name for m_p in getParents(m_obj)
+                   if m_p.Name in m_by_name and m_p.Name != m_obj.Name]
+        m_parents[m_obj.Name] = len(m_names)
+        for m_name in m_names:
+            m_children[m_name].append(m_obj.Name)
+
+    # Kahn's algorithm, keeping the document order for independent features
+    m_ready = [m_obj.Name for m_obj in features if m_parents[m_obj.Name] == 0]
+    ordered = []
+    m_i = 0
+    while m_i < len(m_ready):
+        m_name = m_ready[m_i]
+        m_i += 1
+        ordered.append(m_by_name[m_name])
+        for m_child in m_children[m_name]:
+            m_parents[m_child] -= 1
+            if m_parents[m_child] == 0:
+                m_ready.append(m_child)
+
+    cycles = [m_obj for m_obj in features if m_parents[m_obj.Name] > 0]
+    return ordered, cycles
+
+
+class RefreshEngine():
+    """ Recompute stale WF features of a document in dependency order.
+    """
+
+    def __init__(self, doc, parametric=('Interactive',)):
+        """
+        *doc*        : the FreeCAD document.
+        *parametric* : the parametric behaviors to refresh.
+        """
+        self.doc = doc
+        self.parametric = parametric
+        self.recomputed = []
+        self.skipped = []
+        self.cycles = []
+
+    def isStale(self, obj):
+        m_key = (self.doc.Name, obj.Name)
+        if m_key not in _LAST_STATES:
+            return True
+        return _LAST_STATES[m_key] != inputsFingerprint(obj)
+
+    def run(self, force=False):
+        """ Refresh the document.
+
+        RETURN:
+        -------
+        A report dictionary with the names of 'recomputed', 'skipped'
+        and 'cycles' features.
+        """
+        m_features = [m_obj for m_obj in self.doc.Objects if isFeature(m_obj)]
+        m_ordered, self.cycles = sortFeatures(m_features)
+
+        for m_obj in m_ordered + self.cycles:
+            if str(m_obj.Parametric) not in self.parametric:
+                continue
+            if not force and not self.isStale(m_obj):
+                self.skipped.append(m_obj.Name)
+                continue
+            m_obj.Proxy.recompute(m_obj)
+            self.recomputed.append(m_obj.Name)
+            _LAST_STATES[(self.doc.Name, m_obj.Name)] = inputsFingerprint(m_obj)
+
+        return {'recomputed': list(self.recomputed),
+                'skipped': list(self.skipped),
+                'cycles': [m_obj.Name for m_obj in self.cycles]}
+
+
+def refreshDocument(doc=None, force=False):
+    """ Refresh all stale Interactive WF features of the document.
+    Return the report of the refresh (see RefreshEngine.run).
+    """
+    if doc is None:
+        doc = App.ActiveDocument
+    m_report = RefreshEngine(doc).run(force)
+
+    m_msg = "Update done : " + str(len(m_report['recomputed']))
+    m_msg += " recomputed, " + str(len(m_report['skipped']))
+    m_msg += " skipped (up to date) !"
+    print_msg(m_msg)
+    if WF.verbose() and m_report['skipped']:
+        print_msg("Skipped : " + ", ".join(m_report['skipped']))
+    if m_report['cycles']:
+        print_msg("Dependency loop between : " + ", ".join(m_report['cycles']))
+    return m_report
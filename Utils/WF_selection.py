@@ -4,6 +4,9 @@ import FreeCAD as App
 import Part
 import WF
 from WF_print import print_msg
+from WF_links import subElementIndex, subElementKind, getSubShapes, \
+    getSubShape
+from WF_batch import uniquePointsIndex
 import WF_geometry as geom
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -12,6 +15,278 @@ if App.GuiUp:
 M_DEBUG = True
 ###############
 
+# Shape types indexed by Selection
+M_SHAPE_TYPES = ("Vertex", "Edge", "Wire", "Face", "Shell")
+
+# Programmatic selection used instead of the GUI one (see setSelection)
+_SELECTION = None
+# Selection read once for the whole command (see SelectionSnapshot)
+_SNAPSHOT = None
+_SNAPSHOT_DEPTH = 0
+# Gui.Selection observer classifying the selection (see startObserver)
+_OBSERVER = None
+
+
+class SelectionItem():
+    """ Programmatic equivalent of a GUI SelectionObject
+    (i.e. for scripts and headless runs).
+
+    *obj*       : the selected object.
+    *sub_names* : the selected subelement names (i.e. ["Edge1", "Edge3"]).
+    """
+
+    def __init__(self, obj, sub_names=()):
+        self.Object = obj
+        self.ObjectName = obj.Name
+        self.SubElementNames = tuple(sub_names)
+        self.SubObjects = tuple(obj.Shape.getElement(m_name)
+                                for m_name in self.SubElementNames)
+        self.HasSubObjects = len(self.SubElementNames) != 0
+
+
+def setSelection(items):
+    """ Sets the selection used by getSel instead of the GUI selection.
+
+    *items* : list of objects or (object, [subelement names]);
+              None to use the GUI selection again.
+
+    >>> setSelection([(m_doc.Edges, ["Edge1", "Edge2"])])
+    >>> m_sel, m_act_doc = getSel()
+    """
+    global _SELECTION
+    if items is None:
+        _SELECTION = None
+        return
+    _SELECTION = []
+    for m_item in items:
+        if isinstance(m_item, (list, tuple)):
+            _SELECTION.append(SelectionItem(m_item[0], m_item[1]))
+        else:
+            _SELECTION.append(SelectionItem(m_item))
+
+
+def getSelectionEx():
+    """ Returns the selected objects (SelectionObjects) of the active
+    document : the current snapshot if any (see SelectionSnapshot),
+    else the programmatic selection (see setSelection),
+    else the GUI selection.
+    """
+    global _SNAPSHOT
+    if _SNAPSHOT is not None:
+        return _SNAPSHOT
+    if _SELECTION is not None:
+        return _SELECTION
+    m_doc = App.activeDocument()
+    if m_doc is None or not App.GuiUp:
+        return []
+    m_selEx = Gui.Selection.getSelectionEx(m_doc.Name)
+    if _SNAPSHOT_DEPTH > 0:
+        _SNAPSHOT = list(m_selEx)
+    return m_selEx
+
+
+def hasSelection():
+    """ Returns True if something is selected.
+    """
+    m_observer = activeObserver()
+    if m_observer is not None:
+        return len(m_observer) != 0
+    return len(getSelectionEx()) != 0
+
+
+def objectShapeType(obj):
+    """ Returns the shape type of a whole selected object.
+    A Compound of Wires only (i.e. a Sketch with many Wires) is
+    classified as "Wire" : its Wires are the "Curves" of the object.
+    """
+    m_shape = obj.Shape
+    m_type = m_shape.ShapeType
+    if m_type == "Compound" and not m_shape.Faces and m_shape.Wires:
+        return "Wire"
+    return m_type
+
+
+class SelectionSnapshot():
+    """ Context of one command : the selection is read (at most) once and
+    shared by all calls (getSelectionEx, hasSelection, getSel) in the
+    context.
+
+    with SelectionSnapshot():
+        if hasSelection():
+            command()
+
+    Snapshots are re-entrant : only the outermost one releases the
+    selection.
+    """
+
+    def __enter__(self):
+        global _SNAPSHOT_DEPTH
+        _SNAPSHOT_DEPTH += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _SNAPSHOT, _SNAPSHOT_DEPTH
+        _SNAPSHOT_DEPTH -= 1
+        if _SNAPSHOT_DEPTH == 0:
+            _SNAPSHOT = None
+        return False
+
+
+class SelectionObserver():
+    """ Gui.Selection observer : classifies the selection incrementally,
+    as the user selects, into the shape type index used by Selection.
+    So a command on a large (box) selection finds the work already done.
+
+    The index follows the order of Gui.Selection.getSelectionEx :
+    objects in order of first selection, then their subelements in
+    order of selection.
+    """
+
+    def __init__(self):
+        self.document = None
+        # object name -> [object, {subelement name: SelectedEntity}]
+        self.objects = {}
+        self.count = 0
+        self.valid = False
+        # shape type -> list of SelectedEntity (built lazily)
+        self.index = None
+
+    def __len__(self):
+        return self.count
+
+    def reset(self, doc_name=None):
+        """ Rebuilds the index from the current GUI selection.
+        """
+        self.document = doc_name
+        self.objects = {}
+        self.count = 0
+        self.index = None
+        self.valid = True
+        if doc_name not in App.listDocuments():
+            return
+        for m_obj in Gui.Selection.getSelectionEx(doc_name):
+            if m_obj.HasSubObjects:
+                for m_name in m_obj.SubElementNames:
+                    self.add(m_obj.Object, m_name)
+            else:
+                self.add(m_obj.Object, "")
+
+    def add(self, obj, sub_name):
+        m_entry = self.objects.get(obj.Name)
+        if m_entry is None:
+            m_entry = [obj, {}]
+            self.objects[obj.Name] = m_entry
+        if sub_name in m_entry[1]:
+            return
+        if sub_name:
+            m_entity = SelectedEntity(obj, subElementKind(sub_name),
+                                      subElementIndex(sub_name))
+        elif hasattr(obj, 'Shape'):
+            m_entity = SelectedEntity(obj, objectShapeType(obj))
+        else:
+            m_entity = None
+        m_entry[1][sub_name] = m_entity
+        self.count += 1
+        self.index = None
+
+    def entities(self):
+        """ Returns the index : shape type -> list of SelectedEntity.
+        """
+        if self.index is None:
+            self.index = {}
+            for _, m_subs in self.objects.values():
+                # As getSelectionEx : an object with selected subelements
+                # is only given by its subelements
+                for m_name, m_entity in m_subs.items():
+                    if m_name == "" and len(m_subs) > 1:
+                        continue
+                    if m_entity is not None and \
+                            m_entity.shape_type in M_SHAPE_TYPES:
+                        self.index.setdefault(m_entity.shape_type,
+                                              []).append(m_entity)
+        return self.index
+
+    def isValidFor(self, doc):
+        """ Returns True if the index is up to date for the document.
+        """
+        if not self.valid or doc is None or self.document != doc.Name:
+            return False
+        # Cheap check (no subshapes built) against missed events
+        return len(Gui.Selection.getSelection(doc.Name)) == len(self.objects)
+
+    # Gui.Selection observer methods
+    def addSelection(self, doc, obj, sub, pnt):
+        if doc != self.document:
+            self.reset(doc)
+            return
+        m_doc = App.listDocuments().get(doc)
+        m_obj = m_doc.getObject(obj) if m_doc is not None else None
+        if m_obj is None:
+            self.valid = False
+            return
+        self.add(m_obj, sub)
+
+    def removeSelection(self, doc, obj, sub):
+        if doc != self.document:
+            self.reset(doc)
+            return
+        m_entry = self.objects.get(obj)
+        if m_entry is None:
+            return
+        if sub:
+            if m_entry[1].pop(sub, False) is not False:
+                self.count -= 1
+        else:
+            self.count -= len(m_entry[1])
+            m_entry[1].clear()
+        if not m_entry[1]:
+            del self.objects[obj]
+        self.index = None
+
+    def setSelection(self, doc):
+        self.reset(doc)
+
+    def clearSelection(self, doc):
+        self.document = doc if doc else self.document
+        self.objects = {}
+        self.count = 0
+        self.index = None
+        self.valid = True
+
+
+def startObserver():
+    """ Starts classifying the GUI selection as the user selects
+    (run when the workbench is activated).
+    """
+    global _OBSERVER
+    if not App.GuiUp or _OBSERVER is not None:
+        return
+    _OBSERVER = SelectionObserver()
+    m_doc = App.activeDocument()
+    _OBSERVER.reset(m_doc.Name if m_doc is not None else None)
+    Gui.Selection.addObserver(_OBSERVER)
+
+
+def stopObserver():
+    """ Stops the selection observer (see startObserver).
+    """
+    global _OBSERVER
+    if _OBSERVER is None:
+        return
+    Gui.Selection.removeObserver(_OBSERVER)
+    _OBSERVER = None
+
+
+def activeObserver():
+    """ Returns the selection observer if its index can be used for the
+    active document, else None.
+    """
+    if _OBSERVER is None or _SELECTION is not None:
+        return None
+    if not _OBSERVER.isValidFor(App.activeDocument()):
+        return None
+    return _OBSERVER
+
 
 def getSel(verbose=0):
     """ Create and return A Selection Object
@@ -59,8 +334,15 @@ def getSel(verbose=0):
         print("Document.Name = " + str(m_doc.Name))
         printObjectStructure()
 
-    m_selEx = Gui.Selection.getSelectionEx(m_doc.Name)
-    m_sel = Selection(m_selEx)
+    if _SNAPSHOT is None and _SELECTION is None and not App.GuiUp:
+        message = "No GUI selection available !"
+        return (None, message)
+    m_observer = activeObserver()
+    if m_observer is not None:
+        # Already classified as the user selected
+        m_sel = Selection(None, entities=m_observer.entities())
+    else:
+        m_sel = Selection(getSelectionEx())
 
     if m_sel is None:
         message = "Unable to create a Selection Object !"
@@ -77,9 +359,7 @@ def printObjectStructure():
     m_act_doc = App.activeDocument()
     print(str(m_act_doc.Name))
 
-    m_selEx = Gui.Selection.getSelectionEx(m_act_doc.Name)
-
-    for m_sel in m_selEx:
+    for m_sel in getSelectionEx():
         print("|__" + str(m_sel.ObjectName) +
               " (type: " + str(m_sel.Object.Shape.ShapeType) + ")")
 
@@ -108,12 +388,38 @@ def selection_debug(m_parent, m_name, m_i, m_type):
         print_msg("   m_i = " + str(m_i))
 
 
+class SelectedEntity():
+    """ One selected entity : the parent object, the shape type and the
+    index of the subelement (0 for a whole object).
+    """
+    __slots__ = ('parent', 'shape_type', 'index')
+
+    def __init__(self, parent, shape_type, index=0):
+        self.parent = parent
+        self.shape_type = shape_type
+        self.index = index
+
+    def __repr__(self):
+        return str(self.parent) + "." + self.name()
+
+    def name(self):
+        """ Returns the subelement name (i.e. "Edge12").
+        """
+        return self.shape_type + str(self.index)
+
+
 class Selection():
 
-    def __init__(self, Gui_Selection):
+    def __init__(self, Gui_Selection, entities=None):
         """ Create a Selection Object
 
         *Gui_Selection* : selected object from GUI.
+        *entities*      : (Optional) selected entities already indexed by
+                          shape type (see SelectionObserver); the GUI
+                          selection is then only read if needed.
+
+        The selected entities are indexed once by shape type; the lists
+        of names are only built for the types a command asks for.
 
         EXAMPLE :
         m_activeDoc = App.activeDocument()
@@ -127,68 +433,50 @@ class Selection():
         m_selEx = Gui.Selection.getSelectionEx(m_activeDoc.Name)
         m_sel = Selection(m_selEx)
 
-        number_of_edges, edge_list = m_sel.get_segments(
-           getfrom=["Points","Segments","Curves","Planes","Objects"])
+        number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+           get_from=["Segments","Curves","Planes","Objects"])
 
         """
-        self.__numberOfEntities = 0
-        self.__numberOfVertexes = 0
-        self.__numberOfEdges = 0
-        self.__numberOfWires = 0
-        self.__numberOfFaces = 0
-        self.__numberOfShells = 0
-        self.__numberOfObjects = 0
-        self.__numberOfImages = 0
-
-        self.__selectedVertices = []
-        self.__selectedVerticesNames = []
-        self.__selectedEdges = []
-        self.__selectedEdgesNames = []
-        self.__selectedWires = []
-        self.__selectedWiresNames = []
-        self.__selectedFaces = []
-        self.__selectedFacesNames = []
-        self.__selectedShells = []
-        self.__selectedShellsNames = []
+        # shape type -> list of SelectedEntity
+        self.__entities = {}
+        # shape type -> list of [parent, name] (built lazily)
+        self.__names = {}
         self.__selectedObjects = []
-        self.__selectedObjectsNames = []
         self.__selectedImages = []
-        self.__selectedImagesNames = []
 
         self.__selEx = Gui_Selection
+        self.__preset = entities
 
         self.initialize()
 
+    def __selectionEx(self):
+        if self.__selEx is None:
+            self.__selEx = getSelectionEx()
+        return self.__selEx
+
     def storeShapeType(self, Parent, ObjectShape, Name=None, index=0):
         m_shape = ObjectShape
         if M_DEBUG:
             print("  Object.Shape = " + str(m_shape))
 
-        if m_shape == "Vertex":
-            self.__selectedVertices.append(Parent)
-            self.__selectedVerticesNames.append("Vertex" + str(index))
-            return True
-        if m_shape == "Edge":
-            self.__selectedEdges.append(Parent)
-            self.__selectedEdgesNames.append("Edge" + str(index))
-            return True
-        if m_shape == "Wire":
-            self.__selectedWires.append(Parent)
-            self.__selectedWiresNames.append("Wire" + str(index))
-            return True
-        if m_shape == "Face":
-            self.__selectedFaces.append(Parent)
-            self.__selectedFacesNames.append("Face" + str(index))
-            return True
-        if m_shape == "Shell":
-            self.__selectedShells.append(Parent)
-            self.__selectedShellsNames.append("Shell" + str(index))
+        if m_shape in M_SHAPE_TYPES:
+            self.__entities.setdefault(m_shape, []).append(
+                SelectedEntity(Parent, m_shape, index))
+            self.__names.pop(m_shape, None)
             return True
             # TO DO insert Object type
         print("Unknown ShapeType !")
         return False
 
     def initialize(self):
+        self.__entities = {}
+        self.__names = {}
+
+        if self.__preset is not None:
+            for m_shape, m_entities in self.__preset.items():
+                self.__entities[m_shape] = list(m_entities)
+            return
+
         if self.__selEx is None:
             message = "No Selection from Active document passed !"
             print_msg(message)
@@ -207,42 +495,21 @@ class Selection():
                     m_parent = m_obj.Object
                     m_object = m_obj.Object
                     m_name = m_obj.Object.Name
-#                     if hasattr(m_object, 'ShapeType'):
-#                         self.storeShapeType(m_object, m_name)
                     if hasattr(m_object, 'Shape'):
                         self.storeShapeType(
-                            m_parent, m_object.Shape.ShapeType, m_name)
-#                     if hasattr(m_object, 'ImageFile'):
-#                         self.__selectedImages.append(m_object)
+                            m_parent, objectShapeType(m_object), m_name)
             else:
                 if M_DEBUG:
                     print("SOME SubObjects !")
                 m_parent = m_obj.Object
                 m_parent_name = m_obj.ObjectName
-                for m_name, m_object in zip(
-                        m_obj.SubElementNames, m_obj.SubObjects):
-                    m_index = re.sub('[^0-9]', '', m_name)
-                    index = int(m_index)
+                # The shape type is read from the subelement name :
+                # the subshapes (SubObjects) are not built
+                for m_name in m_obj.SubElementNames:
                     m_composite_name = str(m_parent_name) + "." + str(m_name)
-                    if hasattr(m_object, 'ShapeType'):
-                        self.storeShapeType(
-                            m_parent, m_object.ShapeType, m_composite_name, index)
-#                     if hasattr(m_object, 'Shape'):
-#                         self.storeShapeType(m_object, m_composite_name)
-#                     if hasattr(m_object, 'ImageFile'):
-#                         self.__selectedImages.append(m_object)
-
-        self.__numberOfVertexes = len(self.__selectedVertices)
-        self.__numberOfEdges = len(self.__selectedEdges)
-        self.__numberOfWires = len(self.__selectedWires)
-        self.__numberOfFaces = len(self.__selectedFaces)
-        self.__numberOfShells = len(self.__selectedShells)
-        self.__numberOfObjects = len(self.__selectedObjects)
-        self.__numberOfImages = len(self.__selectedImages)
-        self.__numberOfEntities = self.__numberOfVertexes + \
-            self.__numberOfEdges + self.__numberOfWires + self.__numberOfFaces + \
-            self.__numberOfShells + \
-            self.__numberOfObjects + self.__numberOfImages
+                    self.storeShapeType(
+                        m_parent, subElementKind(m_name), m_composite_name,
+                        subElementIndex(m_name))
 
         message = "Selection.initialize done !"
         if M_DEBUG:
@@ -253,146 +520,151 @@ class Selection():
         if M_DEBUG:
             print("running Selection.removeItem !")
 
-        self.__numberOfEntities = len(self.__selEx)
-        if self.__numberOfEntities < 1:
+        m_selEx = self.__selectionEx()
+        if m_id < 0 or m_id >= len(m_selEx):
             return
-
-        for c, _ in enumerate(self.__selEx, 0):
-            if c == m_id:
-                del self.__selEx[id]
-                break
+        self.__selEx = [m_obj for m_i, m_obj in enumerate(m_selEx)
+                        if m_i != m_id]
+        self.__preset = None
         self.initialize()
 
-    def __getNumberOfEntities(self):
-        return self.__numberOfEntities
+    def __count(self, shape_type):
+        return len(self.__entities.get(shape_type, ()))
 
-    def __setNumberOfEntities(self, val):
-        self.__numberOfEntities = val
+    def __parents(self, shape_type):
+        return [m_entity.parent
+                for m_entity in self.__entities.get(shape_type, ())]
 
-    numberOfEntities = property(__getNumberOfEntities, __setNumberOfEntities)
+    def __selectedNames(self, shape_type):
+        """ Returns the list of [parent, name] of the selected entities
+        of the shape type (built at first call).
+        """
+        m_names = self.__names.get(shape_type)
+        if m_names is None:
+            m_names = [[m_entity.parent, m_entity.name()]
+                       for m_entity in self.__entities.get(shape_type, ())]
+            self.__names[shape_type] = m_names
+        return m_names
+
+    def __subNames(self, shape_type, kind, unique=False):
+        """ Returns the list of [parent, name] of all subelements of
+        the kind ('Vertex', 'Edge') of the parent of each selected
+        entity of the shape type.
+        If unique is True, each parent is only listed once.
+        """
+        m_names = []
+        m_seen = set()
+        for m_entity in self.__entities.get(shape_type, ()):
+            m_parent = m_entity.parent
+            if not hasattr(m_parent, 'Shape'):
+                continue
+            if unique:
+                if id(m_parent) in m_seen:
+                    continue
+                m_seen.add(id(m_parent))
+            for m_i in range(len(getSubShapes(m_parent, kind))):
+                m_names.append([m_parent, kind + str(m_i + 1)])
+        return m_names
+
+    def __uniquePoints(self, picked, found):
+        """ Returns the list of [parent, name] of the picked Vertexes
+        (all kept) followed by the found Vertexes (of selected Edges or
+        Faces) not at the same location as a previous one
+        (see WF_batch.uniquePointsIndex).
+        """
+        # Same Vertex listed many times (once per selected Edge or Face
+        # of the parent)
+        m_seen = set((id(m_item[0]), m_item[1]) for m_item in picked)
+        m_names = []
+        for m_item in found:
+            m_key = (id(m_item[0]), m_item[1])
+            if m_key not in m_seen:
+                m_seen.add(m_key)
+                m_names.append(m_item)
+        if len(m_names) == 0:
+            return list(picked)
+
+        m_names = list(picked) + m_names
+        m_points = [getSubShape(m_parent, m_name, "Vertex").Point
+                    for m_parent, m_name in m_names]
+        return list(picked) + [
+            m_names[m_i] for m_i in
+            uniquePointsIndex(m_points, WF.tolerance()).tolist()
+            if m_i >= len(picked)]
 
-    def __getNumberOfPoints(self):
-        return self.__numberOfVertexes
+    def __getNumberOfEntities(self):
+        return sum(len(m_entities) for m_entities in
+                   self.__entities.values()) + \
+            len(self.__selectedObjects) + len(self.__selectedImages)
+
+    numberOfEntities = property(__getNumberOfEntities)
 
-    def __setNumberOfPoints(self, val):
-        self.__numberOfVertexes = val
+    def __getNumberOfPoints(self):
+        return self.__count("Vertex")
 
-    numberOfPoints = property(__getNumberOfPoints, __setNumberOfPoints)
+    numberOfPoints = property(__getNumberOfPoints)
 
     def __getNumberOfSegments(self):
-        return self.__numberOfEdges
-
-    def __setNumberOfSegments(self, val):
-        self.__numberOfEdges = val
+        return self.__count("Edge")
 
-    numberOfSegments = property(
-        __getNumberOfSegments,
-        __setNumberOfSegments)
+    numberOfSegments = property(__getNumberOfSegments)
 
     def __getSelectedEdges(self):
-        return self.__selectedEdges
+        return self.__parents("Edge")
 
-    def __setSelectedEdges(self, val):
-        self.__selectedEdges = val
-
-    selectedEdges = property(
-        __getSelectedEdges,
-        __setSelectedEdges)
+    selectedEdges = property(__getSelectedEdges)
 
     def __getSelectedEdgesNames(self):
-        return self.__selectedEdgesNames
-
-    def __setSelectedEdgesNames(self, val):
-        self.__selectedEdgesNames = val
+        return [m_name for _, m_name in self.__selectedNames("Edge")]
 
-    selectedEdgesNames = property(
-        __getSelectedEdgesNames,
-        __setSelectedEdgesNames)
+    selectedEdgesNames = property(__getSelectedEdgesNames)
 
     def __getNumberOfCurves(self):
-        return self.__numberOfWires
+        return self.__count("Wire")
 
-    def __setNumberOfCurves(self, val):
-        self.__numberOfWires = val
-
-    numberOfCurves = property(
-        __getNumberOfCurves,
-        __setNumberOfCurves)
+    numberOfCurves = property(__getNumberOfCurves)
 
     def __getNumberOfPlanes(self):
-        return self.__numberOfFaces
-
-    def __setNumberOfPlanes(self, val):
-        self.__numberOfFaces = val
+        return self.__count("Face")
 
-    numberOfPlanes = property(
-        __getNumberOfPlanes,
-        __setNumberOfPlanes)
+    numberOfPlanes = property(__getNumberOfPlanes)
 
     def __getSelectedPlanes(self):
-        return self.__selectedFaces
+        return self.__parents("Face")
 
-    def __setSelectedPlanes(self, val):
-        self.__selectedFaces = val
-
-    selectedPlanes = property(
-        __getSelectedPlanes,
-        __setSelectedPlanes)
+    selectedPlanes = property(__getSelectedPlanes)
 
     def __getSelectedPlanesNames(self):
-        return self.__selectedFacesNames
-
-    def __setSelectedPlanesNames(self, val):
-        self.__selectedFacesNames = val
+        return [m_name for _, m_name in self.__selectedNames("Face")]
 
-    selectedPlanesNames = property(
-        __getSelectedPlanesNames,
-        __setSelectedPlanesNames)
+    selectedPlanesNames = property(__getSelectedPlanesNames)
 
     def __getNumberOfObjects(self):
-        return self.__numberOfObjects
-
-    def __setNumberOfObjects(self, val):
-        self.__numberOfObjects = val
+        return len(self.__selectedObjects)
 
-    numberOfObjects = property(__getNumberOfObjects, __setNumberOfObjects)
+    numberOfObjects = property(__getNumberOfObjects)
 
     def __getNumberOfImages(self):
-        return self.__numberOfImages
+        return len(self.__selectedImages)
 
-    def __setNumberOfImages(self, val):
-        self.__numberOfImages = val
-
-    numberOfImages = property(__getNumberOfImages, __setNumberOfImages)
+    numberOfImages = property(__getNumberOfImages)
 
     def __str__(self):
         message = "\nGui_Selection        = " + str(self.__selEx)
-        message += "\nNumber Of Images     = " + str(self.__numberOfImages)
-        message += " " + str(self.__selectedImages)
-        message += " " + str(self.__selectedImagesNames)
-        message += "\nNumber Of Objects    = " + str(self.__numberOfObjects)
-        message += " " + str(self.__selectedObjects)
-        message += " " + str(self.__selectedObjectsNames)
-        message += "\nNumber Of Shells     = " + str(self.__numberOfShells)
-        message += " " + str(self.__selectedShells)
-        message += " " + str(self.__selectedShellsNames)
-        message += "\nNumber Of Planes     = " + str(self.__numberOfFaces)
-        message += " " + str(self.__selectedFaces)
-        message += " " + str(self.__selectedFacesNames)
-        message += "\nNumber Of Curves     = " + \
-            str(self.__numberOfWires)
-        message += " " + str(self.__selectedWires)
-        message += " " + str(self.__selectedWiresNames)
-        message += "\nNumber Of Segments   = " + \
-            str(self.__numberOfEdges)
-        message += " " + str(self.__selectedEdges)
-        message += " " + str(self.__selectedEdgesNames)
-        message += "\nNumber Of Points     = " + \
-            str(self.__numberOfVertexes)
-        message += " " + str(self.__selectedVertices)
-        message += " " + str(self.__selectedVerticesNames)
+        message += "\nNumber Of Images     = " + \
+            str(len(self.__selectedImages))
+        message += "\nNumber Of Objects    = " + \
+            str(len(self.__selectedObjects))
+        for m_label, m_shape in (("Shells  ", "Shell"),
+                                 ("Planes  ", "Face"),
+                                 ("Curves  ", "Wire"),
+                                 ("Segments", "Edge"),
+                                 ("Points  ", "Vertex")):
+            message += "\nNumber Of " + m_label + "   = " + \
+                str(self.__count(m_shape))
+            message += " " + str(self.__entities.get(m_shape, []))
         message += "\nNumber Of Entities   = " + \
-            str(self.__numberOfEntities)
+            str(self.numberOfEntities)
         return (message)
 
     def get_vertexesFromPlane(self, subObj, selObject, SelEntities):
@@ -412,7 +684,8 @@ class Selection():
         # Managing Compounds
 
     def get_pointsWithNames(self,
-                            get_from=["Points"]
+                            get_from=["Points"],
+                            dedupe=None
                             ):
         """ Return all Points found in Selection object.
         depending of 'getFrom' parameter.
@@ -432,6 +705,12 @@ class Selection():
                     "Points"
                     "Segments", "Curves",
                     "Planes", "Objects", "Sets"
+        *dedupe*   : (Boolean, Optional, default=WF.dedupePoints())
+                    If True, the Points found into the selected Edges
+                    and Faces at the same location (within
+                    WF.tolerance()) as a previous Point are removed
+                    (i.e. the Vertexes shared by the selected Faces).
+                    Selected Points are always kept.
 
         Examples
         -------
@@ -442,32 +721,30 @@ class Selection():
         if self.numberOfEntities == 0:
             return (0, None)
 
+        if dedupe is None:
+            dedupe = WF.dedupePoints()
         m_sel_items = []
+        m_found_items = []
 
         # Managing Vertexes
-        if self.__numberOfVertexes != 0 and "Points" in get_from:
-            for m_v, m_l in zip(self.__selectedVertices,
-                                self.__selectedVerticesNames):
-                m_sel_items.append([m_v, m_l])
+        if "Points" in get_from:
+            m_sel_items.extend(self.__selectedNames("Vertex"))
         # Managing Edges
-        if self.__numberOfEdges != 0 and "Segments" in get_from:
-            for m_f, m_l in zip(self.__selectedEdges,
-                                self.__selectedEdgesNames):
-                if hasattr(m_f.Shape, 'Vertexes'):
-                    for index, m_e in enumerate(m_f.Shape.Vertexes, 0):
-                        m_sel_items.append([m_f, "Vertex" + str(index)])
+        if "Segments" in get_from:
+            m_found_items.extend(self.__subNames("Edge", "Vertex", dedupe))
         # Managing Wires
         # Managing Faces
-        if self.__numberOfFaces != 0 and "Planes" in get_from:
-            for m_f, m_l in zip(self.__selectedFaces,
-                                self.__selectedFacesNames):
-                if hasattr(m_f.Shape, 'Vertexes'):
-                    for index, m_e in enumerate(m_f.Shape.Vertexes, 0):
-                        m_sel_items.append([m_f, "Vertex" + str(index)])
+        if "Planes" in get_from:
+            m_found_items.extend(self.__subNames("Face", "Vertex", dedupe))
         # Managing Shells
         # Managing Solids
         # Managing Compounds
 
+        if dedupe:
+            m_sel_items = self.__uniquePoints(m_sel_items, m_found_items)
+        else:
+            m_sel_items.extend(m_found_items)
+
         if WF.verbose():
             print_msg("number_of_vertexes = " + str(len(m_sel_items)))
             print_msg("vertex_list = " + str(m_sel_items))
@@ -511,26 +788,16 @@ class Selection():
 
         # Managing Vertexes : Not valid
         # Managing Edges
-        if self.__numberOfEdges != 0 and "Segments" in get_from:
-            for m_e, m_l in zip(self.__selectedEdges,
-                                self.__selectedEdgesNames):
-                m_sel_items.append([m_e, m_l])
+        if "Segments" in get_from:
+            m_sel_items.extend(self.__selectedNames("Edge"))
 
         # Managing Wires
-        if self.__numberOfWires != 0 and "Curves" in get_from:
-            for m_f, m_l in zip(self.__selectedWires,
-                                self.__selectedWiresNames):
-                if hasattr(m_f.Shape, 'Edges'):
-                    for index, m_e in enumerate(m_f.Shape.Edges, 0):
-                        m_sel_items.append([m_f, "Edge" + str(index)])
+        if "Curves" in get_from:
+            m_sel_items.extend(self.__subNames("Wire", "Edge"))
 
         # Managing Faces
-        if self.__numberOfFaces != 0 and "Planes" in get_from:
-            for m_f, m_l in zip(self.__selectedFaces,
-                                self.__selectedFacesNames):
-                if hasattr(m_f.Shape, 'Edges'):
-                    for index, m_e in enumerate(m_f.Shape.Edges, 0):
-                        m_sel_items.append([m_f, "Edge" + str(index)])
+        if "Planes" in get_from:
+            m_sel_items.extend(self.__subNames("Face", "Edge"))
 #                 if not m_f.HasSubObjects:
 #                     if hasattr(m_f.Shape, 'Edges'):
 #                         for index, m_e in enumerate(m_f.Shape.Edges, 0):
@@ -543,13 +810,8 @@ class Selection():
 #                             m_sel_items.append(
 #                                 [m_f.SubObjects[m_index - 1], "Edge" + str(index)])
         # Managing Shells
-        if self.__numberOfShells != 0 and "Shells" in get_from:
-            for m_f, m_l in zip(self.__selectedShells,
-                                self.__selectedShellsNames):
-                print(m_f)
-                if hasattr(m_f.Shape, 'Edges'):
-                    for index, m_e in enumerate(m_f.Shape.Edges, 0):
-                        m_sel_items.append([m_f, "Edge" + str(index)])
+        if "Shells" in get_from:
+            m_sel_items.extend(self.__subNames("Shell", "Edge"))
         # Managing Solids
         # Managing Compounds
 
@@ -563,7 +825,41 @@ class Selection():
         return (0, None)
 
     def get_curvesWithNames(self):
-        pass
+        """ Return all Wires found in the "Curves" of the Selection object.
+
+        Return
+        -------
+        A tuple : (Number, Selected_Wires)
+        Selected_Wires as a list of [obj.Object, Name]
+        A whole object (i.e. a Sketch) gives all its Wires.
+
+        (0, None) if no Wire detected
+        """
+        if M_DEBUG:
+            print("\nrunning Selection.get_curvesWithNames !")
+        if self.numberOfEntities == 0:
+            return (0, None)
+
+        m_sel_items = []
+
+        # Managing Wires
+        for m_entity in self.__entities.get("Wire", ()):
+            if m_entity.index > 0:
+                m_sel_items.append([m_entity.parent, m_entity.name()])
+            elif hasattr(m_entity.parent, 'Shape'):
+                for m_i in range(len(getSubShapes(m_entity.parent,
+                                                  'Wire'))):
+                    m_sel_items.append([m_entity.parent,
+                                        "Wire" + str(m_i + 1)])
+
+        if WF.verbose():
+            print_msg("number_of_wires = " + str(len(m_sel_items)))
+            print_msg("wire_list = " + str(m_sel_items))
+
+        if len(m_sel_items) != 0:
+            return (len(m_sel_items), m_sel_items)
+
+        return (0, None)
 
     def get_planesWithNames(self):
         pass
@@ -590,7 +886,7 @@ class Selection():
 
         Selected_Entities = []
 
-        for m_obj in self.__selEx:
+        for m_obj in self.__selectionEx():
             m_shape = m_obj.Object.Shape
             if M_DEBUG:
                 print("m_shape = " + str(m_shape))
@@ -622,7 +918,6 @@ class Selection():
         """
         return a list of [obj.Object,"Face"+str(i)]
         """
-        M_DEBUG = True
         if M_DEBUG:
             print("self.numberOfEntities = " + str(self.numberOfEntities))
         if self.numberOfEntities == 0:
@@ -630,7 +925,7 @@ class Selection():
 
         Selected_Entities = []
 
-        for m_obj in self.__selEx:
+        for m_obj in self.__selectionEx():
             m_shape = m_obj.Object.Shape
             if M_DEBUG:
                 print("m_shape = " + str(m_shape))
@@ -639,30 +934,27 @@ class Selection():
             if m_obj.HasSubObjects:
                 if M_DEBUG:
                     print("m_obj.HasSubObjects")
-                m_i = 0
-
-                for m_subobj in m_obj.SubObjects:
+                for m_i, m_subobj in enumerate(m_obj.SubObjects):
                     if M_DEBUG:
                         print("m_subobj = " + str(m_subobj))
 
                     if issubclass(type(m_subobj), Part.Face):
                         Selected_Entities.append(
                             [m_obj.Object, m_obj.SubElementNames[m_i]])
-                        m_i += 1
             else:
                 if M_DEBUG:
                     print("NOT m_obj.HasSubObjects")
                 m_i = 0
 
                 if issubclass(type(m_shape), Part.Face):
-                    Selected_Entities.append([m_obj.Object, "Face" + str(m_i)])
+                    Selected_Entities.append([m_obj.Object, "Face" + str(m_i + 1)])
                     m_i += 1
 
                 elif issubclass(type(m_shape), Part.Compound):
                     if hasattr(m_shape, 'Faces'):
                         for m_e in m_shape.Faces:
                             Selected_Entities.append(
-                                [m_obj.Object, "Face" + str(m_i)])
+                                [m_obj.Object, "Face" + str(m_i + 1)])
                             m_i += 1
 
                 elif issubclass(type(m_shape),
@@ -670,7 +962,7 @@ class Selection():
                     if hasattr(m_shape, 'Faces'):
                         for m_e in m_shape.Faces:
                             Selected_Entities.append(
-                                [m_obj.Object, "Face" + str(m_i)])
+                                [m_obj.Object, "Face" + str(m_i + 1)])
                             m_i += 1
 
         if len(Selected_Entities) != 0:
@@ -690,16 +982,16 @@ class Selection():
             return (0, None)
 
     def get_primerPoints(self):
-        return self.get_primer_selected_entities(self.__selectedVertices)
+        return self.get_primer_selected_entities(self.__parents("Vertex"))
 
     def get_primerSegments(self):
-        return self.get_primer_selected_entities(self.__selectedEdges)
+        return self.get_primer_selected_entities(self.__parents("Edge"))
 
     def get_primerCurves(self):
-        return self.get_primer_selected_entities(self.__selectedWires)
+        return self.get_primer_selected_entities(self.__parents("Wire"))
 
     def get_primerPlanes(self):
-        return self.get_primer_selected_entities(self.__selectedFaces)
+        return self.get_primer_selected_entities(self.__parents("Face"))
 
     def get_primerObjects(self):
         return self.get_primer_selected_entities(self.__selectedObjects)
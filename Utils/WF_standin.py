@@ -0,0 +1,1273 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Lightweight stand-in of FreeCAD for tests and micro-benchmarks.
+
+WF utilities import FreeCAD, Part, FreeCADGui and PySide at module load.
+This module emulates the small part of these APIs used by WF
+(App.Vector, ParamGet, documents and document observers, Part shapes
+made of straight edges and planar faces, Gui.Selection) so that
+WF_geometry, WF_selection, ... can be imported and run in plain Python.
+
+    import WF_standin
+    WF_standin.install()
+    import WF_geometry
+    ...
+    m_doc = WF_standin.makeDocument()
+    WF_standin.select(m_doc.Edges, ["Edge1", "Edge2"])
+
+install() only registers the modules which can not be imported, so it
+is harmless inside FreeCAD (use force=True to always use the stand-in).
+This is NOT a geometric kernel : curves are straight segments and
+faces are planar polygons.
+"""
+import sys
+import math
+import types
+import itertools
+
+###############
+M_DEBUG = False
+M_VERSION = ['0', '18', '0', 'WF stand-in']
+###############
+
+# Names of the emulated modules -> stand-in modules (once installed)
+_MODULES = {}
+
+
+def _toVector(value):
+    if isinstance(value, Vector):
+        return Vector(value)
+    return Vector(*value)
+
+
+# ---------------------------------------------------------------------------
+# FreeCAD (App)
+# ---------------------------------------------------------------------------
+class Vector():
+    """ App.Vector : a mutable 3D vector.
+    As in FreeCAD, multiply, normalize and scale modify the vector
+    in place (and return it), add and sub return a new vector.
+    """
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (Vector, tuple, list)):
+            x, y, z = x[0], x[1], x[2]
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __repr__(self):
+        return "Vector ({0!r}, {1!r}, {2!r})".format(self.x, self.y, self.z)
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector):
+            return NotImplemented
+        return (self.x, self.y, self.z) == (other.x, other.y, other.z)
+
+    def __ne__(self, other):
+        m_eq = self.__eq__(other)
+        return m_eq if m_eq is NotImplemented else not m_eq
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __neg__(self):
+        return Vector(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, Vector):
+            return self.dot(other)
+        return Vector(self.x * other, self.y * other, self.z * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return Vector(self.x / other, self.y / other, self.z / other)
+
+    def add(self, other):
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def sub(self, other):
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def negative(self):
+        return -self
+
+    def multiply(self, factor):
+        self.x *= factor
+        self.y *= factor
+        self.z *= factor
+        return self
+
+    def scale(self, x, y, z):
+        self.x *= x
+        self.y *= y
+        self.z *= z
+        return self
+
+    def dot(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def cross(self, other):
+        return Vector(self.y * other.z - self.z * other.y,
+                      self.z * other.x - self.x * other.z,
+                      self.x * other.y - self.y * other.x)
+
+    @property
+    def Length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalize(self):
+        m_length = self.Length
+        if m_length == 0.0:
+            raise ValueError("Cannot normalize null vector")
+        return self.multiply(1.0 / m_length)
+
+    def isEqual(self, other, tolerance):
+        return self.distanceToPoint(other) <= tolerance
+
+    def distanceToPoint(self, other):
+        return self.sub(other).Length
+
+    def distanceToLine(self, base, direction):
+        m_dir = Vector(direction).normalize()
+        return self.sub(base).cross(m_dir).Length
+
+    def getAngle(self, other):
+        m_lengths = self.Length * other.Length
+        if m_lengths == 0.0:
+            return 0.0
+        m_cos = max(-1.0, min(1.0, self.dot(other) / m_lengths))
+        return math.acos(m_cos)
+
+
+class Placement():
+    """ App.Placement : only the position (Base) is emulated.
+    """
+
+    def __init__(self, base=None, rotation=None):
+        self.Base = Vector() if base is None else _toVector(base)
+        self.Rotation = rotation
+
+    def multVec(self, vector):
+        return self.Base.add(vector)
+
+
+class _Console():
+    """ App.Console
+    """
+
+    def PrintMessage(self, msg):
+        sys.stdout.write(str(msg))
+
+    def PrintLog(self, msg):
+        if M_DEBUG:
+            sys.stdout.write(str(msg))
+
+    def PrintWarning(self, msg):
+        sys.stderr.write(str(msg))
+
+    def PrintError(self, msg):
+        sys.stderr.write(str(msg))
+
+
+class ParamGroup():
+    """ Parameter group as returned by App.ParamGet.
+    Observers attached are notified by onChange(group, name).
+    """
+
+    def __init__(self, name):
+        self.Name = name
+        self.values = {}
+        self.groups = {}
+        self.observers = []
+
+    def GetGroup(self, name):
+        if name not in self.groups:
+            self.groups[name] = ParamGroup(name)
+        return self.groups[name]
+
+    def _get(self, kind, name, default):
+        return self.values.get((kind, name), default)
+
+    def _set(self, kind, name, value):
+        self.values[(kind, name)] = value
+        for m_observer in list(self.observers):
+            m_observer.onChange(self, name)
+
+    def _rem(self, kind, name):
+        self.values.pop((kind, name), None)
+
+    def GetBool(self, name, default=False):
+        return self._get('Bool', name, default)
+
+    def GetInt(self, name, default=0):
+        return self._get('Int', name, default)
+
+    def GetUnsigned(self, name, default=0):
+        return self._get('Unsigned', name, default)
+
+    def GetFloat(self, name, default=0.0):
+        return self._get('Float', name, default)
+
+    def GetString(self, name, default=""):
+        return self._get('String', name, default)
+
+    def SetBool(self, name, value):
+        self._set('Bool', name, bool(value))
+
+    def SetInt(self, name, value):
+        self._set('Int', name, int(value))
+
+    def SetUnsigned(self, name, value):
+        self._set('Unsigned', name, int(value))
+
+    def SetFloat(self, name, value):
+        self._set('Float', name, float(value))
+
+    def SetString(self, name, value):
+        self._set('String', name, str(value))
+
+    def RemBool(self, name):
+        self._rem('Bool', name)
+
+    def RemInt(self, name):
+        self._rem('Int', name)
+
+    def RemUnsigned(self, name):
+        self._rem('Unsigned', name)
+
+    def RemFloat(self, name):
+        self._rem('Float', name)
+
+    def RemString(self, name):
+        self._rem('String', name)
+
+    def Attach(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def Detach(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+
+_PARAMS = {}
+
+
+def ParamGet(path):
+    """ App.ParamGet
+    """
+    if path not in _PARAMS:
+        _PARAMS[path] = ParamGroup(path.split("/")[-1])
+    return _PARAMS[path]
+
+
+_OBSERVERS = []
+
+
+def addDocumentObserver(observer):
+    if observer not in _OBSERVERS:
+        _OBSERVERS.append(observer)
+
+
+def removeDocumentObserver(observer):
+    if observer in _OBSERVERS:
+        _OBSERVERS.remove(observer)
+
+
+def _notify(slot, *args):
+    for m_observer in list(_OBSERVERS):
+        if hasattr(m_observer, slot):
+            getattr(m_observer, slot)(*args)
+
+
+class DocumentObject():
+    """ Document object : properties are plain attributes
+    registered into PropertiesList.
+    The Proxy (FeaturePython) onChanged is called when a property
+    is set, and execute on recompute.
+    """
+
+    def __init__(self, doc, type_id, name):
+        self.__dict__['_properties'] = {}
+        self.__dict__['_enums'] = {}
+        self.__dict__['_modes'] = {}
+        self.__dict__['Document'] = doc
+        self.__dict__['TypeId'] = type_id
+        self.__dict__['Name'] = name
+        self.__dict__['Proxy'] = None
+        self.__dict__['ViewObject'] = None
+        self.__dict__['touched'] = True
+        self.addProperty("App::PropertyString", "Label", "Base")
+        self.__dict__['Label'] = name
+        if type_id.startswith("Part::"):
+            self.addProperty("Part::PropertyPartShape", "Shape", "Base")
+            self.__dict__['Shape'] = Shape()
+            self.addProperty("App::PropertyPlacement", "Placement", "Base")
+            self.__dict__['Placement'] = Placement()
+        if type_id == "App::DocumentObjectGroup":
+            self.addProperty("App::PropertyLinkList", "Group", "Base")
+            self.__dict__['Group'] = []
+
+    def __repr__(self):
+        return "<{0:s} object>".format(self.TypeId)
+
+    def __getattr__(self, name):
+        m_enums = self.__dict__['_enums']
+        if name in m_enums:
+            m_list, m_index = m_enums[name]
+            return m_list[m_index] if m_list else None
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in self._enums:
+            m_list, m_index = self._enums[name]
+            if isinstance(value, (list, tuple)):
+                self._enums[name] = [list(value), 0]
+            elif isinstance(value, int):
+                self._enums[name] = [m_list, value]
+            else:
+                self._enums[name] = [m_list, m_list.index(value)]
+        else:
+            self.__dict__[name] = value
+        if name in self._properties:
+            self.__dict__['touched'] = True
+            m_proxy = self.__dict__['Proxy']
+            if m_proxy is not None and hasattr(m_proxy, 'onChanged'):
+                m_proxy.onChanged(self, name)
+
+    @property
+    def PropertiesList(self):
+        return list(self._properties)
+
+    def addProperty(self, type_id, name, group="", doc=""):
+        self._properties[name] = (type_id, group, doc)
+        if type_id == "App::PropertyEnumeration":
+            self._enums[name] = [[], 0]
+        elif name not in self.__dict__:
+            self.__dict__[name] = None
+        return self
+
+    def removeProperty(self, name):
+        self._properties.pop(name, None)
+        self._enums.pop(name, None)
+        self.__dict__.pop(name, None)
+
+    def getPropertyByName(self, name):
+        return getattr(self, name)
+
+    def getTypeIdOfProperty(self, name):
+        return self._properties[name][0]
+
+    def getGroupOfProperty(self, name):
+        return self._properties[name][1]
+
+    def getEnumerationsOfProperty(self, name):
+        return list(self._enums[name][0])
+
+    def setEditorMode(self, name, mode):
+        self._modes[name] = mode
+
+    def getEditorMode(self, name):
+        return self._modes.get(name, 0)
+
+    def touch(self):
+        self.__dict__['touched'] = True
+
+    def purgeTouched(self):
+        self.__dict__['touched'] = False
+
+    def isValid(self):
+        return True
+
+    def recompute(self):
+        if self.Proxy is not None and hasattr(self.Proxy, 'execute'):
+            self.Proxy.execute(self)
+        self.__dict__['touched'] = False
+        return True
+
+    @property
+    def InList(self):
+        return [m_obj for m_obj in self.Document.Objects
+                if self in m_obj.OutList]
+
+    @property
+    def OutList(self):
+        m_list = []
+        for m_name in self._properties:
+            m_value = self.__dict__.get(m_name)
+            if isinstance(m_value, tuple) and m_value:
+                m_value = m_value[0]
+            if isinstance(m_value, list):
+                m_objs = m_value
+            else:
+                m_objs = [m_value]
+            for m_obj in m_objs:
+                if isinstance(m_obj, DocumentObject) and m_obj not in m_list:
+                    m_list.append(m_obj)
+        return m_list
+
+    # App::DocumentObjectGroup
+    def addObject(self, obj):
+        if obj not in self.Group:
+            self.Group = self.Group + [obj]
+        return [obj]
+
+    def newObject(self, type_id, name=None):
+        m_obj = self.Document.addObject(type_id, name)
+        self.addObject(m_obj)
+        return m_obj
+
+    def getObject(self, name):
+        for m_obj in self.Group:
+            if m_obj.Name == name:
+                return m_obj
+        return None
+
+    def hasObject(self, obj):
+        return obj in self.Group
+
+
+class Document():
+    """ App.Document
+    """
+
+    def __init__(self, name):
+        self.__dict__['Name'] = name
+        self.__dict__['Label'] = name
+        self.__dict__['FileName'] = ""
+        self.__dict__['UndoMode'] = 1
+        self.__dict__['_objects'] = []
+        self.__dict__['_transactions'] = []
+
+    def __repr__(self):
+        return "<Document object>"
+
+    def __getattr__(self, name):
+        m_obj = self.getObject(name)
+        if m_obj is None:
+            raise AttributeError(name)
+        return m_obj
+
+    @property
+    def Objects(self):
+        return list(self._objects)
+
+    def _uniqueName(self, name):
+        m_names = set(m_obj.Name for m_obj in self._objects)
+        if name not in m_names:
+            return name
+        for m_i in itertools.count(1):
+            m_name = "{0:s}{1:03d}".format(name, m_i)
+            if m_name not in m_names:
+                return m_name
+
+    def addObject(self, type_id, name=None):
+        if not name:
+            name = type_id.split("::")[-1]
+        m_obj = DocumentObject(self, type_id, self._uniqueName(str(name)))
+        if _MODULES and _MODULES["FreeCAD"].GuiUp:
+            m_obj.__dict__['ViewObject'] = ViewObject(m_obj)
+        self._objects.append(m_obj)
+        _notify('slotCreatedObject', m_obj)
+        return m_obj
+
+    def removeObject(self, name):
+        m_obj = self.getObject(name)
+        if m_obj is None:
+            return
+        _notify('slotDeletedObject', m_obj)
+        self._objects.remove(m_obj)
+        for m_grp in self._objects:
+            if m_grp.TypeId == "App::DocumentObjectGroup" and \
+                    m_obj in m_grp.Group:
+                m_grp.Group = [m_o for m_o in m_grp.Group if m_o is not m_obj]
+
+    def getObject(self, name):
+        for m_obj in self._objects:
+            if m_obj.Name == name:
+                return m_obj
+        return None
+
+    def getObjectsByLabel(self, label):
+        return [m_obj for m_obj in self._objects if m_obj.Label == label]
+
+    def recompute(self, objs=None):
+        """ Executes the touched features (or the given ones),
+        in document order.
+        """
+        if objs is None:
+            objs = [m_obj for m_obj in self._objects if m_obj.touched]
+        m_count = 0
+        for m_obj in objs:
+            m_obj.recompute()
+            m_count += 1
+        _notify('slotRecomputedDocument', self)
+        return m_count
+
+    def openTransaction(self, name=""):
+        self._transactions.append(name)
+
+    def commitTransaction(self):
+        if self._transactions:
+            self._transactions.pop()
+
+    def abortTransaction(self):
+        if self._transactions:
+            self._transactions.pop()
+
+    def undo(self):
+        _notify('slotUndoDocument', self)
+
+    def redo(self):
+        _notify('slotRedoDocument', self)
+
+
+_DOCUMENTS = {}
+_ACTIVE = [None]
+
+
+def newDocument(name="Unnamed", label=None):
+    m_name = name
+    for m_i in itertools.count(1):
+        if m_name not in _DOCUMENTS:
+            break
+        m_name = name + str(m_i)
+    m_doc = Document(m_name)
+    if label is not None:
+        m_doc.Label = label
+    _DOCUMENTS[m_name] = m_doc
+    _ACTIVE[0] = m_doc
+    _notify('slotCreatedDocument', m_doc)
+    return m_doc
+
+
+def closeDocument(name):
+    m_doc = _DOCUMENTS.pop(name)
+    _notify('slotDeletedDocument', m_doc)
+    if _ACTIVE[0] is m_doc:
+        _ACTIVE[0] = None
+
+
+def getDocument(name):
+    return _DOCUMENTS[name]
+
+
+def listDocuments():
+    return dict(_DOCUMENTS)
+
+
+def activeDocument():
+    return _ACTIVE[0]
+
+
+def setActiveDocument(name):
+    _ACTIVE[0] = _DOCUMENTS[name] if name else None
+
+
+def Version():
+    return list(M_VERSION)
+
+
+def _appGetattr(name):
+    # Module level attributes evaluated at each access
+    if name == "ActiveDocument":
+        return _ACTIVE[0]
+    raise AttributeError(name)
+
+
+# ---------------------------------------------------------------------------
+# Part
+# ---------------------------------------------------------------------------
+class BoundBox():
+    """ Base.BoundBox of a list of points.
+    """
+
+    def __init__(self, points=()):
+        m_points = list(points)
+        if not m_points:
+            m_points = [Vector()]
+        self.XMin = min(m_p.x for m_p in m_points)
+        self.YMin = min(m_p.y for m_p in m_points)
+        self.ZMin = min(m_p.z for m_p in m_points)
+        self.XMax = max(m_p.x for m_p in m_points)
+        self.YMax = max(m_p.y for m_p in m_points)
+        self.ZMax = max(m_p.z for m_p in m_points)
+
+    @property
+    def Center(self):
+        return Vector((self.XMin + self.XMax) / 2.0,
+                      (self.YMin + self.YMax) / 2.0,
+                      (self.ZMin + self.ZMax) / 2.0)
+
+    @property
+    def DiagonalLength(self):
+        return Vector(self.XMax - self.XMin,
+                      self.YMax - self.YMin,
+                      self.ZMax - self.ZMin).Length
+
+
+_HASHES = itertools.count(1)
+
+
+class Shape():
+    """ Part.Shape : a tree of subshapes.
+    """
+    ShapeType = "Shape"
+
+    def __init__(self, children=()):
+        self.children = list(children)
+        self.hash = next(_HASHES)
+
+    def __repr__(self):
+        return "<{0:s} object>".format(self.ShapeType)
+
+    def hashCode(self):
+        return self.hash
+
+    def isNull(self):
+        return not self.children and self.ShapeType == "Shape"
+
+    def isSame(self, other):
+        return self is other
+
+    def copy(self):
+        m_copy = self.__class__.__new__(self.__class__)
+        m_copy.__dict__.update(self.__dict__)
+        m_copy.hash = next(_HASHES)
+        return m_copy
+
+    def _collect(self, shape_type, result, seen):
+        if id(self) in seen:
+            return
+        seen.add(id(self))
+        if self.ShapeType == shape_type:
+            result.append(self)
+            return
+        for m_child in self.children:
+            m_child._collect(shape_type, result, seen)
+
+    def _subShapes(self, shape_type):
+        m_result = []
+        self._collect(shape_type, m_result, set())
+        return m_result
+
+    Vertexes = property(lambda self: self._subShapes("Vertex"))
+    Edges = property(lambda self: self._subShapes("Edge"))
+    Wires = property(lambda self: self._subShapes("Wire"))
+    Faces = property(lambda self: self._subShapes("Face"))
+    Shells = property(lambda self: self._subShapes("Shell"))
+    Solids = property(lambda self: self._subShapes("Solid"))
+
+    def getElement(self, name):
+        m_kind = name.rstrip('0123456789')
+        m_index = int(name[len(m_kind):])
+        m_attr = {'Vertex': 'Vertexes', 'Edge': 'Edges', 'Wire': 'Wires',
+                  'Face': 'Faces', 'Shell': 'Shells', 'Solid': 'Solids'}
+        return getattr(self, m_attr[m_kind])[m_index - 1]
+
+    @property
+    def BoundBox(self):
+        return BoundBox(m_v.Point for m_v in self.Vertexes)
+
+    @property
+    def CenterOfMass(self):
+        m_points = [m_v.Point for m_v in self.Vertexes]
+        m_center = Vector()
+        for m_point in m_points:
+            m_center = m_center.add(m_point)
+        return m_center.multiply(1.0 / max(len(m_points), 1))
+
+    @property
+    def Length(self):
+        return sum(m_edge.Length for m_edge in self.Edges)
+
+    @property
+    def Area(self):
+        return sum(m_face.Area for m_face in self.Faces)
+
+    def translate(self, vector):
+        for m_vertex in self.Vertexes:
+            m_vertex.Point = m_vertex.Point.add(vector)
+        self.hash = next(_HASHES)
+        return self
+
+    def distToShape(self, other):
+        """ Minimal distance between the vertexes of both shapes
+        (no exact edge/face distance in the stand-in).
+        """
+        m_best = None
+        for m_v1 in self.Vertexes:
+            for m_v2 in other.Vertexes:
+                m_dist = m_v1.Point.distanceToPoint(m_v2.Point)
+                if m_best is None or m_dist < m_best[0]:
+                    m_best = (m_dist, m_v1.Point, m_v2.Point)
+        if m_best is None:
+            return (0.0, [], [])
+        return (m_best[0], [(m_best[1], m_best[2])], [])
+
+
+class Vertex(Shape):
+    ShapeType = "Vertex"
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        Shape.__init__(self)
+        if isinstance(x, Point):
+            x = x.toVector()
+        self.Point = Vector(x, y, z)
+
+    X = property(lambda self: self.Point.x)
+    Y = property(lambda self: self.Point.y)
+    Z = property(lambda self: self.Point.z)
+
+    def isNull(self):
+        return False
+
+
+class Edge(Shape):
+    """ Straight edge.
+    """
+    ShapeType = "Edge"
+
+    def __init__(self, vertex1, vertex2=None):
+        if isinstance(vertex1, LineSegment):
+            vertex1, vertex2 = vertex1.vertexes()
+        Shape.__init__(self, [vertex1, vertex2])
+        self.Curve = LineSegment(vertex1.Point, vertex2.Point)
+
+    @property
+    def Length(self):
+        return self.children[0].Point.distanceToPoint(self.children[1].Point)
+
+    FirstParameter = property(lambda self: 0.0)
+    LastParameter = property(lambda self: self.Length)
+
+    def firstVertex(self):
+        return self.children[0]
+
+    def lastVertex(self):
+        return self.children[1]
+
+    def valueAt(self, param):
+        m_a = self.children[0].Point
+        m_b = self.children[1].Point
+        m_length = self.Length
+        if m_length == 0.0:
+            return Vector(m_a)
+        return m_a.add(m_b.sub(m_a).multiply(param / m_length))
+
+    def tangentAt(self, param):
+        return self.children[1].Point.sub(self.children[0].Point).normalize()
+
+    def discretize(self, Number=2):
+        m_length = self.Length
+        return [self.valueAt(m_length * m_i / (Number - 1))
+                for m_i in range(Number)]
+
+
+class Wire(Shape):
+    ShapeType = "Wire"
+
+    def __init__(self, edges):
+        Shape.__init__(self, edges)
+
+    def isClosed(self):
+        m_vertexes = self.Vertexes
+        return len(m_vertexes) > 2 and \
+            self.Edges[0].children[0] is self.Edges[-1].children[1]
+
+
+class Face(Shape):
+    """ Planar polygonal face.
+    """
+    ShapeType = "Face"
+
+    def __init__(self, wire):
+        Shape.__init__(self, [wire])
+
+    def _normal(self):
+        m_points = [m_v.Point for m_v in self.Vertexes]
+        m_normal = Vector()
+        for m_i, m_point in enumerate(m_points):
+            m_next = m_points[(m_i + 1) % len(m_points)]
+            m_normal = m_normal.add(m_point.cross(m_next))
+        return m_normal
+
+    @property
+    def Area(self):
+        return self._normal().Length / 2.0
+
+    def normalAt(self, u, v):
+        return self._normal().normalize()
+
+    @property
+    def Surface(self):
+        return Plane(self.Vertexes[0].Point, self.normalAt(0, 0))
+
+
+class Shell(Shape):
+    ShapeType = "Shell"
+
+
+class Solid(Shape):
+    ShapeType = "Solid"
+
+
+class Compound(Shape):
+    ShapeType = "Compound"
+
+
+class Point():
+    """ Part.Point geometry.
+    """
+
+    def __init__(self, vector=None):
+        self.X, self.Y, self.Z = Vector() if vector is None else vector
+
+    def toVector(self):
+        return Vector(self.X, self.Y, self.Z)
+
+    def toShape(self):
+        return Vertex(self.toVector())
+
+
+class LineSegment():
+    """ Part.LineSegment geometry.
+    """
+
+    def __init__(self, start=None, end=None):
+        self.StartPoint = Vector() if start is None else _toVector(start)
+        self.EndPoint = Vector(1, 0, 0) if end is None else _toVector(end)
+
+    def vertexes(self):
+        return Vertex(self.StartPoint), Vertex(self.EndPoint)
+
+    def toShape(self):
+        return Edge(self)
+
+
+class Plane():
+    """ Part.Plane geometry.
+    """
+
+    def __init__(self, position=None, axis=None):
+        self.Position = Vector() if position is None else _toVector(position)
+        self.Axis = Vector(0, 0, 1) if axis is None else _toVector(axis)
+
+
+def makeLine(start, end):
+    return Edge(Vertex(_toVector(start)), Vertex(_toVector(end)))
+
+
+def makePolygon(points):
+    m_vertexes = [Vertex(_toVector(m_p)) for m_p in points]
+    if len(m_vertexes) > 2 and \
+            m_vertexes[0].Point.isEqual(m_vertexes[-1].Point, 1e-12):
+        m_vertexes[-1] = m_vertexes[0]
+    return Wire([Edge(m_a, m_b)
+                 for m_a, m_b in zip(m_vertexes[:-1], m_vertexes[1:])])
+
+
+def makePlane(length, width, pnt=None, dir=None):
+    """ Rectangular face of length along X and width along Y
+    (of the plane normal to dir).
+    """
+    m_base = Vector() if pnt is None else _toVector(pnt)
+    m_normal = Vector(0, 0, 1) if dir is None else _toVector(dir).normalize()
+    if abs(m_normal.z) > 0.9:
+        m_u = Vector(1, 0, 0)
+    else:
+        m_u = Vector(0, 0, 1).cross(m_normal).normalize()
+    m_v = m_normal.cross(m_u)
+    m_u.multiply(length)
+    m_v.multiply(width)
+    return Face(makePolygon([m_base, m_base.add(m_u),
+                             m_base.add(m_u).add(m_v), m_base.add(m_v),
+                             m_base]))
+
+
+def makeCompound(shapes):
+    return Compound(shapes)
+
+
+def show(shape, name="Shape"):
+    m_obj = activeDocument().addObject("Part::Feature", name)
+    m_obj.Shape = shape
+    return m_obj
+
+
+# ---------------------------------------------------------------------------
+# FreeCADGui
+# ---------------------------------------------------------------------------
+class SelectionObject():
+    """ Gui.SelectionObject as returned by Gui.Selection.getSelectionEx
+    """
+
+    def __init__(self, obj):
+        self.Object = obj
+        self.ObjectName = obj.Name
+        self.DocumentName = obj.Document.Name
+        self.SubElementNames = ()
+
+    @property
+    def SubObjects(self):
+        return tuple(self.Object.Shape.getElement(m_name)
+                     for m_name in self.SubElementNames)
+
+    @property
+    def HasSubObjects(self):
+        return len(self.SubElementNames) != 0
+
+
+class _Selection():
+    """ Gui.Selection
+    """
+
+    def __init__(self):
+        self.items = []
+        self.observers = []
+
+    def _notify(self, slot, *args):
+        for m_observer in list(self.observers):
+            if hasattr(m_observer, slot):
+                getattr(m_observer, slot)(*args)
+
+    def addSelection(self, obj, sub_name=None):
+        m_item = None
+        for m_sel in self.items:
+            if m_sel.Object is obj:
+                m_item = m_sel
+        if m_item is None:
+            m_item = SelectionObject(obj)
+            self.items.append(m_item)
+        if sub_name:
+            if isinstance(sub_name, str):
+                sub_name = [sub_name]
+            for m_name in sub_name:
+                if m_name not in m_item.SubElementNames:
+                    m_item.SubElementNames += (m_name,)
+                    self._notify('addSelection', obj.Document.Name,
+                                 obj.Name, m_name, (0.0, 0.0, 0.0))
+        else:
+            self._notify('addSelection', obj.Document.Name,
+                         obj.Name, "", (0.0, 0.0, 0.0))
+
+    def removeSelection(self, obj, sub_name=None):
+        for m_sel in list(self.items):
+            if m_sel.Object is not obj:
+                continue
+            if sub_name:
+                m_sel.SubElementNames = tuple(
+                    m_name for m_name in m_sel.SubElementNames
+                    if m_name != sub_name)
+            if not sub_name or not m_sel.SubElementNames:
+                self.items.remove(m_sel)
+            self._notify('removeSelection', obj.Document.Name,
+                         obj.Name, sub_name or "")
+
+    def clearSelection(self, doc_name=None):
+        self.items = []
+        self._notify('clearSelection', doc_name or "")
+
+    def getSelection(self, doc_name=None):
+        return [m_sel.Object for m_sel in self.getSelectionEx(doc_name)]
+
+    def getSelectionEx(self, doc_name=None):
+        return [m_sel for m_sel in self.items
+                if doc_name is None or m_sel.DocumentName == doc_name]
+
+    def isSelected(self, obj, sub_name=None):
+        for m_sel in self.items:
+            if m_sel.Object is obj:
+                return not sub_name or sub_name in m_sel.SubElementNames
+        return False
+
+    def addObserver(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def removeObserver(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+
+Selection = _Selection()
+
+
+class ViewObject():
+    """ View provider : a plain bag of attributes.
+    """
+
+    def __init__(self, obj):
+        self.Object = obj
+        self.Visibility = True
+        self.Proxy = None
+
+    def addProperty(self, type_id, name, group="", doc=""):
+        setattr(self, name, None)
+        return self
+
+    def show(self):
+        self.Visibility = True
+
+    def hide(self):
+        self.Visibility = False
+
+
+class GuiDocument():
+    """ Gui.Document
+    """
+
+    def __init__(self, doc):
+        self.Document = doc
+
+    def getObject(self, name):
+        m_obj = self.Document.getObject(name)
+        if m_obj is None:
+            return None
+        if m_obj.ViewObject is None:
+            m_obj.__dict__['ViewObject'] = ViewObject(m_obj)
+        return m_obj.ViewObject
+
+
+_GUI_DOCUMENTS = {}
+_COMMANDS = {}
+
+
+def _guiDocument():
+    m_doc = activeDocument()
+    if m_doc is None:
+        return None
+    if m_doc.Name not in _GUI_DOCUMENTS:
+        _GUI_DOCUMENTS[m_doc.Name] = GuiDocument(m_doc)
+    return _GUI_DOCUMENTS[m_doc.Name]
+
+
+def addCommand(name, command):
+    _COMMANDS[name] = command
+
+
+def listCommands():
+    return list(_COMMANDS)
+
+
+def updateGui():
+    pass
+
+
+def _guiGetattr(name):
+    if name == "ActiveDocument":
+        return _guiDocument()
+    if name in ("Control", "PySideUic"):
+        return _stub(name)
+    raise AttributeError(name)
+
+
+# ---------------------------------------------------------------------------
+# PySide
+# ---------------------------------------------------------------------------
+class _StubType(type):
+    """ Metaclass of the Qt stand-in classes : any class attribute is
+    itself a stand-in class (i.e. QtGui.QMessageBox.Ok).
+    """
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _stub(name)
+
+
+class _Stub(metaclass=_StubType):
+    """ Qt stand-in : accepts any construction, call or attribute.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Stub()
+
+    def __call__(self, *args, **kwargs):
+        return _Stub()
+
+    def __bool__(self):
+        return False
+
+    def __or__(self, other):
+        return self
+
+    __ror__ = __or__
+
+
+def _stub(name):
+    return _StubType(str(name), (_Stub,), {})
+
+
+def _qtGetattr(name):
+    if name.startswith('__'):
+        raise AttributeError(name)
+    return _stub(name)
+
+
+# ---------------------------------------------------------------------------
+# Installation
+# ---------------------------------------------------------------------------
+def _module(name, names, getattr_function=None):
+    m_module = types.ModuleType(name, "WF stand-in of " + name)
+    m_globals = globals()
+    for m_name in names:
+        setattr(m_module, m_name, m_globals[m_name])
+    if getattr_function is not None:
+        m_module.__getattr__ = getattr_function
+    return m_module
+
+
+def _buildModules(gui):
+    m_app = _module("FreeCAD",
+                    ["Vector", "Placement", "ParamGet", "addDocumentObserver",
+                     "removeDocumentObserver", "newDocument", "closeDocument",
+                     "getDocument", "listDocuments", "activeDocument",
+                     "setActiveDocument", "Version", "Document",
+                     "DocumentObject"],
+                    _appGetattr)
+    m_app.Console = _Console()
+    m_app.GuiUp = 1 if gui else 0
+    m_app.Base = _module("FreeCAD.Base", ["Vector", "Placement", "BoundBox"])
+
+    m_part = _module("Part",
+                     ["Shape", "Vertex", "Edge", "Wire", "Face", "Shell",
+                      "Solid", "Compound", "Point", "LineSegment", "Plane",
+                      "makeLine", "makePolygon", "makePlane", "makeCompound",
+                      "show"])
+    m_part.Line = LineSegment
+
+    m_gui = _module("FreeCADGui",
+                    ["Selection", "SelectionObject", "addCommand",
+                     "listCommands", "updateGui"],
+                    _guiGetattr)
+    m_gui.activeDocument = _guiDocument
+
+    m_qtcore = _module("PySide.QtCore", [], _qtGetattr)
+    m_qtgui = _module("PySide.QtGui", [], _qtGetattr)
+    m_pyside = _module("PySide", [])
+    m_pyside.QtCore = m_qtcore
+    m_pyside.QtGui = m_qtgui
+
+    return {"FreeCAD": m_app,
+            "Part": m_part,
+            "FreeCADGui": m_gui,
+            "PySide": m_pyside,
+            "PySide.QtCore": m_qtcore,
+            "PySide.QtGui": m_qtgui}
+
+
+def _isImportable(name):
+    if name in sys.modules:
+        return True
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def install(force=False, gui=False):
+    """ Registers the stand-in modules FreeCAD, Part, FreeCADGui and
+    PySide into sys.modules.
+
+    *force* : if False (default) only the modules which can not be
+              imported are replaced.
+    *gui*   : value of App.GuiUp (if True, WF modules will use
+              Gui.Selection and view providers of the stand-in).
+
+    Returns the list of names of the installed stand-in modules.
+    """
+    if not _MODULES:
+        _MODULES.update(_buildModules(gui))
+    _MODULES["FreeCAD"].GuiUp = 1 if gui else 0
+    m_installed = []
+    for m_root in ["FreeCAD", "Part", "FreeCADGui", "PySide"]:
+        if not force and _isImportable(m_root) and \
+                sys.modules.get(m_root) is not _MODULES[m_root]:
+            continue
+        for m_name in _MODULES:
+            if m_name == m_root or m_name.startswith(m_root + "."):
+                sys.modules[m_name] = _MODULES[m_name]
+                m_installed.append(m_name)
+    return m_installed
+
+
+def uninstall():
+    """ Removes the stand-in modules from sys.modules.
+    """
+    for m_name, m_module in _MODULES.items():
+        if sys.modules.get(m_name) is m_module:
+            del sys.modules[m_name]
+
+
+def reset():
+    """ Closes all documents, empties the selection and the parameters.
+    Document observers stay registered.
+    """
+    for m_name in list(_DOCUMENTS):
+        closeDocument(m_name)
+    _GUI_DOCUMENTS.clear()
+    Selection.items = []
+    for m_group in _PARAMS.values():
+        m_group.values.clear()
+
+
+def select(obj, sub_names=()):
+    """ Adds an object (and its subelements) to Gui.Selection.
+    """
+    if not sub_names:
+        Selection.addSelection(obj)
+    for m_name in sub_names:
+        Selection.addSelection(obj, m_name)
+
+
+def makeDocument(name="StandIn", edges=3, vertexes=3, faces=1):
+    """ Creates a document with "Edges", "Vertexes" and "Faces"
+    compounds (of the given number of subshapes) to select from.
+    """
+    m_doc = newDocument(name)
+    if edges:
+        m_obj = m_doc.addObject("Part::Feature", "Edges")
+        m_obj.Shape = makeCompound(
+            [makeLine(Vector(m_i, 0, 0), Vector(m_i, 10, m_i % 7))
+             for m_i in range(edges)])
+    if vertexes:
+        m_obj = m_doc.addObject("Part::Feature", "Vertexes")
+        m_obj.Shape = makeCompound(
+            [Vertex(Vector(10 * math.cos(0.1 * m_i),
+                           10 * math.sin(0.1 * m_i), 0.05 * m_i))
+             for m_i in range(vertexes)])
+    if faces:
+        m_obj = m_doc.addObject("Part::Feature", "Faces")
+        m_obj.Shape = makeCompound(
+            [makePlane(1.0, 1.0, Vector(2.0 * m_i, 0, 0))
+             for m_i in range(faces)])
+    return m_doc
@@ -59,7 +59,9 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
 
 def getParamType(param):
     if param in ["verbose",
-                 "closePolyline", ]:
+                 "closePolyline",
+                 "selectionObserver",
+                 "dedupePoints", ]:
         return "bool"
     elif param in ["release", ]:
         return "string"
@@ -121,18 +123,76 @@ def setParam(param, value):
         p.SetBool(param, value)
     elif t == "unsigned":
         p.SetUnsigned(param, value)
+    if _SETTINGS is not None:
+        _SETTINGS.load()
+
+
+class Settings():
+    """ Snapshot of all WorkFeature user settings.
+
+    The parameters are read (and parsed) once, then reloaded each time
+    the WF preferences change (ParamGet observer).
+    """
+
+    def __init__(self):
+        self.verbose = False
+        self.timeout = 15
+        self.release = None
+        self.parametric = 0
+        self.pointSize = 5.0
+        self.lineThickness = 5.0
+        self.linePointSize = 5.0
+        self.closePolyline = False
+        self.tolerance = 1e-12
+        self.selectionObserver = True
+        self.dedupePoints = False
+        self.load()
+
+    def load(self):
+        """ Reads all WF parameters.
+        """
+        self.verbose = getParam("verbose", False)
+        self.timeout = int(getParam("timeout", "15"))
+        self.release = getParam("release", None)
+        self.parametric = getParam("parametric", None)
+        self.pointSize = float(getParam("pointSize", "5.0"))
+        self.lineThickness = float(getParam("lineThickness", "5.0"))
+        self.linePointSize = float(getParam("linePointSize", "5.0"))
+        self.closePolyline = getParam("closePolyline", False)
+        self.tolerance = float(getParam("tolerance", "1e-12"))
+        self.selectionObserver = getParam("selectionObserver", True)
+        self.dedupePoints = getParam("dedupePoints", False)
+
+    # ParamGet observer method
+    def onChange(self, param_grp, param):
+        self.load()
+
+
+_SETTINGS = None
+
+
+def settings():
+    """ Returns the snapshot of WF user settings.
+    """
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = Settings()
+        p = FreeCAD.ParamGet("User parameter:BaseApp/Preferences/Mod/WF")
+        if hasattr(p, "Attach"):
+            p.Attach(_SETTINGS)
+    return _SETTINGS
 
 
 def verbose():
     """ Returns the verbose value from WF user settings
     """
-    return getParam("verbose", False)
+    return settings().verbose
 
 
 def timeout():
     """ Returns the timeout from WF user settings
     """
-    return int(getParam("timeout", "15"))
+    return settings().timeout
 
 
 def set_timeout(value):
@@ -144,7 +204,7 @@ def set_timeout(value):
 def release():
     """ Returns the release value from WF user settings
     """
-    return getParam("release", None)
+    return settings().release
 
 
 def set_release(value):
@@ -158,7 +218,7 @@ def parametric():
 
     m_parametric = ['Not','Interactive','Dynamic']
     """
-    return getParam("parametric", None)
+    return settings().parametric
 
 
 def set_parametric(value):
@@ -170,7 +230,7 @@ def set_parametric(value):
 def pointSize():
     """ Returns the point size from WF user settings
     """
-    return float(getParam("pointSize", "5.0"))
+    return settings().pointSize
 
 
 def set_pointSize(value):
@@ -182,7 +242,7 @@ def set_pointSize(value):
 def lineThickness():
     """ Returns the line thickness from WF user settings
     """
-    return float(getParam("lineThickness", "5.0"))
+    return settings().lineThickness
 
 
 def set_lineThickness(value):
@@ -194,7 +254,7 @@ def set_lineThickness(value):
 def linePointSize():
     """ Returns the line point size from WF user settings
     """
-    return float(getParam("linePointSize", "5.0"))
+    return settings().linePointSize
 
 
 def set_linelinePointSize(value):
@@ -206,13 +266,13 @@ def set_linelinePointSize(value):
 def closePolyline():
     """ Returns the close polyline value from WF user settings
     """
-    return getParam("closePolyline", False)
+    return settings().closePolyline
 
 
 def tolerance():
     """ Returns the tolerance from WF user settings
     """
-    return float(getParam("tolerance", "1e-12"))
+    return settings().tolerance
 
 
 def set_tolerance(value):
@@ -221,6 +281,33 @@ def set_tolerance(value):
     setParam("tolerance", value)
 
 
+def selectionObserver():
+    """ Returns True if the selection is classified as the user selects
+    (see WF_selection.startObserver) from WF user settings
+    """
+    return settings().selectionObserver
+
+
+def set_selectionObserver(value):
+    """ Sets the selection observer flag to WF user settings
+    """
+    setParam("selectionObserver", value)
+
+
+def dedupePoints():
+    """ Returns True if the coincident Points found into the selected
+    Edges and Faces are only used once
+    (see WF_selection.Selection.get_pointsWithNames) from WF user settings
+    """
+    return settings().dedupePoints
+
+
+def set_dedupePoints(value):
+    """ Sets the Points deduplication flag to WF user settings
+    """
+    setParam("dedupePoints", value)
+
+
 def typecheck(args_and_types, name="?"):
     """ Checks arguments types.
 
@@ -235,11 +322,9 @@ def typecheck(args_and_types, name="?"):
 
 
 def touch(selfobj):
-    if str(selfobj.Parametric) == 'Interactive':
-        selfobj.Parametric = 'Dynamic'
-        selfobj.touch()
-        selfobj.Parametric = 'Interactive'
-    if str(selfobj.Parametric) == 'Not':
-        selfobj.Parametric = 'Dynamic'
-        selfobj.touch()
-        selfobj.Parametric = 'Not'
+    """ Recomputes once an Interactive or Not parametric WF object.
+
+    Dynamic objects are updated by the document recompute.
+    """
+    if str(selfobj.Parametric) in ['Interactive', 'Not']:
+        selfobj.Proxy.recompute(selfobj)
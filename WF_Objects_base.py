@@ -31,8 +31,10 @@
 """
 import os
 import sys
+from collections import OrderedDict
 import FreeCAD as App
 import WF
+from WF_geometry import propertiesPoint, propertiesLine, propertiesPlane
 
 __title__ = "Object WF_Objects_Base"
 __author__ = "Rentlau_64"
@@ -43,16 +45,225 @@ __brief__ = '''
 ###############
 M_DEBUG = False
 ###############
+# Maximum number of results kept into the execute result cache
+M_CACHE_SIZE = 256
 
 WF_ParametricList = ['Not', 'Interactive', 'Dynamic']
 WF_PLIST = WF_ParametricList
 WF_ColorList = [(0.45, 0.30, 0.00), (0.70, 0.47, 0.00), (1.00, 0.67, 0.00)]
 WF_CLIST = WF_ColorList
+WF_LinkTypes = ['App::PropertyLinkSub',
+                'App::PropertyLinkSubGlobal',
+                'App::PropertyLinkSubList']
+
+
+def shapeFingerprint(shape):
+    """ Returns a cheap fingerprint of a shape.
+    The fingerprint changes each time the shape geometry
+    or placement changes.
+    """
+    if shape is None or shape.isNull():
+        return None
+    m_box = shape.BoundBox
+    return (shape.ShapeType, shape.hashCode(),
+            m_box.XMin, m_box.YMin, m_box.ZMin,
+            m_box.XMax, m_box.YMax, m_box.ZMax)
+
+
+def getParents(selfobj):
+    """ Returns the list of parent objects of a WF feature,
+    from its PropertyLinkSub, PropertyLinkSubGlobal and
+    PropertyLinkSubList inputs.
+    """
+    m_parents = []
+    for m_prop in selfobj.PropertiesList:
+        m_type = selfobj.getTypeIdOfProperty(m_prop)
+        if m_type not in WF_LinkTypes:
+            continue
+        m_value = selfobj.getPropertyByName(m_prop)
+        if not m_value:
+            continue
+        if m_type == 'App::PropertyLinkSubList':
+            m_objs = [m_link[0] for m_link in m_value]
+        else:
+            m_objs = [m_value[0]]
+        for m_obj in m_objs:
+            if m_obj is not None and m_obj not in m_parents:
+                m_parents.append(m_obj)
+    return m_parents
+
+
+def _linkState(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_linkState(m_v) for m_v in value)
+    if hasattr(value, 'Name'):
+        return value.Name
+    return value
+
+
+def inputsFingerprint(selfobj):
+    """ Returns the fingerprint of all inputs of a WF feature:
+    its own input properties (outputs excluded) and the
+    fingerprints of its parent shapes.
+    """
+    m_outputs = []
+    if hasattr(selfobj, 'Proxy'):
+        m_outputs = getattr(selfobj.Proxy, 'outputProperties', [])
+    m_state = []
+    for m_prop in selfobj.PropertiesList:
+        # Base properties (Label, Placement, Shape...) are not inputs
+        if selfobj.getGroupOfProperty(m_prop) == 'Base':
+            continue
+        if m_prop in m_outputs:
+            continue
+        m_value = selfobj.getPropertyByName(m_prop)
+        if selfobj.getTypeIdOfProperty(m_prop) in WF_LinkTypes:
+            m_value = _linkState(m_value)
+        elif not isinstance(m_value, (bool, int, float, str)):
+            m_value = str(m_value)
+        m_state.append((m_prop, m_value))
+    for m_parent in getParents(selfobj):
+        m_shape = getattr(m_parent, 'Shape', None)
+        m_state.append((m_parent.Name, shapeFingerprint(m_shape)))
+    return tuple(m_state)
+
+
+def _parentShapes(selfobj):
+    """ Returns the list of (parent name, parent shape) of a WF feature.
+    """
+    return [(m_parent.Name, getattr(m_parent, 'Shape', None))
+            for m_parent in getParents(selfobj)]
+
+
+def _sameParents(selfobj, parents):
+    """ Returns True if the parent shapes of a WF feature are the same
+    (isSame) as the given (parent name, parent shape) list.
+    """
+    m_current = _parentShapes(selfobj)
+    if len(m_current) != len(parents):
+        return False
+    for (m_name, m_shape), (m_old_name, m_old_shape) in zip(m_current,
+                                                            parents):
+        if m_name != m_old_name:
+            return False
+        if m_shape is None or m_old_shape is None:
+            if m_shape is not m_old_shape:
+                return False
+        elif not m_shape.isSame(m_old_shape):
+            return False
+    return True
+
+
+def setCacheSize(value):
+    """ Sets the maximum number of results kept into the execute
+    result cache (0 disables the cache).
+    """
+    global M_CACHE_SIZE
+    M_CACHE_SIZE = max(int(value), 0)
+    while len(_RESULT_CACHE) > M_CACHE_SIZE:
+        _RESULT_CACHE.popitem(last=False)
+
+
+def getCacheSize():
+    """ Returns the maximum number of results kept into the execute
+    result cache.
+    """
+    return M_CACHE_SIZE
+
+
+def clearCache():
+    """ Empties the execute result cache.
+    """
+    _RESULT_CACHE.clear()
+
+
+# (document name, class name, inputs fingerprint) ->
+#     (shape, outputs, parent shapes)
+# The parent shapes are kept so their hashCode can not be reused by a new
+# shape while the result is alive.
+# Least recently used results are dropped first.
+_RESULT_CACHE = OrderedDict()
+
+
+class _CacheObserver():
+    """ Document observer emptying the execute result cache
+    when the document history is replayed.
+    """
+
+    def slotUndoDocument(self, doc):
+        clearCache()
+
+    def slotRedoDocument(self, doc):
+        clearCache()
+
+    def slotDeletedDocument(self, doc):
+        clearCache()
+
+
+if hasattr(App, "addDocumentObserver"):
+    _CACHE_OBSERVER = _CacheObserver()
+    App.addDocumentObserver(_CACHE_OBSERVER)
+
+
+# Number of active suspensions of the features execute (see WF_bulk)
+_SUSPENDED = 0
+
+
+def suspendExecute():
+    """ Suspends the execute of all WF features
+    (i.e. while creating many features at once).
+    """
+    global _SUSPENDED
+    _SUSPENDED += 1
+
+
+def resumeExecute():
+    """ Resumes the execute of WF features.
+    """
+    global _SUSPENDED
+    _SUSPENDED = max(_SUSPENDED - 1, 0)
+
+
+def isExecuteSuspended():
+    """ Returns True if the execute of WF features is suspended.
+    """
+    return _SUSPENDED > 0
+
+
+# (document name, object name) -> [depth, execute requested]
+_BATCH_EDITS = {}
+
+
+class _BatchEdit():
+    """ Context of a batch edit of one WF feature (see WF_Object.batchEdit).
+    """
+
+    def __init__(self, proxy, selfobj):
+        self.proxy = proxy
+        self.selfobj = selfobj
+        self.key = (selfobj.Document.Name, selfobj.Name)
+
+    def __enter__(self):
+        _BATCH_EDITS.setdefault(self.key, [0, False])[0] += 1
+        return self.selfobj
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m_entry = _BATCH_EDITS[self.key]
+        m_entry[0] -= 1
+        if m_entry[0] > 0:
+            return False
+        del _BATCH_EDITS[self.key]
+        if m_entry[1] and exc_type is None:
+            self.proxy.execute(self.selfobj)
+        return False
 
 
 class WF_Object():
     """ Abstract class of Work Feature Object.
     """
+    # names of the properties computed by execute
+    outputProperties = []
+
     def __init__(self, selfobj):
         # if M_DEBUG:
         #     print("running WF_Object.__init__ !")
@@ -105,6 +316,102 @@ regarding parent changes.
         #     print("running WF_Object.execute !")
         pass
 
+    def recompute(self, selfobj):
+        """ Forces one execute of the feature regardless of its parametric
+        behavior (the Parametric property is left untouched).
+        """
+        m_created = self.created
+        self.created = False
+        try:
+            self.execute(selfobj)
+        finally:
+            if not self.created:
+                self.created = m_created
+
+    def batchEdit(self, selfobj):
+        """ Returns a context in which the executes requested by property
+        changes of the feature are deferred; one single execute is run
+        at the end if any was requested.
+
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Edge = edge
+            selfobj.Distance = distance
+        """
+        return _BatchEdit(self, selfobj)
+
+    def requestExecute(self, selfobj):
+        """ Executes the feature, or defers the execute to the end
+        of the current batch edit of the feature.
+        """
+        m_entry = _BATCH_EDITS.get((selfobj.Document.Name, selfobj.Name))
+        if m_entry is not None:
+            m_entry[1] = True
+            return
+        self.execute(selfobj)
+
+    def cacheKey(self, selfobj):
+        """ Returns the key of the feature into the execute result cache.
+        """
+        return (selfobj.Document.Name,
+                self.__class__.__name__,
+                inputsFingerprint(selfobj))
+
+    def restoreResult(self, selfobj):
+        """ Restores the Shape and the output properties of the feature
+        from the execute result cache.
+
+        Returns True if a previous result was found for the same inputs
+        (own properties and parent shapes), False otherwise.
+        """
+        if M_CACHE_SIZE == 0 or 'Parametric' not in selfobj.PropertiesList:
+            return False
+        try:
+            m_key = self.cacheKey(selfobj)
+        except Exception:
+            return False
+        if m_key not in _RESULT_CACHE:
+            return False
+        m_shape, m_outputs, m_parents = _RESULT_CACHE[m_key]
+        # The fingerprints of the parent shapes may match a rebuilt
+        # shape; the result is only valid for the very same shapes
+        if not _sameParents(selfobj, m_parents):
+            del _RESULT_CACHE[m_key]
+            return False
+        _RESULT_CACHE.move_to_end(m_key)
+        selfobj.Shape = m_shape.copy()
+        for m_prop, m_value in m_outputs:
+            setattr(selfobj, m_prop, m_value)
+        self.viewProperties(selfobj)
+        self.created = True
+        if M_DEBUG:
+            print("WF_Object.restoreResult : " + str(selfobj.Name))
+        return True
+
+    def viewProperties(self, selfobj):
+        """ Applies the view properties (color, size...) of the feature,
+        as done at the end of execute.
+        """
+        pass
+
+    def storeResult(self, selfobj):
+        """ Stores the Shape and the output properties computed by
+        execute into the execute result cache.
+        """
+        if M_CACHE_SIZE == 0:
+            return
+        try:
+            m_key = self.cacheKey(selfobj)
+        except Exception:
+            return
+        m_outputs = [(m_prop, selfobj.getPropertyByName(m_prop))
+                     for m_prop in self.outputProperties
+                     if m_prop in selfobj.PropertiesList]
+        _RESULT_CACHE[m_key] = (selfobj.Shape.copy(), m_outputs,
+                                _parentShapes(selfobj))
+        _RESULT_CACHE.move_to_end(m_key)
+        while len(_RESULT_CACHE) > M_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
     def onChanged(self, selfobj, prop):
         # if M_DEBUG:
         #     print("running WF_Object.onChanged !")
@@ -116,7 +423,7 @@ regarding parent changes.
         # App.Console.PrintMessage(str(sys._getframe().f_code.co_name))
         if prop == "Parametric":
             self.color = WF_CLIST[WF_PLIST.index(selfobj.Parametric)]
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
             if WF.verbose() != 0:
                 m_msg = "New parametric : " + str(selfobj.Parametric) + "\n"
                 App.Console.PrintMessage(m_msg)
@@ -126,6 +433,7 @@ regarding parent changes.
 
 class WF_Point(WF_Object):
     """ The Point WF object. """
+    outputProperties = ["X", "Y", "Z"]
 
     def __init__(self, selfobj, name):
         """ Add some custom properties to our Point WF object."""
@@ -165,9 +473,14 @@ class WF_Point(WF_Object):
         #     print("running WF_Point.onChanged !")
         WF_Object.onChanged(self, selfobj, prop)
 
+    def viewProperties(self, selfobj):
+        propertiesPoint(selfobj.Label, self.color)
+
 
 class WF_Line(WF_Object):
     """ The Line WF object. """
+    outputProperties = ["Point1_X", "Point1_Y", "Point1_Z",
+                        "Point2_X", "Point2_Y", "Point2_Z"]
     # this method is mandatory
     def __init__(self, selfobj, name):
         # if M_DEBUG:
@@ -220,9 +533,15 @@ class WF_Line(WF_Object):
         #     print("running WF_Line.onChanged !")
         WF_Object.onChanged(self, selfobj, prop)
 
+    def viewProperties(self, selfobj):
+        propertiesLine(selfobj.Label, self.color)
+
 
 class WF_Plane(WF_Object):
     """ The Plane WF object. """
+    outputProperties = ["Point1_X", "Point1_Y", "Point1_Z",
+                        "Point2_X", "Point2_Y", "Point2_Z",
+                        "Point3_X", "Point3_Y", "Point3_Z"]
     # this method is mandatory
     def __init__(self, selfobj, name):
         # if M_DEBUG:
@@ -289,3 +608,5 @@ class WF_Plane(WF_Object):
         #     print("running WF_Plane.onChanged !")
         WF_Object.onChanged(self, selfobj, prop)
 
+    def viewProperties(self, selfobj):
+        propertiesPlane(selfobj.Label, self.color)
@@ -20,6 +20,12 @@ Negative values will revert the direction.
 A null distance gives you the projection of point(s) onto the first
 selected Line.
 
+The closest point between two straight Edges is solved in closed form
+(all Edges at once for a PointArray); OCC (distToShape) is only used
+for curved Edges.
+Along a curved Line/Edge the Distance is measured along the curve
+(arc length, see Utils/WF_arcLength.py).
+
 How to
 The First selected Line/Edge(s) is  where to attach new Points.
 and Second define one or several Reference Point(s).
@@ -33,13 +39,14 @@ Points
 
 import sys
 import os.path
-import re
+import numpy as np
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
+from WF_pointArray import makePointArrayFeature
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -58,12 +65,19 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import isEqualVectors, intersectPerpendicularLine, propertiesPoint
+    from WF_geometry import isStraightEdge, edgeClosestPoint, curvePoint
+    from WF_arcLength import getArcLengthTable
+    from WF_links import getLinkSubShape, getLinkPoint
+    from WF_links import getLinkListSubShapes, getLinkListPoints
+    from WF_batch import toArray, intersectPerpendicularLineBatch
+    from WF_batch import closestPointsSegmentsBatch
     from WF_utils import *
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: cannot load WF modules !")
     sys.exit(1)
@@ -116,6 +130,7 @@ Selection of : Several Edges and Points with same number of Edges and Points<br>
 ###############
 M_MACRO = "Macro AlongLinePoint"
 M_DISTANCELINEPOINT = 10.0
+M_OUTPUT_ARRAY = False
 ###############
 
 
@@ -146,6 +161,29 @@ def getDistanceLinePoint():
     return M_DISTANCELINEPOINT
 
 
+def setOutputArray(output_array):
+    """ Set the output of the command when several points are created.
+
+    Parameters
+    -------
+    *output_array* : (Boolean, Mandatory)
+            if True one single PointArray feature holds all points,
+            if False one AlongLinePoint feature is created per point.
+    """
+    global M_OUTPUT_ARRAY
+    M_OUTPUT_ARRAY = bool(output_array)
+
+
+def isOutputArray():
+    """ Get the output of the command when several points are created.
+
+    Return
+    -------
+    True if one single PointArray feature is created.
+    """
+    return M_OUTPUT_ARRAY
+
+
 class AlongLinePointPanel:
     """ The AlongLinePointPanel (GUI).
     """
@@ -169,8 +207,9 @@ class AlongLinePointPanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                along_line_point_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    along_line_point_command()
         return True
 
     def reject(self):
@@ -182,8 +221,7 @@ class AlongLinePointPanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
 
 
 def makeAlongLinePointFeature(group):
@@ -201,7 +239,8 @@ def makeAlongLinePointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         AlongLinePoint(m_obj)
-        ViewProviderAlongLinePoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderAlongLinePoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -281,74 +320,71 @@ onto the first selected Line."""
         if selfobj.Edge is None and selfobj.Point is None:
             return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             vector_point = None
             m_distance = selfobj.Distance
 
-            # m_n1 = eval(selfobj.AlongEdge[1][0].lstrip('Edge'))
-            m_n1 = re.sub('[^0-9]', '', selfobj.AlongEdge[1][0])
-            m_n1 = int(m_n1)
-
-            if selfobj.Edge is not None:
-                # m_n2 = eval(selfobj.Edge[1][0].lstrip('Edge'))
-                m_n2 = re.sub('[^0-9]', '', selfobj.Edge[1][0])
-                m_n2 = int(m_n2)
-            else:
-                if selfobj.Point != selfobj.AlongEdge:
-                    # m_n3 = eval(selfobj.Point[1][0].lstrip('Vertex'))
-                    m_n3 = re.sub('[^0-9]', '', selfobj.Point[1][0])
-                else:
-                    # m_n3 = eval(selfobj.Point[1][0].lstrip('Edge'))
-                    m_n3 = re.sub('[^0-9]', '', selfobj.Point[1][0])
-                m_n3 = int(m_n3)
-
             if M_DEBUG:
-                print_msg("m_n1 = " + str(m_n1))
+                print_msg(str(selfobj.AlongEdge))
                 if selfobj.Edge is not None:
-                    print_msg("m_n2 = " + str(m_n2))
+                    print_msg(str(selfobj.Edge))
                 else:
-                    print_msg("m_n3 = " + str(m_n3))
+                    print_msg(str(selfobj.Point))
                 print_msg("m_distance = " + str(m_distance))
 
-            m_alongedge = selfobj.AlongEdge[0].Shape.Edges[m_n1 - 1]
+            m_alongedge = getLinkSubShape(selfobj.AlongEdge, 'Edge')
             if selfobj.Edge is not None:
-                m_edge = selfobj.Edge[0].Shape.Edges[m_n2 - 1]
+                m_edge = getLinkSubShape(selfobj.Edge, 'Edge')
             else:
-                m_point = selfobj.Point[0].Shape.Vertexes[m_n3 - 1].Point
-
-            vector_a = m_alongedge.valueAt(0.0)
-            vector_b = m_alongedge.valueAt(m_alongedge.Length)
-
-            if isEqualVectors(vector_a, vector_b):
-                return
+                m_point = getLinkPoint(selfobj.Point)
 
             if selfobj.Edge is not None:
-                m_dist = m_alongedge.distToShape(m_edge)
-                vector_c = m_dist[1][0][0]
+                # Closed form for 2 straight Edges, OCC otherwise
+                vector_c = edgeClosestPoint(m_alongedge, m_edge)
             else:
                 vector_c = m_point
 
-            # Calculate intersection Point
-            vector_t, _, _ = intersectPerpendicularLine(vector_a,
-                                                        vector_b,
-                                                        vector_c,)
-            if M_DEBUG:
-                print_msg("m_alongedge = " + str(m_alongedge))
-                if selfobj.Edge is not None:
-                    print_msg("m_edge = " + str(m_edge))
-                else:
-                    print_msg("m_point = " + str(m_point))
-                print_msg("vector_a = " + str(vector_a))
-                print_msg("vector_b = " + str(vector_b))
-                print_msg("vector_c = " + str(vector_c))
-                print_msg("vector_t = " + str(vector_t))
-
-            vector_translate = (vector_b - vector_a)
-            if m_distance != 0.0:
-                vector_translate = vector_translate.normalize() * m_distance
-                vector_point = vector_t + vector_translate
+            if not isStraightEdge(m_alongedge):
+                # Along the curve : the reference is the projection of
+                # vector_c onto the curve (arc length table of the Edge)
+                m_table = getArcLengthTable(m_alongedge)
+                vector_point = curvePoint(m_alongedge,
+                                          m_table.distanceOf(vector_c) +
+                                          m_distance)
             else:
-                vector_point = vector_t
+                vector_a = m_alongedge.valueAt(0.0)
+                vector_b = m_alongedge.valueAt(m_alongedge.Length)
+
+                if isEqualVectors(vector_a, vector_b):
+                    return
+
+                # Calculate intersection Point
+                vector_t, _, _ = intersectPerpendicularLine(vector_a,
+                                                            vector_b,
+                                                            vector_c,)
+                if M_DEBUG:
+                    print_msg("m_alongedge = " + str(m_alongedge))
+                    if selfobj.Edge is not None:
+                        print_msg("m_edge = " + str(m_edge))
+                    else:
+                        print_msg("m_point = " + str(m_point))
+                    print_msg("vector_a = " + str(vector_a))
+                    print_msg("vector_b = " + str(vector_b))
+                    print_msg("vector_c = " + str(vector_c))
+                    print_msg("vector_t = " + str(vector_t))
+
+                vector_translate = (vector_b - vector_a)
+                if m_distance != 0.0:
+                    vector_translate = vector_translate.normalize() * m_distance
+                    vector_point = vector_t + vector_translate
+                else:
+                    vector_point = vector_t
 
             if vector_point is not None:
                 point = Part.Point(vector_point)
@@ -360,6 +396,7 @@ onto the first selected Line."""
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -383,7 +420,7 @@ onto the first selected Line."""
             propertiesPoint(selfobj.Label, self.color)
 
         if prop == "Distance":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
 
 class ViewProviderAlongLinePoint:
@@ -468,13 +505,14 @@ def buildFromEdgeAndPoint(macro, group, edge, point, distance):
         print_msg("edge = " + str(edge))
         print_msg("point = " + str(point))
 
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeAlongLinePointFeature(group)
-    selfobj.AlongEdge = edge
-    selfobj.Point = point
-    selfobj.Edge = None
-    selfobj.Distance = distance
-    selfobj.Proxy.execute(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeAlongLinePointFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.AlongEdge = edge
+            selfobj.Point = point
+            selfobj.Edge = None
+            selfobj.Distance = distance
+        m_bulk.add(selfobj)
 
 
 def buildFromEdges(macro, group, edge, other_edge, distance):
@@ -485,104 +523,203 @@ def buildFromEdges(macro, group, edge, other_edge, distance):
         print_msg("edge = " + str(edge))
         print_msg("other_edge = " + str(other_edge))
 
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeAlongLinePointFeature(group)
-    selfobj.AlongEdge = edge
-    selfobj.Point = None
-    selfobj.Edge = other_edge
-    selfobj.Distance = distance
-    selfobj.Proxy.execute(selfobj)
-
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeAlongLinePointFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.AlongEdge = edge
+            selfobj.Point = None
+            selfobj.Edge = other_edge
+            selfobj.Distance = distance
+        m_bulk.add(selfobj)
 
 
+def alongLinePointArray(selfobj):
+    """ PointArray generator : returns the points along AlongEdge at
+    Distance of the projection of each input Point (or of the closest
+    point of each input Edge) onto AlongEdge, as a (N,3) array.
+    """
+    m_alongedge = getLinkSubShape(selfobj.AlongEdge, 'Edge')
+    m_straight_along = isStraightEdge(m_alongedge)
+    vector_a = m_alongedge.valueAt(0.0)
+    vector_b = m_alongedge.valueAt(m_alongedge.Length)
+    if m_straight_along and isEqualVectors(vector_a, vector_b):
+        return np.empty((0, 3))
+
+    if selfobj.Edges:
+        m_edges = getLinkListSubShapes(selfobj.Edges, 'Edge')
+        vectors_c = np.empty((len(m_edges), 3))
+        # Closest points with all straight Edges at once (closed form)
+        m_straight = np.zeros(len(m_edges), dtype=bool)
+        if m_straight_along:
+            m_straight[:] = [isStraightEdge(m_edge) for m_edge in m_edges]
+        if m_straight.any():
+            m_lines = [m_edge for m_edge, m_flag in zip(m_edges, m_straight)
+                       if m_flag]
+            vectors_c[m_straight], _ = closestPointsSegmentsBatch(
+                np.repeat(toArray([vector_a]), len(m_lines), axis=0),
+                np.repeat(toArray([vector_b]), len(m_lines), axis=0),
+                [m_edge.Vertexes[0].Point for m_edge in m_lines],
+                [m_edge.Vertexes[-1].Point for m_edge in m_lines])
+        # OCC for curved Edges
+        for m_i in np.flatnonzero(~m_straight):
+            vectors_c[m_i] = toArray(
+                [m_alongedge.distToShape(m_edges[m_i])[1][0][0]])[0]
+    else:
+        vectors_c = getLinkListPoints(selfobj.Points)
+    m_number = len(vectors_c)
+    if m_number == 0:
+        return np.empty((0, 3))
+
+    # Along the curve : from the projection of each reference point
+    # onto the curve (one arc length table for all points)
+    if not m_straight_along:
+        m_table = getArcLengthTable(m_alongedge)
+        m_distances = [m_table.distanceOf(m_vector)
+                       for m_vector in toArray(vectors_c)]
+        return m_table.pointsAt(np.array(m_distances) + selfobj.Distance)
+
+    # Calculate intersection Points at once
+    vectors_a = np.repeat(toArray([vector_a]), m_number, axis=0)
+    vectors_b = np.repeat(toArray([vector_b]), m_number, axis=0)
+    points_t, _, _, _ = intersectPerpendicularLineBatch(vectors_a,
+                                                        vectors_b,
+                                                        vectors_c)
+    if selfobj.Distance != 0.0:
+        vector_translate = vector_b.sub(vector_a).normalize()
+        points_t = points_t + toArray([vector_translate]) * selfobj.Distance
+    return points_t
+
+
+def buildArray(macro, group, edge, other_edges, points, distance):
+    """ Build one PointArray feature object holding the points along
+    an edge for all other edges (or points).
+    """
+    if WF.verbose():
+        print_msg("edge = " + str(edge))
+        print_msg("other_edges = " + str(other_edges))
+        print_msg("points = " + str(points))
+
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makePointArrayFeature(group, "AlongLinePoint")
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.addProperty("App::PropertyLinkSub",
+                                "AlongEdge",
+                                "PointArray",
+                                "Edge where to attach the points")
+            selfobj.addProperty("App::PropertyFloat",
+                                "Distance",
+                                "PointArray",
+                                "Distance from the reference points")
+            selfobj.setEditorMode("AlongEdge", 1)
+            selfobj.AlongEdge = edge
+            selfobj.Distance = distance
+            selfobj.Edges = [tuple(m_edge) for m_edge in other_edges]
+            selfobj.Points = [tuple(m_point) for m_point in points]
+        m_bulk.add(selfobj)
+
+
+@collectErrors(M_MACRO)
 def along_line_point_command():
     """ This command use the selected object(s) to try to build a
     AlongLinePoint feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        edges_from = ["Segments", "Curves"]
+        points_from = ["Points"]
+        try:
+            if m_sel.numberOfEntities == 1:
+                number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+                    get_from=edges_from)
+            else:
+                number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+                    get_from=edges_from)
 
-    edges_from = ["Segments", "Curves"]
-    points_from = ["Points"]
-    try:
-        if m_sel.numberOfEntities == 1:
-            number_of_edges, edge_list = m_sel.get_segmentsWithNames(
-                get_from=edges_from)
-        else:
-            number_of_edges, edge_list = m_sel.get_segmentsWithNames(
-                get_from=edges_from)
-
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
-
-        if number_of_edges == 0:
-            raise Exception(M_EXCEPTION_MSG)
-        else:
-            if number_of_edges == 1 and number_of_vertexes == 0:
-                raise Exception(M_EXCEPTION_MSG)
-
-        m_main_dir = "WorkPoints_P"
-        m_sub_dir = "Set000"
-        m_group = createFolders(str(m_main_dir))
-
-        m_distance = getDistanceLinePoint()
-
-        # Selection of : One Edge and One or several Point(s)
-        if number_of_edges == 1 and number_of_vertexes > 0:
-            try:
-                # Create a sub group if needed
-                if number_of_vertexes > 1:
-                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
-
-                edge = edge_list[0]
-                for j in range(number_of_vertexes):
-                    point = vertex_list[j]
-                    buildFromEdgeAndPoint(M_MACRO,
-                                          m_group,
-                                          edge, point, m_distance)
-
-            except Exception as err:
-                printError_msg(err.args[0], title=M_MACRO)
-
-        # Selection of : One Edge and One or several Edge(s)
-        elif number_of_edges > 1 and number_of_vertexes == 0:
-            try:
-                # Create a sub group if needed
-                if number_of_edges > 2:
-                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
 
-                edge = edge_list[0]
-                for other_edge in edge_list[1:]:
-                    buildFromEdges(M_MACRO,
+            if number_of_edges == 0:
+                raise Exception(M_EXCEPTION_MSG)
+            else:
+                if number_of_edges == 1 and number_of_vertexes == 0:
+                    raise Exception(M_EXCEPTION_MSG)
+
+            m_main_dir = "WorkPoints_P"
+            m_sub_dir = "Set000"
+            m_group = createFolders(str(m_main_dir))
+
+            m_distance = getDistanceLinePoint()
+
+            # Selection of : One Edge and One or several Point(s)
+            if number_of_edges == 1 and number_of_vertexes > 0:
+                try:
+                    edge = edge_list[0]
+                    # One PointArray for all points
+                    if M_OUTPUT_ARRAY and number_of_vertexes > 1:
+                        buildArray(M_MACRO,
                                    m_group,
-                                   edge, other_edge, m_distance)
-
-            except Exception as err:
-                printError_msg(err.args[0], title=M_MACRO)
-
-        # Selection of : several Edges and Points with
-        # same number of Edges and Points
-        elif number_of_edges > 1 and number_of_vertexes == number_of_edges:
-            try:
-                # Create a sub group if needed
-                m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
-
-                for edge, point in zip(edge_list, vertex_list):
-                    buildFromEdgeAndPoint(M_MACRO,
-                                          m_group,
-                                          edge, point, m_distance)
+                                   edge, [], vertex_list, m_distance)
+                        number_of_vertexes = 0
+
+                    # Create a sub group if needed
+                    elif number_of_vertexes > 1:
+                        m_group = createSubGroup(m_act_doc, m_main_dir,
+                                                 m_sub_dir)
+
+                    for j in range(number_of_vertexes):
+                        point = vertex_list[j]
+                        buildFromEdgeAndPoint(M_MACRO,
+                                              m_group,
+                                              edge, point, m_distance)
+
+                except Exception as err:
+                    printError_msg(err.args[0], title=M_MACRO)
+
+            # Selection of : One Edge and One or several Edge(s)
+            elif number_of_edges > 1 and number_of_vertexes == 0:
+                try:
+                    edge = edge_list[0]
+                    other_edges = edge_list[1:]
+                    # One PointArray for all points
+                    if M_OUTPUT_ARRAY and number_of_edges > 2:
+                        buildArray(M_MACRO,
+                                   m_group,
+                                   edge, other_edges, [], m_distance)
+                        other_edges = []
+
+                    # Create a sub group if needed
+                    elif number_of_edges > 2:
+                        m_group = createSubGroup(m_act_doc, m_main_dir,
+                                                 m_sub_dir)
+
+                    for other_edge in other_edges:
+                        buildFromEdges(M_MACRO,
+                                       m_group,
+                                       edge, other_edge, m_distance)
+
+                except Exception as err:
+                    printError_msg(err.args[0], title=M_MACRO)
+
+            # Selection of : several Edges and Points with
+            # same number of Edges and Points
+            elif number_of_edges > 1 and number_of_vertexes == number_of_edges:
+                try:
+                    # Create a sub group if needed
+                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
 
-            except Exception as err:
-                printError_msg(err.args[0], title=M_MACRO)
+                    for edge, point in zip(edge_list, vertex_list):
+                        buildFromEdgeAndPoint(M_MACRO,
+                                              m_group,
+                                              edge, point, m_distance)
 
-        else:
-            printError_msg("Bad selection !", title=M_MACRO)
+                except Exception as err:
+                    printError_msg(err.args[0], title=M_MACRO)
 
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
+            else:
+                printError_msg("Bad selection !", title=M_MACRO)
 
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
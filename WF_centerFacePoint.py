@@ -35,7 +35,7 @@ import FreeCAD as App
 import Part
 from PySide import QtGui, QtCore
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
 # from InitGui import M_DEBUG
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -63,10 +63,12 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import Selection, getSel
-    from WF_print import printError_msg, print_msg
+    from WF_selection import Selection, getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, collectErrors
     from WF_directory import createFolders, addObjectToGrp
     from WF_geometry import *
+    from WF_bulk import BulkBuilder
+    from WF_links import getLinkSubShape
 except ImportError:
     print("ERROR: Cannot load WF modules !")
     sys.exit(1)
@@ -108,8 +110,9 @@ class CenterFacePointPanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if len(Gui.Selection.getSelectionEx(m_act_doc.Name)) != 0:
-                run()
+            with SelectionSnapshot():
+                if hasSelection():
+                    run()
         return True
 
     def reject(self):
@@ -117,7 +120,7 @@ class CenterFacePointPanel:
         return False
 
     def shouldShow(self):
-        return (len(Gui.Selection.getSelectionEx(App.activeDocument().Name)) == 0)
+        return not hasSelection()
 
 
 def makeCenterFacePointFeature(group):
@@ -133,7 +136,8 @@ def makeCenterFacePointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         CenterFacePoint(m_obj)
-        ViewProviderCenterFacePoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderCenterFacePoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -186,15 +190,19 @@ class CenterFacePoint(WF_Point):
             if m_property not in selfobj.PropertiesList:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             Vector_point = None
             if selfobj.Face is not None:
-                n = eval(selfobj.Face[1][0].lstrip('Face'))
                 if M_DEBUG:
                     print_msg(str(selfobj.Face))
-                    print_msg("n = " + str(n))
 
-                m_face = selfobj.Face[0].Shape.Faces[n - 1]
+                m_face = getLinkSubShape(selfobj.Face, 'Face')
 
                 if M_DEBUG:
                     print_msg("m_face = " + str(m_face))
@@ -211,6 +219,7 @@ class CenterFacePoint(WF_Point):
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except Exception as err:
             printError_msg(err.args[0], title=M_MACRO)
 
@@ -279,12 +288,14 @@ class CommandCenterFacePoint:
                 'ToolTip': M_TOOL_TIP}
 
     def Activated(self):
-        m_act_doc = App.activeDocument()
-        if m_act_doc is not None:
-            if len(Gui.Selection.getSelectionEx(m_act_doc.Name)) == 0:
-                Gui.Control.showDialog(CenterFacePointPanel())
+        # One selection snapshot for the panel and the command
+        with SelectionSnapshot():
+            m_act_doc = App.activeDocument()
+            if m_act_doc is not None:
+                if not hasSelection():
+                    Gui.Control.showDialog(CenterFacePointPanel())
 
-        run()
+            run()
 
     def IsActive(self):
         if App.ActiveDocument:
@@ -297,53 +308,52 @@ if App.GuiUp:
     Gui.addCommand("CenterFacePoint", CommandCenterFacePoint())
 
 
+@collectErrors(M_MACRO)
 def run():
     m_sel, m_act_doc = getSel(WF.verbose())
-
-    try:
-        Number_of_Planes, Plane_List = m_sel.get_planesNames(
-            getfrom=["Planes",
-                     "Objects"])
-        if WF.verbose():
-            print_msg("Number_of_Planes = " + str(Number_of_Planes))
-            print_msg("Plane_List = " + str(Plane_List))
-
-        if Number_of_Planes == 0:
-            raise Exception(M_EXCEPTION_MSG)
+    with BulkBuilder(M_MACRO) as m_builder:
         try:
-            m_main_dir = "WorkPoints_P"
-            m_sub_dir = "Set001"
-            m_group = createFolders(str(m_main_dir))
-            m_error_msg = "Could not Create '"
-            m_error_msg += str(m_sub_dir) + "' Objects Group!"
-
-            # Create a sub group if needed
-            if Number_of_Planes > 1:
-                try:
-                    m_ob = App.ActiveDocument.getObject(str(m_main_dir)).newObject("App::DocumentObjectGroup", str(m_sub_dir))
-                    m_group = m_act_doc.getObject(str(m_ob.Label))
-                except Exception as err:
-                    printError_msg(err.args[0], title=M_MACRO)
-                    printError_msg(m_error_msg)
-
+            Number_of_Planes, Plane_List = m_sel.get_planesNames(
+                getfrom=["Planes",
+                         "Objects"])
             if WF.verbose():
-                print_msg("Group = " + str(m_group.Label))
-
-            for i in range(Number_of_Planes):
-                plane = Plane_List[i]
-                App.ActiveDocument.openTransaction(M_MACRO)
-                selfobj = makeCenterFacePointFeature(m_group)
-                selfobj.Face = plane
-                selfobj.Proxy.execute(selfobj)
+                print_msg("Number_of_Planes = " + str(Number_of_Planes))
+                print_msg("Plane_List = " + str(Plane_List))
+
+            if Number_of_Planes == 0:
+                raise Exception(M_EXCEPTION_MSG)
+            try:
+                m_main_dir = "WorkPoints_P"
+                m_sub_dir = "Set001"
+                m_group = createFolders(str(m_main_dir))
+                m_error_msg = "Could not Create '"
+                m_error_msg += str(m_sub_dir) + "' Objects Group!"
+
+                # Create a sub group if needed
+                if Number_of_Planes > 1:
+                    try:
+                        m_ob = App.ActiveDocument.getObject(str(m_main_dir)).newObject("App::DocumentObjectGroup", str(m_sub_dir))
+                        m_group = m_act_doc.getObject(str(m_ob.Label))
+                    except Exception as err:
+                        printError_msg(err.args[0], title=M_MACRO)
+                        printError_msg(m_error_msg)
+
+                if WF.verbose():
+                    print_msg("Group = " + str(m_group.Label))
+
+                for i in range(Number_of_Planes):
+                    plane = Plane_List[i]
+                    selfobj = makeCenterFacePointFeature(m_group)
+                    with selfobj.Proxy.batchEdit(selfobj):
+                        selfobj.Face = plane
+                    m_builder.add(selfobj)
+
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
             printError_msg(err.args[0], title=M_MACRO)
 
-        App.ActiveDocument.commitTransaction()
-
-    except Exception as err:
-        printError_msg(err.args[0], title=M_MACRO)
-
 
 if __name__ == '__main__':
     run()
@@ -13,7 +13,9 @@ create a (n-1) Point(s) along selected Line/Edge(s).
 Number of Parts : n (2 by default)
 The number (n) indicates in how many Parts each selected parent Line/Edge(s)
 will be cut in.
-Limits : (Min: 2, Max: 100).
+Limits : (Min: 2, Max: 100; no Max for Division).
+Curved Line/Edge(s) are cut in Parts of equal length along the curve
+(arc length, see Utils/WF_arcLength.py).
 
 Point's location:
 If check box checked then points will be created at each ends of Parts.
@@ -31,6 +33,11 @@ this means that the point will be located in the end of the Line.
 
  check box and Part's end number are exclusive!
 
+Division:
+If checked then all points at each ends of Parts of all selected
+Line/Edge(s) are computed at once into one single PointArray object.
+There is no limit to the Number of Parts in this case.
+
 How to
 - Select one or several Line/Edge(s)
  (you can also select 2 points in place of one Line/Edge) and/or
@@ -40,13 +47,14 @@ How to
 """
 import sys
 import os.path
-import re
+import numpy as np
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
+from WF_pointArray import makePointArrayFeature
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -65,11 +73,18 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import isEqualVectors, alongTwoPointsPoint, alongLinePoint, propertiesPoint
+    from WF_geometry import isStraightEdge
+    from WF_arcLength import getArcLengthTable
+    from WF_batch import edgesEndPoints, isEqualVectorsBatch, toArray
+    from WF_batch import alongLinePointBatch, alongTwoPointsPointBatch
+    from WF_links import getSubShapes, getLinkSubShape, getLinkPoint
+    from WF_links import getLinkListSubShapes, getLinkListPoints
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: Cannot load WF modules !")
     sys.exit(1)
@@ -108,9 +123,12 @@ The number (n) indicates how many parts to consider.<br>
 ###############
 M_MACRO = "Macro CenterLinePoint"
 M_LOCATION = "Single"
-M_LOCATIONS = ["Single", "All"]
+M_LOCATIONS = ["Single", "All", "Division"]
 M_NUMBERLINEPART = 2
+# Maximum number of parts, except for "Division"
+M_MAX_NUMBERLINEPART = 100
 M_INDEXPART = 1
+M_OUTPUT_ARRAY = False
 ###############
 
 
@@ -120,16 +138,22 @@ def setLocation(location):
     Parameters
     -------
     *location* : (String, Mandatory)
-            either "Single" or "All"
-            "either" for creation of one point only.
-            "all" for creation all points at end of all parts.
+            either "Single", "All" or "Division"
+            "Single" for creation of one point only.
+            "All" for creation all points at end of all parts.
+            "Division" for creation all points at end of all parts
+            into one single PointArray object (no limit of parts).
     """
     global M_LOCATION
+    global M_NUMBERLINEPART
     if location in M_LOCATIONS:
         M_LOCATION = location
+        if M_LOCATION != "Division":
+            M_NUMBERLINEPART = min(M_NUMBERLINEPART, M_MAX_NUMBERLINEPART)
     else:
         raise Exception(
-            "Not valid 'location' option : must be either 'Single' or 'All'")
+            "Not valid 'location' option : must be either 'Single', " +
+            "'All' or 'Division'")
 
 
 def getLocation():
@@ -137,7 +161,7 @@ def getLocation():
 
     Return
     -------
-    either "Single" or "All"
+    either "Single", "All" or "Division"
 
     """
     return M_LOCATION
@@ -152,10 +176,14 @@ def setNumberLinePart(number_line_part):
     -------
     *number_line_part* : (Positive Integer, Mandatory)
             must be greater than 1
+            limited to M_MAX_NUMBERLINEPART if location is not
+            "Division" (set the location first)
     """
     global M_NUMBERLINEPART
     if int(number_line_part) > 1:
         M_NUMBERLINEPART = int(number_line_part)
+        if M_LOCATION != "Division":
+            M_NUMBERLINEPART = min(M_NUMBERLINEPART, M_MAX_NUMBERLINEPART)
 
 
 def getNumberLinePart():
@@ -191,6 +219,29 @@ def getIndexPart():
     return M_INDEXPART
 
 
+def setOutputArray(output_array):
+    """ Set the output of the command when several points are created.
+
+    Parameters
+    -------
+    *output_array* : (Boolean, Mandatory)
+            if True one single PointArray feature holds all points,
+            if False one CenterLinePoint feature is created per point.
+    """
+    global M_OUTPUT_ARRAY
+    M_OUTPUT_ARRAY = bool(output_array)
+
+
+def isOutputArray():
+    """ Get the output of the command when several points are created.
+
+    Return
+    -------
+    True if one single PointArray feature is created.
+    """
+    return M_OUTPUT_ARRAY
+
+
 class CenterLinePointPanel:
     """ The CenterLinePointPanel (GUI).
     """
@@ -207,20 +258,28 @@ class CenterLinePointPanel:
         if M_LOCATION == "All":
             self.form.UI_CenterLinePoint_checkBox.setCheckState(
                 QtCore.Qt.Checked)
+        self.form.UI_CenterLinePoint_checkBox_division.setCheckState(
+            QtCore.Qt.Unchecked)
+        if M_LOCATION == "Division":
+            self.form.UI_CenterLinePoint_checkBox_division.setCheckState(
+                QtCore.Qt.Checked)
 
     def accept(self):
         """ Run when click on OK button.
         """
         global M_LOCATION
-        global M_NUMBERLINEPART
         global M_INDEXPART
 
         m_select = self.form.UI_CenterLinePoint_checkBox.isChecked()
-        if m_select:
+        m_division = self.form.UI_CenterLinePoint_checkBox_division.isChecked()
+        if m_division:
+            M_LOCATION = "Division"
+        elif m_select:
             M_LOCATION = "All"
         else:
             M_LOCATION = "Single"
-        M_NUMBERLINEPART = self.form.UI_CenterLinePoint_spin_numberLinePart.value()
+        setNumberLinePart(
+            self.form.UI_CenterLinePoint_spin_numberLinePart.value())
         M_INDEXPART = self.form.UI_CenterLinePoint_spin_indexPart.value()
 
         if WF.verbose():
@@ -231,8 +290,9 @@ class CenterLinePointPanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                center_line_point_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    center_line_point_command()
         return True
 
     def reject(self):
@@ -244,8 +304,7 @@ class CenterLinePointPanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
 
 
 def makeCenterLinePointFeature(group):
@@ -263,7 +322,8 @@ def makeCenterLinePointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         CenterLinePoint(m_obj)
-        ViewProviderCenterLinePoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderCenterLinePoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -339,14 +399,11 @@ Limits : [-1000:1000]
         if 'NumberLinePart' not in selfobj.PropertiesList:
             return
 
-#         n = eval(selfobj.Edge[1][0].lstrip('Edge'))
-        m_int = re.sub('[^0-9]', '', selfobj.Edge[1][0])
-        n = int(m_int)
         if WF.verbose():
-            print_msg("n = " + str(n))
+            print_msg(str(selfobj.Edge))
 
         try:
-            vector_point = alongLinePoint(selfobj.Edge[0].Shape.Edges[n - 1],
+            vector_point = alongLinePoint(getLinkSubShape(selfobj.Edge, 'Edge'),
                                           selfobj.IndexPart,
                                           selfobj.NumberLinePart)
 
@@ -389,39 +446,34 @@ Limits : [-1000:1000]
         if 'parametric' in selfobj.PropertiesList:
             self.execute_2018(selfobj)
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             vector_point = None
             if selfobj.Point1 is not None and selfobj.Point2 is not None:
-                # n1 = eval(selfobj.Point1[1][0].lstrip('Vertex'))
-                # n2 = eval(selfobj.Point2[1][0].lstrip('Vertex'))
-                m_n1 = re.sub('[^0-9]', '', selfobj.Point1[1][0])
-                m_n2 = re.sub('[^0-9]', '', selfobj.Point2[1][0])
-                m_n1 = int(m_n1)
-                m_n2 = int(m_n2)
                 if M_DEBUG:
                     print_msg(str(selfobj.Point1))
                     print_msg(str(selfobj.Point2))
-                    print_msg("m_n1 = " + str(m_n1))
-                    print_msg("m_n2 = " + str(m_n2))
 
-                point1 = selfobj.Point1[0].Shape.Vertexes[m_n1 - 1].Point
-                point2 = selfobj.Point2[0].Shape.Vertexes[m_n2 - 1].Point
+                point1 = getLinkPoint(selfobj.Point1)
+                point2 = getLinkPoint(selfobj.Point2)
 
                 vector_point = alongTwoPointsPoint(point1,
                                                    point2,
                                                    selfobj.IndexPart,
                                                    selfobj.NumberLinePart)
             elif selfobj.Edge is not None:
-                m_n = re.sub('[^0-9]', '', selfobj.Edge[1][0])
-                m_n = int(m_n)
                 if M_DEBUG:
                     print_msg(str(selfobj.Edge))
-                    print_msg("m_n = " + str(m_n))
 
-                if not selfobj.Edge[0].Shape.Edges:
+                if not getSubShapes(selfobj.Edge[0], 'Edge'):
                     return
 
-                vector_point = alongLinePoint(selfobj.Edge[0].Shape.Edges[m_n - 1],
+                vector_point = alongLinePoint(getLinkSubShape(selfobj.Edge, 'Edge'),
                                               selfobj.IndexPart,
                                               selfobj.NumberLinePart)
             if vector_point is not None:
@@ -434,6 +486,7 @@ Limits : [-1000:1000]
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -459,14 +512,14 @@ Limits : [-1000:1000]
             propertiesPoint(selfobj.Label, self.color)
 
         if prop == "IndexPart":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
         if prop == 'NumberLinePart':
             if selfobj.NumberLinePart <= 1:
                 selfobj.NumberLinePart = 2
-            elif selfobj.NumberLinePart > 100:
-                selfobj.NumberLinePart = 100
-            selfobj.Proxy.execute(selfobj)
+            elif selfobj.NumberLinePart > M_MAX_NUMBERLINEPART:
+                selfobj.NumberLinePart = M_MAX_NUMBERLINEPART
+            selfobj.Proxy.requestExecute(selfobj)
 
 
 class ViewProviderCenterLinePoint:
@@ -511,16 +564,15 @@ def buildFromEdge(macro, group, edge, number_line_part, index_part):
     """
     if WF.verbose():
         print_msg("edge = " + str(edge))
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeCenterLinePointFeature(group)
-    selfobj.Edge = edge
-    selfobj.Point1 = None
-    selfobj.Point2 = None
-    selfobj.NumberLinePart = number_line_part
-    selfobj.IndexPart = index_part
-    selfobj.Proxy.execute(selfobj)
-
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeCenterLinePointFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Edge = edge
+            selfobj.Point1 = None
+            selfobj.Point2 = None
+            selfobj.NumberLinePart = number_line_part
+            selfobj.IndexPart = index_part
+        m_bulk.add(selfobj)
 
 
 def buildFromPoints(macro, group, vertexes, number_line_part, index_part):
@@ -531,151 +583,277 @@ def buildFromPoints(macro, group, vertexes, number_line_part, index_part):
     if WF.verbose():
         print_msg("vertex1 = " + str(vertex1))
         print_msg("vertex2 = " + str(vertex2))
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeCenterLinePointFeature(group)
-    selfobj.Edge = None
-    selfobj.Point1 = vertex1
-    selfobj.Point2 = vertex2
-    selfobj.NumberLinePart = number_line_part
-    selfobj.IndexPart = index_part
-    selfobj.Proxy.execute(selfobj)
-    WF.touch(selfobj)
-
-
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeCenterLinePointFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Edge = None
+            selfobj.Point1 = vertex1
+            selfobj.Point2 = vertex2
+            selfobj.NumberLinePart = number_line_part
+            selfobj.IndexPart = index_part
+        m_bulk.add(selfobj)
+
+
+def centerLinePointArray(selfobj):
+    """ PointArray generator : returns the points at IndexPart/NumberLinePart
+    (or at each part end if Location is "All" or "Division") of each
+    input Edge, or else
+    of the Line defined by each pair of input Points, as a (N,3) array.
+    """
+    m_number = max(selfobj.NumberLinePart, 2)
+    if selfobj.Location == "Single":
+        m_indexes = [selfobj.IndexPart]
+    else:
+        m_indexes = np.arange(m_number + 1)
+
+    if selfobj.Edges:
+        m_edges = getLinkListSubShapes(selfobj.Edges, 'Edge')
+        starts, ends, lengths = edgesEndPoints(m_edges)
+        m_repeat = len(m_indexes)
+        m_points, m_valid = alongLinePointBatch(
+            np.repeat(starts, m_repeat, axis=0),
+            np.repeat(ends, m_repeat, axis=0),
+            np.repeat(lengths, m_repeat),
+            np.tile(m_indexes, len(m_edges)),
+            m_number)
+        # Curved Edges : stations along the curve (arc length tables)
+        m_fractions = np.asarray(m_indexes, dtype=float) / m_number
+        for m_i, m_edge in enumerate(m_edges):
+            if not isStraightEdge(m_edge):
+                m_rows = slice(m_i * m_repeat, (m_i + 1) * m_repeat)
+                m_points[m_rows] = getArcLengthTable(
+                    m_edge).pointsAtFractions(m_fractions)
+                m_valid[m_rows] = True
+    else:
+        m_vectors = toArray(getLinkListPoints(selfobj.Points))
+        if len(m_vectors) % 2 == 0:
+            # Even number of points : one Line per pair, as the
+            # command does (the last pair is not used if more than 2)
+            m_last = len(m_vectors)
+            if m_last > 2:
+                m_last -= 2
+            vectors_a = m_vectors[0:m_last:2]
+            vectors_b = m_vectors[1:m_last:2]
+        else:
+            # Odd number of points : one Line per consecutive points
+            vectors_a, vectors_b = m_vectors[:-1], m_vectors[1:]
+        m_repeat = len(m_indexes)
+        m_points, m_valid = alongTwoPointsPointBatch(
+            np.repeat(vectors_a, m_repeat, axis=0),
+            np.repeat(vectors_b, m_repeat, axis=0),
+            np.tile(m_indexes, len(vectors_a)),
+            m_number)
+    return m_points[m_valid]
+
+
+def buildArray(macro, group, edges, vertexes, number_line_part, index_part,
+               location):
+    """ Build one PointArray feature object holding the points of
+    all edges (or pairs of points).
+    """
+    if WF.verbose():
+        print_msg("edges = " + str(edges))
+        print_msg("vertexes = " + str(vertexes))
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makePointArrayFeature(group, "CenterLinePoint")
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.addProperty("App::PropertyInteger",
+                                "NumberLinePart",
+                                "PointArray",
+                                "Number of Parts of each Line")
+            selfobj.addProperty("App::PropertyInteger",
+                                "IndexPart",
+                                "PointArray",
+                                "Part's end number of the points")
+            selfobj.addProperty("App::PropertyEnumeration",
+                                "Location",
+                                "PointArray",
+                                "Single point or all part's ends")
+            selfobj.Location = M_LOCATIONS
+            selfobj.Location = location
+            selfobj.NumberLinePart = number_line_part
+            selfobj.IndexPart = index_part
+            selfobj.Edges = [tuple(m_edge) for m_edge in edges]
+            selfobj.Points = [tuple(m_vertex) for m_vertex in vertexes]
+        m_bulk.add(selfobj)
+
+
+@collectErrors(M_MACRO)
 def center_line_point_command():
     """ This command use the selected object(s) to try to build a
     CenterLinePoint feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
-
-    edges_from = ["Segments", "Curves", "Planes", "Shells", "Objects"]
-    points_from = ["Points"]
-    try:
-        number_of_edges, edge_list = m_sel.get_segmentsWithNames(
-            get_from=edges_from)
-        # number_of_edges, edge_list = m_sel.get_segmentsWithIndex(getfrom=edges_from)
-
-        if number_of_edges == 0:
-            # Try to get Edges from points
-            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-                get_from=points_from)
-
-        if number_of_edges == 0 and number_of_vertexes < 2:
-            raise Exception(M_EXCEPTION_MSG)
-
+    with BulkBuilder(M_MACRO) as m_builder:
+        edges_from = ["Segments", "Curves", "Planes", "Shells", "Objects"]
+        points_from = ["Points"]
         try:
-            if WF.verbose():
-                print_msg("Location = " + str(M_LOCATION))
-
-            m_main_dir = "WorkPoints_P"
-            m_sub_dir = "Set000"
-            m_group = createFolders(str(m_main_dir))
-
-            # From Edges
-            if number_of_edges != 0:
-                # Create a sub group if needed
-                if number_of_edges > 1 or M_LOCATION != "Single":
-                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
-
-                for i in range(number_of_edges):
-                    m_edge = edge_list[i]
-
-                    # Check if first point and last point of edge is not the
-                    # same
-                    vector_a = m_edge[0].Shape.Edges[0].Vertexes[0].Point
-                    vector_b = m_edge[0].Shape.Edges[0].Vertexes[-1].Point
-                    if isEqualVectors(vector_a, vector_b):
-                        continue
-
-                    if M_LOCATION == "Single":
-                        buildFromEdge(M_MACRO,
-                                      m_group,
-                                      m_edge, M_NUMBERLINEPART, M_INDEXPART)
-                    else:
-                        for m_i_part in range(M_NUMBERLINEPART + 1):
+            number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+                get_from=edges_from)
+            # number_of_edges, edge_list = m_sel.get_segmentsWithIndex(
+            #     getfrom=edges_from)
+            number_of_vertexes = 0
+
+            if number_of_edges == 0:
+                # Try to get Edges from points
+                number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                    get_from=points_from)
+
+            if number_of_edges == 0 and number_of_vertexes < 2:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                if WF.verbose():
+                    print_msg("Location = " + str(M_LOCATION))
+
+                m_main_dir = "WorkPoints_P"
+                m_sub_dir = "Set000"
+                m_group = createFolders(str(m_main_dir))
+
+                m_array = M_LOCATION == "Division"
+                m_array |= M_OUTPUT_ARRAY and (number_of_edges > 1 or
+                                               number_of_vertexes > 2 or
+                                               M_LOCATION != "Single")
+
+                # From Edges
+                if number_of_edges != 0:
+                    # Check at once if first point and last point of edges
+                    # are not the same
+                    m_edges = [getLinkSubShape(m_edge, 'Edge')
+                               for m_edge in edge_list]
+                    vectors_a, vectors_b, _ = edgesEndPoints(m_edges)
+                    m_null_edges = isEqualVectorsBatch(vectors_a, vectors_b)
+                    # Closed curves (i.e. circles) are not null
+                    m_null_edges &= np.array([isStraightEdge(m_edge)
+                                              for m_edge in m_edges],
+                                             dtype=bool)
+
+                    # One PointArray for all points
+                    if m_array:
+                        buildArray(M_MACRO,
+                                   m_group,
+                                   [m_edge for m_edge, m_null in
+                                    zip(edge_list, m_null_edges)
+                                    if not m_null],
+                                   [],
+                                   M_NUMBERLINEPART, M_INDEXPART, M_LOCATION)
+                        edge_list = []
+
+                    # Create a sub group if needed
+                    elif number_of_edges > 1 or M_LOCATION != "Single":
+                        m_group = createSubGroup(m_act_doc, m_main_dir,
+                                                 m_sub_dir)
+
+                    for i in range(len(edge_list)):
+                        m_edge = edge_list[i]
+
+                        if m_null_edges[i]:
+                            continue
+
+                        if M_LOCATION == "Single":
                             buildFromEdge(M_MACRO,
                                           m_group,
-                                          m_edge, M_NUMBERLINEPART, m_i_part)
-
-            # From Vertexes
-            else:
-                if number_of_vertexes > 2:
-                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
+                                          m_edge,
+                                          M_NUMBERLINEPART, M_INDEXPART)
+                        else:
+                            for m_i_part in range(M_NUMBERLINEPART + 1):
+                                buildFromEdge(M_MACRO,
+                                              m_group,
+                                              m_edge,
+                                              M_NUMBERLINEPART, m_i_part)
+
+                # From Vertexes as one PointArray
+                elif m_array:
+                    buildArray(M_MACRO,
+                               m_group,
+                               [],
+                               vertex_list,
+                               M_NUMBERLINEPART, M_INDEXPART, M_LOCATION)
+
+                # From Vertexes
+                else:
+                    if number_of_vertexes > 2:
+                        m_group = createSubGroup(m_act_doc, m_main_dir,
+                                                 m_sub_dir)
 
-                # Even number of vertexes
-                if number_of_vertexes % 2 == 0:
-                    if WF.verbose():
-                        print_msg("Even number of points")
+                    # Even number of vertexes
+                    if number_of_vertexes % 2 == 0:
+                        if WF.verbose():
+                            print_msg("Even number of points")
 
-                    if number_of_vertexes == 2:
-                        vertex1 = vertex_list[0]
-                        vertex2 = vertex_list[1]
+                        if number_of_vertexes == 2:
+                            vertex1 = vertex_list[0]
+                            vertex2 = vertex_list[1]
 
-    #                     point1 = vertex1[0].Shape.Vertexes[0].Point
-    #                     point2 = vertex2[0].Shape.Vertexes[0].Point
-    #                     if isEqualVectors(point1, point2):
-    #                         return
+        #                     point1 = vertex1[0].Shape.Vertexes[0].Point
+        #                     point2 = vertex2[0].Shape.Vertexes[0].Point
+        #                     if isEqualVectors(point1, point2):
+        #                         return
 
-                        if M_LOCATION == "Single":
-                            buildFromPoints(M_MACRO,
-                                            m_group,
-                                            (vertex1, vertex2),
-                                            M_NUMBERLINEPART, M_INDEXPART)
-                        else:
-                            for m_i_part in range(M_NUMBERLINEPART + 1):
+                            if M_LOCATION == "Single":
                                 buildFromPoints(M_MACRO,
                                                 m_group,
                                                 (vertex1, vertex2),
-                                                M_NUMBERLINEPART, m_i_part)
+                                                M_NUMBERLINEPART,
+                                                M_INDEXPART)
+                            else:
+                                for m_i_part in range(M_NUMBERLINEPART + 1):
+                                    buildFromPoints(M_MACRO,
+                                                    m_group,
+                                                    (vertex1, vertex2),
+                                                    M_NUMBERLINEPART,
+                                                    m_i_part)
+                        else:
+                            for i in range(0, number_of_vertexes - 2, 2):
+                                vertex1 = vertex_list[i]
+                                vertex2 = vertex_list[i + 1]
+
+        #                         point1 = vertex1[0].Shape.Vertexes[0].Point
+        #                         point2 = vertex2[0].Shape.Vertexes[0].Point
+        #                         if isEqualVectors(point1, point2):
+        #                             continue
+
+                                if M_LOCATION == "Single":
+                                    buildFromPoints(M_MACRO,
+                                                    m_group,
+                                                    (vertex1, vertex2),
+                                                    M_NUMBERLINEPART,
+                                                    M_INDEXPART)
+                                else:
+                                    for m_i_part in range(
+                                            M_NUMBERLINEPART + 1):
+                                        buildFromPoints(M_MACRO,
+                                                        m_group,
+                                                        (vertex1, vertex2),
+                                                        M_NUMBERLINEPART,
+                                                        m_i_part)
+                    # Odd number of vertexes
                     else:
-                        for i in range(0, number_of_vertexes - 2, 2):
+                        if WF.verbose():
+                            print_msg("Odd number of points")
+                        for i in range(number_of_vertexes - 1):
                             vertex1 = vertex_list[i]
                             vertex2 = vertex_list[i + 1]
 
-    #                         point1 = vertex1[0].Shape.Vertexes[0].Point
-    #                         point2 = vertex2[0].Shape.Vertexes[0].Point
-    #                         if isEqualVectors(point1, point2):
-    #                             continue
-
                             if M_LOCATION == "Single":
                                 buildFromPoints(M_MACRO,
                                                 m_group,
                                                 (vertex1, vertex2),
-                                                M_NUMBERLINEPART, M_INDEXPART)
+                                                M_NUMBERLINEPART,
+                                                M_INDEXPART)
                             else:
                                 for m_i_part in range(M_NUMBERLINEPART + 1):
                                     buildFromPoints(M_MACRO,
                                                     m_group,
                                                     (vertex1, vertex2),
-                                                    M_NUMBERLINEPART, m_i_part)
-                # Odd number of vertexes
-                else:
-                    if WF.verbose():
-                        print_msg("Odd number of points")
-                    for i in range(number_of_vertexes - 1):
-                        vertex1 = vertex_list[i]
-                        vertex2 = vertex_list[i + 1]
+                                                    M_NUMBERLINEPART,
+                                                    m_i_part)
 
-                        if M_LOCATION == "Single":
-                            buildFromPoints(M_MACRO,
-                                            m_group,
-                                            (vertex1, vertex2),
-                                            M_NUMBERLINEPART, M_INDEXPART)
-                        else:
-                            for m_i_part in range(M_NUMBERLINEPART + 1):
-                                buildFromPoints(M_MACRO,
-                                                m_group,
-                                                (vertex1, vertex2),
-                                                M_NUMBERLINEPART, m_i_part)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
-
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
-
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
@@ -9,13 +9,12 @@ Create Point(s) at Start and End location of each selected Line(s).
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from PySide import QtGui, QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -34,11 +33,13 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp
     from WF_geometry import propertiesPoint
+    from WF_links import getSubShapes, getLinkSubShape
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: Cannot load WF modules !")
     sys.exit(1)
@@ -131,8 +132,9 @@ class ExtremaLinePointPanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                extrema_line_point_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    extrema_line_point_command()
         return True
 
     def reject(self):
@@ -144,8 +146,7 @@ class ExtremaLinePointPanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return (len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0)
+        return not hasSelection()
 
 
 def makeExtremaLinePointFeature(group):
@@ -163,7 +164,8 @@ def makeExtremaLinePointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         ExtremaLinePoint(m_obj)
-        ViewProviderExtremaLinePoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderExtremaLinePoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -231,23 +233,25 @@ relative to the parent Line.
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             vector_point = None
-            m_n = re.sub('[^0-9]', '', selfobj.Edge[1][0])
-            m_n = int(m_n)
             if M_DEBUG:
                 print_msg(str(selfobj.Edge))
-                print_msg("m_n = " + str(m_n))
 
-            if not selfobj.Edge[0].Shape.Edges:
+            if not getSubShapes(selfobj.Edge[0], 'Edge'):
                 return
 
+            m_edge = getLinkSubShape(selfobj.Edge, 'Edge')
             if selfobj.At == "Begin":
-                vector_point = selfobj.Edge[0].Shape.Edges[m_n -
-                                                           1].Vertexes[0].Point
+                vector_point = m_edge.Vertexes[0].Point
             else:
-                vector_point = selfobj.Edge[0].Shape.Edges[m_n -
-                                                           1].Vertexes[-1].Point
+                vector_point = m_edge.Vertexes[-1].Point
 
             if vector_point is not None:
                 point = Part.Point(vector_point)
@@ -259,6 +263,7 @@ relative to the parent Line.
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -282,7 +287,7 @@ relative to the parent Line.
             propertiesPoint(selfobj.Label, self.color)
 
         if prop == "At":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
 
 class ViewProviderExtremaLinePoint:
@@ -323,84 +328,66 @@ class ViewProviderExtremaLinePoint:
         self.icon = icon
 
 
+@collectErrors(M_MACRO)
 def extrema_line_point_command():
     """ This command use the selected object(s) to try to build a
     ExtremaLinePoint feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
-
-    edges_from = ["Segments", "Curves", "Planes", "Shells", "Objects"]
-    try:
-        number_of_edges, edge_list = m_sel.get_segmentsWithNames(
-            get_from=edges_from)
-
-        if number_of_edges == 0:
-            raise Exception(M_EXCEPTION_MSG)
-
+    with BulkBuilder(M_MACRO) as m_builder:
+        edges_from = ["Segments", "Curves", "Planes", "Shells", "Objects"]
         try:
-            m_main_dir = "WorkPoints_P"
-            m_sub_dir = "Set000"
-            m_group = createFolders(str(m_main_dir))
-            m_error_msg = "Could not Create '"
-            m_error_msg += str(m_sub_dir) + "' Objects Group!"
-
-            if WF.verbose():
-                print_msg("Location = " + str(M_LOCATION))
-
-            # Create a sub group if needed
-            if number_of_edges > 1 or M_LOCATION == "Both ends":
-                try:
-                    m_ob = App.ActiveDocument.getObject(
-                        str(m_main_dir)).newObject(
-                        "App::DocumentObjectGroup", str(m_sub_dir))
-                    m_group = m_act_doc.getObject(str(m_ob.Label))
-                except Exception as err:
-                    printError_msg(err.args[0], title=M_MACRO)
-                    printError_msg(m_error_msg)
-
-            if WF.verbose():
-                print_msg("Group = " + str(m_group.Label))
-
-            for i in range(number_of_edges):
-                edge = edge_list[i]
-
-                if M_LOCATION in ["Begin", "Both ends"]:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj1 = makeExtremaLinePointFeature(m_group)
-                    selfobj1.Edge = edge
-                    selfobj1.At = "Begin"
-                    selfobj1.Proxy.execute(selfobj1)
-                    if str(selfobj1.Parametric) == 'Interactive':
-                        selfobj1.Parametric = 'Dynamic'
-                        selfobj1.touch()
-                        selfobj1.Parametric = 'Interactive'
-                    if str(selfobj1.Parametric) == 'Not':
-                        selfobj1.Parametric = 'Dynamic'
-                        selfobj1.touch()
-                        selfobj1.Parametric = 'Not'
-                if M_LOCATION in ["End", "Both ends"]:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj2 = makeExtremaLinePointFeature(m_group)
-                    selfobj2.Edge = edge
-                    selfobj2.At = "End"
-                    selfobj2.Proxy.execute(selfobj2)
-                    if str(selfobj2.Parametric) == 'Interactive':
-                        selfobj2.Parametric = 'Dynamic'
-                        selfobj2.touch()
-                        selfobj2.Parametric = 'Interactive'
-                    if str(selfobj2.Parametric) == 'Not':
-                        selfobj2.Parametric = 'Dynamic'
-                        selfobj2.touch()
-                        selfobj2.Parametric = 'Not'
+            number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+                get_from=edges_from)
+
+            if number_of_edges == 0:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                m_main_dir = "WorkPoints_P"
+                m_sub_dir = "Set000"
+                m_group = createFolders(str(m_main_dir))
+                m_error_msg = "Could not Create '"
+                m_error_msg += str(m_sub_dir) + "' Objects Group!"
+
+                if WF.verbose():
+                    print_msg("Location = " + str(M_LOCATION))
+
+                # Create a sub group if needed
+                if number_of_edges > 1 or M_LOCATION == "Both ends":
+                    try:
+                        m_ob = App.ActiveDocument.getObject(
+                            str(m_main_dir)).newObject(
+                            "App::DocumentObjectGroup", str(m_sub_dir))
+                        m_group = m_act_doc.getObject(str(m_ob.Label))
+                    except Exception as err:
+                        printError_msg(err.args[0], title=M_MACRO)
+                        printError_msg(m_error_msg)
+
+                if WF.verbose():
+                    print_msg("Group = " + str(m_group.Label))
+
+                for i in range(number_of_edges):
+                    edge = edge_list[i]
+
+                    if M_LOCATION in ["Begin", "Both ends"]:
+                        selfobj1 = makeExtremaLinePointFeature(m_group)
+                        with selfobj1.Proxy.batchEdit(selfobj1):
+                            selfobj1.Edge = edge
+                            selfobj1.At = "Begin"
+                        m_builder.add(selfobj1)
+                    if M_LOCATION in ["End", "Both ends"]:
+                        selfobj2 = makeExtremaLinePointFeature(m_group)
+                        with selfobj2.Proxy.batchEdit(selfobj2):
+                            selfobj2.Edge = edge
+                            selfobj2.At = "End"
+                        m_builder.add(selfobj2)
+
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
-
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
-
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
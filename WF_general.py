@@ -30,7 +30,9 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
 
 try:
     from WF_selection import Selection
-    from WF_print import printError_msg, print_msg
+    from WF_print import printError_msg, print_msg, collectErrors
+    from WF_refresh import refreshDocument
+    import WF_perf
 except ImportError:
     print("ERROR: cannot load WF modules !")
     sys.exit(1)
@@ -359,28 +361,72 @@ class CommandShowHideNot:
             return False
 
 
+###############
+M_ICON_NAME_perf = "WF_refresh.svg"
+M_MENU_TEXT_perf = "WF Performance Report"
+M_ACCEL_perf = ""
+M_TOOL_TIP_perf = """Click a first time to start recording the execute
+time of all parametric Objects, then click again to print
+the report on console (and stop recording) !
+"""
+
+
+class CommandPerformanceReport:
+    def GetResources(self):
+        return {'Pixmap': os.path.join(PATH_WF_ICONS, M_ICON_NAME_perf),
+                'MenuText': M_MENU_TEXT_perf,
+                'Accel': M_ACCEL_perf,
+                'ToolTip': M_TOOL_TIP_perf}
+
+    def Activated(self):
+        run_performance_report()
+
+    def IsActive(self):
+        if App.ActiveDocument:
+            return True
+        else:
+            return False
+
+
 if App.GuiUp:
     Gui.addCommand("ShowHideDynamic", CommandShowHideDynamic())
     Gui.addCommand("ShowHideInteractive", CommandShowHideInteractive())
     Gui.addCommand("ShowHideNo", CommandShowHideNot())
     Gui.addCommand("Refresh", CommandRefresh())
+    Gui.addCommand("PerformanceReport", CommandPerformanceReport())
+
+
+@collectErrors("Refresh")
+def run_refresh(force=False):
+    """ Update the Interactive parametric Objects of the active document.
+
+    Objects are recomputed once each, parents first; those whose inputs
+    did not change since the last update are skipped (unless *force*).
+    Return the report of the update.
+    """
+    return refreshDocument(App.ActiveDocument, force)
+
+
+def run_performance_report(top=10):
+    """ Start recording, or print the report and stop recording
+    the execute time of WF parametric Objects.
+    The report is also dumped as JSON next to the active document
+    if it was saved.
+    """
+    if not WF_perf.isEnabled():
+        WF_perf.reset()
+        WF_perf.enable()
+        print_msg("WF Performance recording started !")
+        return None
 
-
-def run_refresh():
-    for obj in App.ActiveDocument.Objects:
-        # print str(obj.Name)
-        # print obj.PropertiesList
-        if "Parametric" in obj.PropertiesList:
-            if WF.verbose():
-                print(str(obj.Name))
-                print(str(obj.Parametric))
-            if str(obj.Parametric) == 'Interactive':
-                obj.Parametric = 'Dynamic'
-                obj.touch()
-                obj.Parametric = 'Interactive'
-
-    if WF.verbose():
-        print_msg("Update done !")
+    WF_perf.disable()
+    WF_perf.printReport(top)
+    m_doc = App.ActiveDocument
+    if m_doc is not None and m_doc.FileName:
+        m_path = os.path.splitext(m_doc.FileName)[0] + "_wf_perf.json"
+        WF_perf.dumpJson(m_path, top)
+        print_msg("WF Performance report saved to " + str(m_path))
+    return WF_perf.report(top)
 
 
 def run_showhide(parametric='Dynamic'):
@@ -15,13 +15,12 @@ Width and Length of the plane in current units.
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Plane
+from WF_Objects_base import WF_Plane, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -40,11 +39,13 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import isEqualVectors, isColinearVectors, meanVectorsPoint, minMaxVectorsLimits, propertiesPlane
+    from WF_links import getLinkSubShape, getLinkPoint
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: cannot load WF modules !")
     sys.exit(1)
@@ -123,8 +124,9 @@ class LinePointPlanePanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                line_point_plane_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    line_point_plane_command()
         return True
 
     def reject(self):
@@ -136,8 +138,7 @@ class LinePointPlanePanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return (len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0)
+        return not hasSelection()
 
 
 def makeLinePointPlaneFeature(group):
@@ -155,7 +156,8 @@ def makeLinePointPlaneFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         LinePointPlane(m_obj)
-        ViewProviderLinePointPlane(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderLinePointPlane(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -219,50 +221,49 @@ class LinePointPlane(WF_Plane):
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             plane = None
             if selfobj.Edge is not None and selfobj.Point is not None:
-                # n1 = eval(selfobj.Point[1][0].lstrip('Vertex'))
-                # n2 = eval(selfobj.Edge[1][0].lstrip('Edge'))
-                m_n1 = re.sub('[^0-9]', '', selfobj.Point[1][0])
-                m_n2 = re.sub('[^0-9]', '', selfobj.Edge[1][0])
-                m_n1 = int(m_n1)
-                m_n2 = int(m_n2)
                 if M_DEBUG:
                     print_msg(str(selfobj.Point))
                     print_msg(str(selfobj.Edge))
-                    print_msg("n1 = " + str(m_n1))
-                    print_msg("n2 = " + str(m_n2))
 
                 points = []
-                point_a = selfobj.Edge[0].Shape.Edges[m_n2 -
-                                                      1].Vertexes[0].Point
-                point_b = selfobj.Edge[0].Shape.Edges[m_n2 -
-                                                      1].Vertexes[-1].Point
-                point_c = selfobj.Point[0].Shape.Vertexes[m_n1 - 1].Point
+                m_edge = getLinkSubShape(selfobj.Edge, 'Edge')
+                point_a = m_edge.Vertexes[0].Point
+                point_b = m_edge.Vertexes[-1].Point
+                point_c = getLinkPoint(selfobj.Point)
+                m_tolerance = WF.tolerance()
 
-                if isEqualVectors(point_a, point_b):
+                if isEqualVectors(point_a, point_b, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 1 and 2 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isEqualVectors(point_a, point_c):
+                if isEqualVectors(point_a, point_c, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 1 an 3 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isEqualVectors(point_b, point_c):
+                if isEqualVectors(point_b, point_c, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 2 an 3 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isColinearVectors(point_a, point_b, point_c):
+                if isColinearVectors(point_a, point_b, point_c,
+                                     m_tolerance):
                     printError_msg(M_EXCEPTION_MSG, title=M_MACRO)
                     return
                 points.append(point_a)
@@ -300,6 +301,7 @@ class LinePointPlane(WF_Plane):
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -322,7 +324,7 @@ class LinePointPlane(WF_Plane):
             propertiesPlane(selfobj.Label, self.color)
 
         if prop == "Extension":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
 
 class ViewProviderLinePointPlane:
@@ -370,60 +372,58 @@ def buildFromPointAndLine(macro, group, vertex, edge, extension):
         print_msg("edge = " + str(edge))
         print_msg("vertex = " + str(vertex))
 
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeLinePointPlaneFeature(group)
-    selfobj.Edge = edge
-    selfobj.Point = vertex
-    selfobj.Extension = extension
-    selfobj.Proxy.execute(selfobj)
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeLinePointPlaneFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Edge = edge
+            selfobj.Point = vertex
+            selfobj.Extension = extension
+        m_bulk.add(selfobj)
 
 
+@collectErrors(M_MACRO)
 def line_point_plane_command():
     """ This command use the selected object(s) to try to build a
     LinePointPlane feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        edges_from = ["Segments", "Curves", "Planes", "Objects"]
+        points_from = ["Points", "Curves", "Objects"]
+        try:
+            number_of_edges, edge_list = m_sel.get_segmentsWithNames(
+                get_from=edges_from)
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
 
-    edges_from = ["Segments", "Curves", "Planes", "Objects"]
-    points_from = ["Points", "Curves", "Objects"]
-    try:
-        number_of_edges, edge_list = m_sel.get_segmentsWithNames(
-            get_from=edges_from)
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
+            if number_of_edges < 1:
+                raise Exception(M_EXCEPTION_MSG)
+            if number_of_vertexes < 1:
+                raise Exception(M_EXCEPTION_MSG)
 
-        if number_of_edges < 1:
-            raise Exception(M_EXCEPTION_MSG)
-        if number_of_vertexes < 1:
-            raise Exception(M_EXCEPTION_MSG)
+            try:
+                m_main_dir = "WorkPlanes_P"
+                m_sub_dir = "Set001"
+                m_group = createFolders(str(m_main_dir))
 
-        try:
-            m_main_dir = "WorkPlanes_P"
-            m_sub_dir = "Set001"
-            m_group = createFolders(str(m_main_dir))
+                # Create a sub group if needed
+                # To develop
 
-            # Create a sub group if needed
-            # To develop
+                # Case of only 1 point and 1 Edge
+                if number_of_edges == 1 and number_of_vertexes == 1:
+                    edge = edge_list[0]
+                    vertex = vertex_list[0]
 
-            # Case of only 1 point and 1 Edge
-            if number_of_edges == 1 and number_of_vertexes == 1:
-                edge = edge_list[0]
-                vertex = vertex_list[0]
+                    buildFromPointAndLine(
+                        M_MACRO, m_group, vertex, edge, M_PLANE_EXT)
+                else:
+                    raise Exception(M_EXCEPTION_MSG)
 
-                buildFromPointAndLine(
-                    M_MACRO, m_group, vertex, edge, M_PLANE_EXT)
-            else:
-                raise Exception(M_EXCEPTION_MSG)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
-
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
-
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
@@ -8,6 +8,14 @@
 Create a "best fit" Line from a set of Points using
 Singular Value Decomposition (SVD).
 
+If all 3 vectors are asked, one single PrincipalAxes object holds the
+3 principal axes and the singular values (the decomposition is
+computed once).
+
+With FitMethod RANSAC, the Line is robust to outliers : it is fitted to
+the inliers only (Points closer than InlierTolerance of the best Line
+found after at most Iterations random Lines), see WF_fit.ransacLine.
+
 How to
 - Select several Points and/or
 - Select several Line/Edge(s) to process 2 ends points and/or
@@ -17,14 +25,13 @@ How to
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from FreeCAD import Base
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Line
+from WF_Objects_base import WF_Object, WF_Line, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -43,12 +50,17 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
-    from WF_directory import createFolders, addObjectToGrp, createSubGroup
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
+    from WF_directory import createFolders, addObjectToGrp
     from WF_geometry import coordVectorPoint, propertiesLine
+    from WF_links import getLinkPoint
+    from WF_fit import fitLine, ransacLine
+    from WF_fit import getRansacIterations, getRansacTolerance
+    from WF_batch import toArray
     from WF_utils import linkSubList_convertToOldStyle
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: Cannot load WF modules !")
     sys.exit(1)
@@ -84,6 +96,8 @@ M_TOOL_TIP = """<b>Create a "best fit" Line</b> from a set of Points using Singu
 ###############
 M_MACRO = "Macro NPointsLine"
 M_SVD_FLAG = False
+M_FIT_METHODS = ["LeastSquares", "RANSAC"]
+M_FIT_METHOD = "LeastSquares"
 ###############
 
 
@@ -97,6 +111,7 @@ def setSvd(flag):
                 Generate only main vector.
                 If True:
                 Generate all 3 vectors from SVD decomposition
+                (into one single PrincipalAxes object)
     """
     global M_SVD_FLAG
     M_SVD_FLAG = flag
@@ -112,6 +127,32 @@ def isSvd():
     return M_SVD_FLAG
 
 
+def setFitMethod(method):
+    """ Set the fit method of new NPointsLine objects.
+
+    Parameters
+    -------
+    *method*    : (String, mandatory)
+                "LeastSquares" : best fit of all Points.
+                "RANSAC" : best fit of the inliers only (robust to
+                outliers).
+    """
+    global M_FIT_METHOD
+    if method not in M_FIT_METHODS:
+        raise ValueError("Unknown fit method : " + str(method))
+    M_FIT_METHOD = method
+
+
+def getFitMethod():
+    """ Get the fit method of new NPointsLine objects.
+
+    Return
+    -------
+    A String
+    """
+    return M_FIT_METHOD
+
+
 class NPointsLinePanel:
     """ The NPointsLinePanel (GUI).
     """
@@ -135,8 +176,9 @@ class NPointsLinePanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                n_points_line_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    n_points_line_command()
         return True
 
     def reject(self):
@@ -148,8 +190,67 @@ class NPointsLinePanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
+
+
+def principalLine(center, singular, axes, index):
+    """ Return the 2 ends of the Line along the principal axis of
+    given index ('1', '2' or '3') of a cloud of points.
+
+    *center*, *singular*, *axes* : as returned by WF_fit.fitLine.
+    """
+    axis_eo = Base.Vector(center[0], center[1], center[2])
+    m_i = int(index) - 1
+    axis_dir = Base.Vector(axes[m_i][0], axes[m_i][1], axes[m_i][2])
+    point1 = axis_eo - axis_dir.normalize().multiply(singular[0] / 2.)
+    point2 = axis_eo + axis_dir.normalize().multiply(singular[m_i] / 2.)
+    return point1, point2
+
+
+def fitPoints(selfobj):
+    """ Return the principal axes (center, singular values, axes)
+    of the Points of a feature (see WF_fit.fitLine).
+    """
+    m_links = linkSubList_convertToOldStyle(selfobj.Points)
+    if M_DEBUG:
+        print_msg(" m_links=" + str(m_links))
+
+    # Only the mean and the 3x3 scatter matrix of the points
+    # are accumulated (by chunks), the thin SVD of the
+    # mean-centered data is then given by the eigenvectors
+    # of the scatter matrix.
+    return fitLine(getLinkPoint(m_link) for m_link in m_links)
+
+
+def ransacPoints(selfobj):
+    """ Return the principal axes (center, singular values, axes) of the
+    inliers of the Points of a NPointsLine and the number of inliers
+    (see WF_fit.ransacLine).
+    The inlier tolerance is never below the WF tolerance.
+    """
+    m_links = linkSubList_convertToOldStyle(selfobj.Points)
+    m_points = toArray([getLinkPoint(m_link) for m_link in m_links])
+    m_tolerance = max(selfobj.InlierTolerance, WF.tolerance())
+    return ransacLine(m_points,
+                      iterations=selfobj.Iterations,
+                      tolerance=m_tolerance)
+
+
+def pointsLinks(selfobj, points_list):
+    """ Return the point links of points_list (selection objects or
+    (object, subelement name)) not referring to selfobj.
+    """
+    s1 = []
+    for o in points_list:
+        if isinstance(o, tuple) or isinstance(o, list):
+            if o[0].Name != selfobj.Name:
+                s1.append(tuple(o))
+        else:
+            for el in o.SubElementNames:
+                if "Point" in el:
+                    if o.Object.Name != selfobj.Name:
+                        s1.append((o.Object, el))
+    return s1
 
 
 def makeNPointsLineFeature(group):
@@ -167,7 +268,8 @@ def makeNPointsLineFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         m_inst = NPointsLine(m_obj)
-        ViewProviderNPointsLine(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderNPointsLine(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -179,6 +281,7 @@ def makeNPointsLineFeature(group):
 class NPointsLine(WF_Line):
     """ The NPointsLine feature object.
     """
+    outputProperties = WF_Line.outputProperties + ["InlierCount"]
 
     def __init__(self, selfobj):
         if M_DEBUG:
@@ -211,6 +314,34 @@ of the Singular Value Decomposition (SVD).
             # Python 2 code in this block
             selfobj.VectorIndex = [v.encode('utf8') for v in ['1', '2', '3']]
             selfobj.VectorIndex = '1'.encode('utf8')
+
+        m_tooltip = """Fit method of the Line :
+LeastSquares : best fit of all Points,
+RANSAC : best fit of the inliers only (robust to outliers).
+"""
+        selfobj.addProperty("App::PropertyEnumeration",
+                            "FitMethod",
+                            self.name,
+                            m_tooltip)
+        selfobj.FitMethod = M_FIT_METHODS
+        selfobj.FitMethod = M_FIT_METHOD
+        selfobj.addProperty("App::PropertyInteger",
+                            "Iterations",
+                            self.name,
+                            "RANSAC : maximum number of random Lines tried"
+                            ).Iterations = getRansacIterations()
+        selfobj.addProperty("App::PropertyFloat",
+                            "InlierTolerance",
+                            self.name,
+                            "RANSAC : maximum distance of an inlier "
+                            "to the Line (at least the WF tolerance)"
+                            ).InlierTolerance = getRansacTolerance()
+        selfobj.addProperty("App::PropertyInteger",
+                            "InlierCount",
+                            self.name,
+                            "Number of Points the Line is fitted to"
+                            ).InlierCount = 0
+        selfobj.setEditorMode("InlierCount", 1)
         selfobj.Proxy = self
         # save the object in the class, to store or retrieve specific data from it
         # from within the class
@@ -238,85 +369,32 @@ of the Singular Value Decomposition (SVD).
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
-        try:
-            import numpy as np
-        except ImportError:
-            m_msg = "You MUST install numpy to use this function !"
-            printError_msg(m_msg, title=M_MACRO)
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
 
         try:
             line = None
-            m_points = []
-            m_x = []
-            m_y = []
-            m_z = []
             if selfobj.Points is not None:
-                for p in linkSubList_convertToOldStyle(selfobj.Points):
-                    # n = eval(p[1].lstrip('Vertex'))
-                    m_n = re.sub('[^0-9]', '', p[1])
-                    m_n = int(m_n)
-                    if M_DEBUG:
-                        print("p " + str(p))
-                        print_msg("m_n = " + str(m_n))
-
-                    m_point = p[0].Shape.Vertexes[m_n - 1].Point
-                    m_points.append(m_point)
-                    m_x.append(m_point.x)
-                    m_y.append(m_point.y)
-                    m_z.append(m_point.z)
-
-                m_np_x = np.asfarray(m_x)
-                m_np_y = np.asfarray(m_y)
-                m_np_z = np.asfarray(m_z)
-                if M_DEBUG:
-                    print_msg(" m_np_x=" + str(m_np_x))
-                    print_msg(" m_np_y=" + str(m_np_y))
-                    print_msg(" m_np_z=" + str(m_np_z))
-
-                m_data = np.concatenate((m_np_x[:, np.newaxis],
-                                         m_np_y[:, np.newaxis],
-                                         m_np_z[:, np.newaxis]),
-                                        axis=1)
-                if M_DEBUG:
-                    print_msg(" m_data=" + str(m_data))
-
-                # Calculate the mean of the points, i.e. the 'center' of the
-                # cloud
-                m_data_mean = m_data.mean(axis=0)
-                axis_eo = Base.Vector(
-                    m_data_mean[0], m_data_mean[1], m_data_mean[2])
-
-                # Do an SVD on the mean-centered data.
-                m_uu, m_dd, m_vv = np.linalg.svd(m_data - m_data_mean)
+                # To be compatible with previous version
+                if 'FitMethod' in selfobj.PropertiesList and \
+                        selfobj.FitMethod == "RANSAC":
+                    m_center, m_dd, m_vv, m_count = ransacPoints(selfobj)
+                else:
+                    m_center, m_dd, m_vv = fitPoints(selfobj)
+                    m_count = len(linkSubList_convertToOldStyle(
+                        selfobj.Points))
                 if M_DEBUG:
-                    print_msg(" m_uu=" + str(m_uu))
+                    print_msg(" m_center=" + str(m_center))
                     print_msg(" m_dd=" + str(m_dd))
                     print_msg(" m_vv=" + str(m_vv))
 
                 # Now vv[0] contains the first principal component, i.e. the direction
                 # vector of the 'best fit' line in the least squares sense.
-                axis_dir = Base.Vector(m_vv[0][0], m_vv[0][1], m_vv[0][2])
-                point1 = axis_eo - axis_dir.normalize().multiply(m_dd[0] / 2.)
-
-                if selfobj.VectorIndex == '1':
-                    point2 = axis_eo + \
-                        axis_dir.normalize().multiply(m_dd[0] / 2.)
-
-                if selfobj.VectorIndex == '2':
-                    axis_dir = Base.Vector(m_vv[1][0], m_vv[1][1], m_vv[1][2])
-                    point1 = axis_eo - \
-                        axis_dir.normalize().multiply(m_dd[0] / 2.)
-                    point2 = axis_eo + \
-                        axis_dir.normalize().multiply(m_dd[1] / 2.)
-                    # point2 = axis_eo + axis_dir
-
-                if selfobj.VectorIndex == '3':
-                    axis_dir = Base.Vector(m_vv[2][0], m_vv[2][1], m_vv[2][2])
-                    point1 = axis_eo - \
-                        axis_dir.normalize().multiply(m_dd[0] / 2.)
-                    point2 = axis_eo + \
-                        axis_dir.normalize().multiply(m_dd[2] / 2.)
-                    # point2 = axis_eo + axis_dir
+                point1, point2 = principalLine(m_center, m_dd, m_vv,
+                                               selfobj.VectorIndex)
 
                 line = Part.makeLine(coordVectorPoint(point1),
                                      coordVectorPoint(point2))
@@ -329,9 +407,12 @@ of the Singular Value Decomposition (SVD).
                 selfobj.Point2_X = float(point2.x)
                 selfobj.Point2_Y = float(point2.y)
                 selfobj.Point2_Z = float(point2.z)
+                if 'InlierCount' in selfobj.PropertiesList:
+                    selfobj.InlierCount = int(m_count)
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -354,30 +435,160 @@ of the Singular Value Decomposition (SVD).
                     pass
             propertiesLine(selfobj.Label, self.color)
 
-        if prop == "Points":
-            selfobj.Proxy.execute(selfobj)
+        if prop in ["Points", "FitMethod", "Iterations", "InlierTolerance"]:
+            selfobj.Proxy.requestExecute(selfobj)
 
     def addSubobjects(self, selfobj, points_list=[]):
         """ Adds pointlinks to this NPointsLine object
         """
-        objs = selfobj.Points
-        if points_list:
-            s1 = []
-            for o in points_list:
-                if isinstance(o, tuple) or isinstance(o, list):
-                    if o[0].Name != selfobj.Name:
-                        s1.append(tuple(o))
-                else:
-                    for el in o.SubElementNames:
-                        if "Point" in el:
-                            if o.Object.Name != selfobj.Name:
-                                s1.append((o.Object, el))
-        selfobj.Points = list(s1)
+        selfobj.Points = pointsLinks(selfobj, points_list)
 
-        selfobj.Proxy.execute(selfobj)
+        selfobj.Proxy.requestExecute(selfobj)
         # self.execute(selfobj)
 
 
+def makePrincipalAxesFeature(group):
+    """ Makes a PrincipalAxes parametric feature object.
+    into the given Group
+    Returns the new object.
+    """
+    m_name = "PrincipalAxes_P"
+    m_part = "Part::FeaturePython"
+
+    if group is None:
+        return None
+    try:
+        m_obj = App.ActiveDocument.addObject(str(m_part), str(m_name))
+        if group is not None:
+            addObjectToGrp(m_obj, group, info=1)
+        m_inst = PrincipalAxes(m_obj)
+        if App.GuiUp:
+            ViewProviderNPointsLine(m_obj.ViewObject)
+    except Exception as err:
+        printError_msg("Not able to add an object to Model!")
+        printError_msg(err.args[0], title=M_MACRO)
+        return None
+
+    return m_obj, m_inst
+
+
+class PrincipalAxes(WF_Object):
+    """ The PrincipalAxes feature object : the 3 principal axes
+    of a set of Points as 3 Lines, from one single decomposition.
+    """
+    outputProperties = ["Center", "Axis1", "Axis2", "Axis3",
+                        "SingularValues"]
+
+    def __init__(self, selfobj):
+        if M_DEBUG:
+            print("running PrincipalAxes.__init__ !")
+
+        self.name = "PrincipalAxes"
+        WF_Object.__init__(self, selfobj)
+        selfobj.addProperty("App::PropertyLinkSubList",
+                            "Points",
+                            self.name,
+                            "List of Points")
+        selfobj.Points = []
+        selfobj.addProperty("App::PropertyVector",
+                            "Center",
+                            self.name,
+                            "Mean of the points")
+        selfobj.addProperty("App::PropertyVector",
+                            "Axis1",
+                            self.name,
+                            "First principal axis (best fit line)")
+        selfobj.addProperty("App::PropertyVector",
+                            "Axis2",
+                            self.name,
+                            "Second principal axis")
+        selfobj.addProperty("App::PropertyVector",
+                            "Axis3",
+                            self.name,
+                            "Third principal axis (best fit plane normal)")
+        selfobj.addProperty("App::PropertyFloatList",
+                            "SingularValues",
+                            self.name,
+                            "Singular values of the 3 axes")
+
+        for m_property in ["Points", "Center", "Axis1", "Axis2", "Axis3",
+                           "SingularValues"]:
+            selfobj.setEditorMode(m_property, 1)
+        selfobj.Proxy = self
+
+    def execute(self, selfobj):
+        """ Doing a recomputation.
+        """
+        if 'Points' not in selfobj.PropertiesList:
+            return
+
+        if M_DEBUG:
+            print("running PrincipalAxes.execute !")
+
+        # Create the object the first time regardless
+        # the parametric behavior
+        if selfobj.Parametric == 'Not' and self.created:
+            return
+        if selfobj.Parametric == 'Interactive' and self.created:
+            return
+
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
+        try:
+            if not selfobj.Points:
+                return
+            m_center, m_dd, m_vv = fitPoints(selfobj)
+            m_lines = []
+            for m_index in ['1', '2', '3']:
+                point1, point2 = principalLine(m_center, m_dd, m_vv, m_index)
+                m_lines.append(Part.makeLine(coordVectorPoint(point1),
+                                             coordVectorPoint(point2)))
+
+            selfobj.Shape = Part.makeCompound(m_lines)
+            propertiesLine(selfobj.Label, self.color)
+            selfobj.Center = Base.Vector(m_center[0], m_center[1],
+                                         m_center[2])
+            selfobj.Axis1 = Base.Vector(m_vv[0][0], m_vv[0][1], m_vv[0][2])
+            selfobj.Axis2 = Base.Vector(m_vv[1][0], m_vv[1][1], m_vv[1][2])
+            selfobj.Axis3 = Base.Vector(m_vv[2][0], m_vv[2][1], m_vv[2][2])
+            selfobj.SingularValues = [float(m_d) for m_d in m_dd]
+            self.created = True
+            self.storeResult(selfobj)
+        except AttributeError as err:
+            print("AttributeError" + str(err))
+        except Exception as err:
+            printError_msg(err.args[0], title=M_MACRO)
+
+    def onChanged(self, selfobj, prop):
+        """ Run when a proterty change.
+        """
+        if M_DEBUG:
+            print("running PrincipalAxes.onChanged !")
+            print("Change property : " + str(prop))
+
+        WF_Object.onChanged(self, selfobj, prop)
+
+        if prop == "Parametric":
+            propertiesLine(selfobj.Label, self.color)
+
+        if prop == "Points":
+            selfobj.Proxy.requestExecute(selfobj)
+
+    def addSubobjects(self, selfobj, points_list=[]):
+        """ Adds pointlinks to this PrincipalAxes object
+        """
+        selfobj.Points = pointsLinks(selfobj, points_list)
+
+        selfobj.Proxy.requestExecute(selfobj)
+
+    def viewProperties(self, selfobj):
+        propertiesLine(selfobj.Label, self.color)
+
+
 class ViewProviderNPointsLine:
     icon = M_ICON_NAME
 
@@ -415,98 +626,57 @@ class ViewProviderNPointsLine:
         self.icon = icon
 
 
+@collectErrors(M_MACRO)
 def n_points_line_command():
     """ This command use the selected object(s) to try to build a
     NPointsLine feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
-
-    points_from = ["Points", "Curves", "Objects"]
-    try:
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
-
-        if number_of_vertexes < 2:
-            raise Exception(M_EXCEPTION_MSG)
-
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Curves", "Objects"]
         try:
-            m_main_dir = "WorkAxis_P"
-            m_sub_dir = "Set000"
-            m_group = createFolders(str(m_main_dir))
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
 
-            # Create a sub group if needed
-            if M_SVD_FLAG:
-                m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
+            if number_of_vertexes < 2:
+                raise Exception(M_EXCEPTION_MSG)
 
-            points = []
-            # Case of only 2 points
-            if number_of_vertexes == 2:
-                if WF.verbose():
-                    print_msg("Process only 2 points")
-                vertex1 = vertex_list[0]
-                vertex2 = vertex_list[1]
-                points.append(vertex1)
-                points.append(vertex2)
+            try:
+                m_main_dir = "WorkAxis_P"
+                m_group = createFolders(str(m_main_dir))
 
                 if WF.verbose():
-                    print_msg("vertex1 = " + str(vertex1))
-                    print_msg("vertex2 = " + str(vertex2))
-
-                App.ActiveDocument.openTransaction(M_MACRO)
-                selfobj, m_inst = makeNPointsLineFeature(m_group)
-                m_inst.addSubobjects(selfobj, points)
-                selfobj.VectorIndex = '1'
-                selfobj.Proxy.execute(selfobj)
+                    if number_of_vertexes == 2:
+                        print_msg("Process only 2 points")
+                    else:
+                        print_msg("Process more than 2 points")
 
-                if M_SVD_FLAG:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj, m_inst = makeNPointsLineFeature(m_group)
-                    m_inst.addSubobjects(selfobj, points)
-                    selfobj.VectorIndex = '2'
-                    selfobj.Proxy.execute(selfobj)
-
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj, m_inst = makeNPointsLineFeature(m_group)
-                    m_inst.addSubobjects(selfobj, points)
-                    selfobj.VectorIndex = '3'
-                    selfobj.Proxy.execute(selfobj)
-            # Case of more than 2 points
-            else:
-                if WF.verbose():
-                    print_msg("Process more than 2 points")
+                points = []
                 for i in range(number_of_vertexes):
                     vertex = vertex_list[i]
                     points.append(vertex)
                     if WF.verbose():
                         print_msg("vertex = " + str(vertex))
 
-                App.ActiveDocument.openTransaction(M_MACRO)
-                selfobj, m_inst = makeNPointsLineFeature(m_group)
-                m_inst.addSubobjects(selfobj, points)
-                selfobj.VectorIndex = '1'
-                selfobj.Proxy.execute(selfobj)
-
+                # All 3 vectors from one single decomposition
                 if M_SVD_FLAG:
-                    App.ActiveDocument.openTransaction(M_MACRO)
+                    selfobj, m_inst = makePrincipalAxesFeature(m_group)
+                    with selfobj.Proxy.batchEdit(selfobj):
+                        m_inst.addSubobjects(selfobj, points)
+                    m_builder.add(selfobj)
+                else:
                     selfobj, m_inst = makeNPointsLineFeature(m_group)
-                    m_inst.addSubobjects(selfobj, points)
-                    selfobj.VectorIndex = '2'
-                    selfobj.Proxy.execute(selfobj)
+                    with selfobj.Proxy.batchEdit(selfobj):
+                        m_inst.addSubobjects(selfobj, points)
+                        selfobj.VectorIndex = '1'
+                        selfobj.FitMethod = M_FIT_METHOD
+                    m_builder.add(selfobj)
 
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj, m_inst = makeNPointsLineFeature(m_group)
-                    m_inst.addSubobjects(selfobj, points)
-                    selfobj.VectorIndex = '3'
-                    selfobj.Proxy.execute(selfobj)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
-
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
-
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
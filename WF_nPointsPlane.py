@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Create a "best fit" Plane from a set of Points.
+
+The Plane is fitted in the least squares sense : the covariance matrix of
+the Points is accumulated by chunks (see WF_fit.fitPlane), so very large
+selections and clouds of points can be processed.
+The RMS and maximum distances of the Points to the Plane are reported.
+
+Extension :  (100 by default)
+Width and Length of the plane in current units.
+
+How to
+- Select at least three Points and/or
+- Select several Line/Edge(s) to process 2 ends points and/or
+- Select one or several Object(s) to process all Points at once;
+- Then Click on the icon
+"""
+import sys
+import os.path
+import FreeCAD as App
+import Part
+from FreeCAD import Base
+from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
+import WF
+from WF_Objects_base import WF_Plane, isExecuteSuspended
+from WF_nPointsLine import pointsLinks
+
+if App.GuiUp:
+    import FreeCADGui as Gui
+
+__title__ = "Macro NPointsPlane"
+__author__ = "Rentlau_64"
+__brief__ = '''
+Macro NPointsPlane.
+Creates a parametric NPointsPlane from a list of Points
+'''
+###############
+M_DEBUG = False
+###############
+if not sys.path.__contains__(str(PATH_WF_UTILS)):
+    sys.path.append(str(PATH_WF_UTILS))
+    sys.path.append(str(PATH_WF_UI))
+
+try:
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
+    from WF_directory import createFolders, addObjectToGrp
+    from WF_geometry import propertiesPlane
+    from WF_links import getLinkPoint
+    from WF_fit import fitPlane, maxPlaneDeviation
+    from WF_utils import linkSubList_convertToOldStyle
+    from WF_command import Command
+    from WF_bulk import BulkBuilder
+except ImportError:
+    print("ERROR: cannot load WF modules !")
+    sys.exit(1)
+
+###############
+M_ICON_NAME = "WF_nPointsPlane.svg"
+M_DIALOG = "WF_UI_threePointsPlane.ui"
+M_DIALOG_TITLE = "Define extension of the plane."
+M_EXCEPTION_MSG = """
+Unable to create Plane from N Points :
+- Select at least three Points (not aligned) and/or
+- Select several Line/Edge(s) to process 2 ends points and/or
+- Select one or several Object(s) to process all Points at once;
+
+Go to Parameter(s) Window in Task Panel!"""
+M_RESULT_MSG = " : Plane from N Points created !"
+M_MENU_TEXT = "Plane = Fit(Points)"
+M_ACCEL = ""
+M_TOOL_TIP = """<b>Create a "best fit" Plane</b> from a set of Points.<br>
+<br>
+Extension :  (100 by default)<br>
+Width and Length of the plane in current units.<br>
+<br>
+<br>
+- Select at least three Points and/or<br>
+- Select several Line/Edge(s) to process 2 ends points and/or<br>
+- Select one Object to process all Points at once;<br>
+- Then Click on the Button/Icon<br>
+<br>
+<i>Click in view window without selection will popup<br>
+ - a Warning Window and<br>
+ - a Parameter(s) Window in Task Panel!</i>
+"""
+###############
+M_MACRO = "Macro NPointsPlane"
+M_PLANE_EXT = 100.0
+###############
+
+
+def setPlaneExtension(ext):
+    """ Set Extension of the plane.
+
+    Parameters
+    -------
+    *ext*       : (Float, Mandatory)
+                Distance for the extensions.
+    """
+    global M_PLANE_EXT
+    M_PLANE_EXT = float(ext)
+
+
+def getExtension():
+    """ Get Extension of plane.
+
+    Return
+    -------
+    A Float.
+    """
+    return M_PLANE_EXT
+
+
+class NPointsPlanePanel:
+    """ The NPointsPlanePanel (GUI).
+    """
+
+    def __init__(self):
+        self.form = Gui.PySideUic.loadUi(os.path.join(PATH_WF_UI, M_DIALOG))
+        self.form.setWindowTitle(M_DIALOG_TITLE)
+        self.form.UI_Plane_extension.setText(str(M_PLANE_EXT))
+
+    def accept(self):
+        """ Run when click on OK button.
+        """
+        global M_PLANE_EXT
+        M_PLANE_EXT = float(self.form.UI_Plane_extension.text())
+
+        if WF.verbose():
+            print_msg("M_PLANE_EXT = " + str(M_PLANE_EXT))
+
+        Gui.Control.closeDialog()
+        m_act_doc = App.activeDocument()
+        if m_act_doc is not None:
+            with SelectionSnapshot():
+                if hasSelection():
+                    n_points_plane_command()
+        return True
+
+    def reject(self):
+        """ Run when click on CANCEL button.
+        """
+        Gui.Control.closeDialog()
+        return False
+
+    def shouldShow(self):
+        """ Must show when nothing selected.
+        """
+        return not hasSelection()
+
+
+def makeNPointsPlaneFeature(group):
+    """ Makes a NPointsPlane parametric feature object.
+    into the given Group
+    Returns the new object.
+    """
+    m_name = "NPointsPlane_P"
+    m_part = "Part::FeaturePython"
+
+    if group is None:
+        return None
+    try:
+        m_obj = App.ActiveDocument.addObject(str(m_part), str(m_name))
+        if group is not None:
+            addObjectToGrp(m_obj, group, info=1)
+        NPointsPlane(m_obj)
+        if App.GuiUp:
+            ViewProviderNPointsPlane(m_obj.ViewObject)
+    except Exception as err:
+        printError_msg("Not able to add an object to Model!")
+        printError_msg(err.args[0], title=M_MACRO)
+        return None
+
+    return m_obj
+
+
+class NPointsPlane(WF_Plane):
+    """ The NPointsPlane feature object.
+    """
+    outputProperties = WF_Plane.outputProperties + ["RMSDeviation",
+                                                    "MaxDeviation"]
+
+    def __init__(self, selfobj):
+        if M_DEBUG:
+            print("running NPointsPlane.__init__ !")
+
+        self.name = "NPointsPlane"
+        WF_Plane.__init__(self, selfobj, self.name)
+        """ Add some custom properties to our NPointsPlane feature object. """
+        selfobj.addProperty("App::PropertyLinkSubList",
+                            "Points",
+                            self.name,
+                            "List of Points")
+        selfobj.Points = []
+
+        m_tooltip = """Width and Length of the plane in current units."""
+        selfobj.addProperty("App::PropertyFloat",
+                            "Extension",
+                            self.name,
+                            m_tooltip).Extension = M_PLANE_EXT
+        selfobj.addProperty("App::PropertyFloat",
+                            "RMSDeviation",
+                            self.name,
+                            "Root mean square distance of the Points "
+                            "to the Plane").RMSDeviation = 0.0
+        selfobj.addProperty("App::PropertyFloat",
+                            "MaxDeviation",
+                            self.name,
+                            "Maximum distance of the Points "
+                            "to the Plane").MaxDeviation = 0.0
+        # 0 -- default mode, read and write
+        # 1 -- read-only
+        # 2 -- hidden
+        selfobj.setEditorMode("Points", 1)
+        selfobj.setEditorMode("RMSDeviation", 1)
+        selfobj.setEditorMode("MaxDeviation", 1)
+
+        selfobj.Proxy = self
+
+    def execute(self, selfobj):
+        """ Doing a recomputation.
+        """
+        m_properties_list = ['Points',
+                             'Extension'
+                             ]
+        for m_property in m_properties_list:
+            if m_property not in selfobj.PropertiesList:
+                return
+
+        if M_DEBUG:
+            print("running NPointsPlane.execute !")
+
+        # Create the object the first time regardless
+        # the parametric behavior
+        if selfobj.Parametric == 'Not' and self.created:
+            return
+        if selfobj.Parametric == 'Interactive' and self.created:
+            return
+
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
+        try:
+            m_links = linkSubList_convertToOldStyle(selfobj.Points)
+            if len(m_links) < 3:
+                printError_msg(M_EXCEPTION_MSG, title=M_MACRO)
+                return
+
+            # Only the mean and the 3x3 covariance matrix of the points
+            # are accumulated (by chunks)
+            m_center, m_dd, m_vv, m_rms = fitPlane(
+                getLinkPoint(m_link) for m_link in m_links)
+            if M_DEBUG:
+                print_msg(" m_center=" + str(m_center))
+                print_msg(" m_dd=" + str(m_dd))
+                print_msg(" m_vv=" + str(m_vv))
+
+            # All points aligned (or equal) : no Plane
+            if m_dd[1] <= WF.tolerance():
+                printError_msg(M_EXCEPTION_MSG, title=M_MACRO)
+                return
+
+            m_max = maxPlaneDeviation(
+                (getLinkPoint(m_link) for m_link in m_links),
+                m_center, m_vv[2])
+
+            plane_point = Base.Vector(m_center[0], m_center[1], m_center[2])
+            plane_normal = Base.Vector(m_vv[2][0], m_vv[2][1], m_vv[2][2])
+            edge_length = selfobj.Extension
+            plane = Part.makePlane(edge_length,
+                                   edge_length,
+                                   plane_point,
+                                   plane_normal)
+            plane_center = plane.CenterOfMass
+            plane_translate = plane_point - plane_center
+            plane.translate(plane_translate)
+
+            # 3 points of the Plane : the center and one point
+            # along each axis of the Plane
+            point_a = plane_point
+            point_b = plane_point + \
+                Base.Vector(m_vv[0][0], m_vv[0][1], m_vv[0][2])
+            point_c = plane_point + \
+                Base.Vector(m_vv[1][0], m_vv[1][1], m_vv[1][2])
+
+            selfobj.Shape = plane
+            propertiesPlane(selfobj.Label, self.color)
+            selfobj.Point1_X = float(point_a.x)
+            selfobj.Point1_Y = float(point_a.y)
+            selfobj.Point1_Z = float(point_a.z)
+            selfobj.Point2_X = float(point_b.x)
+            selfobj.Point2_Y = float(point_b.y)
+            selfobj.Point2_Z = float(point_b.z)
+            selfobj.Point3_X = float(point_c.x)
+            selfobj.Point3_Y = float(point_c.y)
+            selfobj.Point3_Z = float(point_c.z)
+            selfobj.RMSDeviation = float(m_rms)
+            selfobj.MaxDeviation = float(m_max)
+            self.created = True
+            self.storeResult(selfobj)
+        except AttributeError as err:
+            print("AttributeError" + str(err))
+        except Exception as err:
+            printError_msg(err.args[0], title=M_MACRO)
+
+    def onChanged(self, selfobj, prop):
+        """ Run when a proterty change.
+        """
+        if M_DEBUG:
+            print("running NPointsPlane.onChanged !")
+            print("Change property : " + str(prop))
+
+        WF_Plane.onChanged(self, selfobj, prop)
+
+        if prop == "Parametric":
+            if 'Parametric' in selfobj.PropertiesList:
+                if selfobj.Parametric == 'Not':
+                    selfobj.setEditorMode("Extension", 1)
+                else:
+                    selfobj.setEditorMode("Extension", 0)
+            propertiesPlane(selfobj.Label, self.color)
+
+        if prop in ["Points", "Extension"]:
+            selfobj.Proxy.requestExecute(selfobj)
+
+    def addSubobjects(self, selfobj, points_list=[]):
+        """ Adds pointlinks to this NPointsPlane object
+        """
+        selfobj.Points = pointsLinks(selfobj, points_list)
+
+        selfobj.Proxy.requestExecute(selfobj)
+
+
+class ViewProviderNPointsPlane:
+    icon = M_ICON_NAME
+
+    def __init__(self, vobj):
+        """ Set this object to the proxy object of the actual view provider """
+        vobj.Proxy = self
+
+    # this method is mandatory
+    def attach(self, vobj):
+        self.ViewObject = vobj
+        self.Object = vobj.Object
+
+    def setEdit(self, vobj, mode):
+        return False
+
+    def unsetEdit(self, vobj, mode):
+        return
+
+    def __getstate__(self):
+        return None
+
+    def __setstate__(self, state):
+        return None
+
+    # subelements is a tuple of strings
+    def onDelete(self, feature, subelements):
+        return True
+
+    # This method is optional and if not defined a default icon is shown.
+    def getIcon(self):
+        """ Return the icon which will appear in the tree view. """
+        return os.path.join(PATH_WF_ICONS, self.icon)
+
+    def setIcon(self, icon=M_ICON_NAME):
+        self.icon = icon
+
+
+@collectErrors(M_MACRO)
+def n_points_plane_command():
+    """ This command use the selected object(s) to try to build a
+    NPointsPlane feature object.
+    """
+    m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Curves", "Objects"]
+        try:
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
+
+            if number_of_vertexes < 3:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                m_main_dir = "WorkPlanes_P"
+                m_group = createFolders(str(m_main_dir))
+
+                if WF.verbose():
+                    print_msg("Process " + str(number_of_vertexes) + " points")
+
+                selfobj = makeNPointsPlaneFeature(m_group)
+                with selfobj.Proxy.batchEdit(selfobj):
+                    selfobj.Proxy.addSubobjects(selfobj, vertex_list)
+                    selfobj.Extension = M_PLANE_EXT
+                m_builder.add(selfobj)
+
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
+
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
+
+
+if App.GuiUp:
+    Gui.addCommand("NPointsPlane", Command(M_ICON_NAME,
+                                           M_MENU_TEXT,
+                                           M_ACCEL,
+                                           M_TOOL_TIP,
+                                           NPointsPlanePanel,
+                                           n_points_plane_command))
+
+if __name__ == '__main__':
+    n_points_plane_command()
@@ -16,13 +16,12 @@ How to
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from PySide import QtGui, QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -41,12 +40,14 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import meanVectorsPoint, propertiesPoint
+    from WF_links import getLinkPoint
     from WF_utils import linkSubList_convertToOldStyle
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: Cannot load WF modules !")
     sys.exit(1)
@@ -98,8 +99,9 @@ class NPointsPointPanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                n_points_point_comand()
+            with SelectionSnapshot():
+                if hasSelection():
+                    n_points_point_comand()
         return True
 
     def reject(self):
@@ -111,8 +113,7 @@ class NPointsPointPanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
 
 
 def makeNPointsPointFeature(group):
@@ -130,7 +131,8 @@ def makeNPointsPointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         m_inst = NPointsPoint(m_obj)
-        ViewProviderNPointsPoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderNPointsPoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -183,19 +185,21 @@ class NPointsPoint(WF_Point):
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             vector_point = None
             if selfobj.Points is not None:
                 m_points = []
                 for p in linkSubList_convertToOldStyle(selfobj.Points):
-                    # n = eval(p[1].lstrip('Vertex'))
-                    m_n = re.sub('[^0-9]', '', p[1])
-                    m_n = int(m_n)
                     if M_DEBUG:
                         print("p " + str(p))
-                        print_msg("m_n = " + str(m_n))
 
-                    m_points.append(p[0].Shape.Vertexes[m_n - 1].Point)
+                    m_points.append(getLinkPoint(p))
 
             vector_point = meanVectorsPoint(m_points)
 
@@ -209,6 +213,7 @@ class NPointsPoint(WF_Point):
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -236,7 +241,7 @@ class NPointsPoint(WF_Point):
             propertiesPoint(selfobj.Label, self.color)
 
         if prop == "Points":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
     def addSubobjects(self, selfobj, points_list=[]):
         """ Add pointlinks to this TwoPointsLine object
@@ -255,7 +260,7 @@ class NPointsPoint(WF_Point):
                                 s1.append((o.Object, el))
         selfobj.Points = list(s1)
 
-        selfobj.Proxy.execute(selfobj)
+        selfobj.Proxy.requestExecute(selfobj)
         # self.execute(selfobj)
 
 
@@ -301,59 +306,57 @@ def buildFromPoints(macro, group, vertexes):
     """
     if WF.verbose():
         print_msg("vertexes = " + str(vertexes))
-    App.ActiveDocument.openTransaction(macro)
-    selfobj, m_inst = makeNPointsPointFeature(group)
-    m_inst.addSubobjects(selfobj, vertexes)
-    selfobj.Proxy.execute(selfobj)
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj, m_inst = makeNPointsPointFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            m_inst.addSubobjects(selfobj, vertexes)
+        m_bulk.add(selfobj)
 
 
+@collectErrors(M_MACRO)
 def n_points_point_comand():
     m_sel, _ = getSel(WF.verbose())
-
-    points_from = ["Points", "Curves", "Planes", "Shells", "Objects"]
-    try:
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
-
-        if number_of_vertexes < 2:
-            raise Exception(M_EXCEPTION_MSG)
-
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Curves", "Planes", "Shells", "Objects"]
         try:
-            m_main_dir = "WorkPoints_P"
-            m_sub_dir = "Set001"
-            m_group = createFolders(str(m_main_dir))
-
-            points = []
-            # Case of only 2 points
-            if number_of_vertexes == 2:
-                if WF.verbose():
-                    print_msg("Process only 2 points")
-                vertex1 = vertex_list[0]
-                vertex2 = vertex_list[1]
-                points.append(vertex1)
-                points.append(vertex2)
-
-                buildFromPoints(M_MACRO, m_group, points)
-
-            # Case of more than 2 points
-            else:
-                if WF.verbose():
-                    print_msg("Process more than 2 points")
-                for i in range(number_of_vertexes):
-                    vertex1 = vertex_list[i]
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
+
+            if number_of_vertexes < 2:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                m_main_dir = "WorkPoints_P"
+                m_sub_dir = "Set001"
+                m_group = createFolders(str(m_main_dir))
+
+                points = []
+                # Case of only 2 points
+                if number_of_vertexes == 2:
+                    if WF.verbose():
+                        print_msg("Process only 2 points")
+                    vertex1 = vertex_list[0]
+                    vertex2 = vertex_list[1]
                     points.append(vertex1)
+                    points.append(vertex2)
 
-                buildFromPoints(M_MACRO, m_group, points)
+                    buildFromPoints(M_MACRO, m_group, points)
 
-        except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
+                # Case of more than 2 points
+                else:
+                    if WF.verbose():
+                        print_msg("Process more than 2 points")
+                    for i in range(number_of_vertexes):
+                        vertex1 = vertex_list[i]
+                        points.append(vertex1)
 
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
+                    buildFromPoints(M_MACRO, m_group, points)
+
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+PointArray : N Points stored into one single parametric feature.
+
+Point commands processing many entities at once (i.e. CenterLinePoint
+on many Edges or AlongLinePoint on one Edge and many Points) can create
+one PointArray in place of N Point features (see setOutputArray of these
+commands). ProjectedPoint does the same for many Points projected on
+one plane, and WireStationsPoint always outputs the stations along
+Wires as one PointArray.
+The points are computed by a generator function of the command module
+(see M_GENERATORS), from the inputs of the feature (Edges, Points and
+the parameters added by the command).
+The result is one compound of Vertexes and the packed coordinates
+(x0, y0, z0, x1, y1, z1, ...) of the points.
+"""
+import sys
+import os.path
+import importlib
+import numpy as np
+import FreeCAD as App
+import Part
+from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
+import WF
+from WF_Objects_base import WF_Object, isExecuteSuspended
+
+if App.GuiUp:
+    import FreeCADGui as Gui
+
+__title__ = "Macro PointArray"
+__author__ = "Rentlau_64"
+__brief__ = '''
+Macro PointArray.
+Creates a parametric PointArray holding many points.
+'''
+###############
+M_DEBUG = False
+###############
+if not sys.path.__contains__(str(PATH_WF_UTILS)):
+    sys.path.append(str(PATH_WF_UTILS))
+    sys.path.append(str(PATH_WF_UI))
+
+try:
+    from WF_print import printError_msg, print_msg
+    from WF_directory import addObjectToGrp
+    from WF_geometry import propertiesPoint
+except ImportError:
+    print("ERROR: Cannot load WF modules !")
+    sys.exit(1)
+
+###############
+M_ICON_NAME = "WF_point.svg"
+M_MACRO = "Macro PointArray"
+# Generator name -> (module, function, icon)
+# The function returns the (N,3) array of points of the feature.
+M_GENERATORS = {
+    "CenterLinePoint": ("WF_centerLinePoint",
+                        "centerLinePointArray",
+                        "WF_centerLinePoint.svg"),
+    "AlongLinePoint": ("WF_alongLinePoint",
+                       "alongLinePointArray",
+                       "WF_alongLinePoint.svg"),
+    "ProjectedPoint": ("WF_projectedPoint",
+                       "projectedPointArray",
+                       "WF_projectedPoint.svg"),
+    "WireStationsPoint": ("WF_wireStationsPoint",
+                          "wireStationsPointArray",
+                          "WF_wireStationsPoint.svg"),
+}
+###############
+
+
+def getGenerator(name):
+    """ Returns the generator function of the given name.
+    """
+    m_module, m_function, _ = M_GENERATORS[name]
+    return getattr(importlib.import_module(m_module), m_function)
+
+
+def getPoints(selfobj):
+    """ Returns the points of a PointArray as a (N,3) array
+    (from its packed coordinates).
+    """
+    return np.array(selfobj.Coordinates, dtype=float).reshape(-1, 3)
+
+
+def makePointArrayFeature(group, generator):
+    """ Makes a PointArray parametric feature object
+    into the given Group, using the given generator.
+    Returns the new object.
+    """
+    m_name = "PointArray_P"
+    m_part = "Part::FeaturePython"
+
+    if group is None:
+        return None
+    try:
+        m_obj = App.ActiveDocument.addObject(str(m_part), str(m_name))
+        if group is not None:
+            addObjectToGrp(m_obj, group, info=1)
+        PointArray(m_obj, generator)
+        if App.GuiUp:
+            ViewProviderPointArray(m_obj.ViewObject)
+    except Exception as err:
+        printError_msg("Not able to add an object to Model!")
+        printError_msg(err.args[0], title=M_MACRO)
+        return None
+
+    return m_obj
+
+
+class PointArray(WF_Object):
+    """ The PointArray feature object.
+    """
+    outputProperties = ["Coordinates", "NumberOfPoints"]
+
+    def __init__(self, selfobj, generator):
+        if M_DEBUG:
+            print("running PointArray.__init__ !")
+
+        self.name = "PointArray"
+        WF_Object.__init__(self, selfobj)
+        selfobj.addProperty("App::PropertyString",
+                            "Generator",
+                            self.name,
+                            "Name of the command computing the points"
+                            ).Generator = generator
+        selfobj.addProperty("App::PropertyLinkSubList",
+                            "Edges",
+                            self.name,
+                            "Input edges")
+        selfobj.addProperty("App::PropertyLinkSubList",
+                            "Points",
+                            self.name,
+                            "Input points")
+        selfobj.addProperty("App::PropertyFloatList",
+                            "Coordinates",
+                            self.name,
+                            "Packed coordinates x0, y0, z0, x1, ...")
+        selfobj.addProperty("App::PropertyInteger",
+                            "NumberOfPoints",
+                            self.name,
+                            "Number of points").NumberOfPoints = 0
+
+        selfobj.setEditorMode("Generator", 1)
+        selfobj.setEditorMode("Edges", 1)
+        selfobj.setEditorMode("Points", 1)
+        selfobj.setEditorMode("Coordinates", 1)
+        selfobj.setEditorMode("NumberOfPoints", 1)
+        selfobj.Proxy = self
+
+    # this method is mandatory
+    def execute(self, selfobj):
+        """ Doing a recomputation.
+        """
+        m_properties_list = ['Generator',
+                             'Edges',
+                             'Points',
+                             'Coordinates'
+                             ]
+        for m_property in m_properties_list:
+            if m_property not in selfobj.PropertiesList:
+                return
+
+        if M_DEBUG:
+            print("running PointArray.execute !")
+
+        # Create the object the first time regardless
+        # the parametric behavior
+        if selfobj.Parametric == 'Not' and self.created:
+            return
+        if selfobj.Parametric == 'Interactive' and self.created:
+            return
+
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
+        try:
+            m_points = getGenerator(selfobj.Generator)(selfobj)
+            m_points = np.asarray(m_points, dtype=float).reshape(-1, 3)
+            # No point left (i.e. offset beyond the inputs) : the
+            # previous points are cleared, not kept
+            selfobj.Shape = Part.makeCompound(
+                [Part.Vertex(x, y, z) for x, y, z in m_points.tolist()])
+            propertiesPoint(selfobj.Label, self.color)
+            selfobj.Coordinates = m_points.ravel().tolist()
+            selfobj.NumberOfPoints = len(m_points)
+            self.created = True
+            self.storeResult(selfobj)
+        except AttributeError as err:
+            print("AttributeError" + str(err))
+        except Exception as err:
+            printError_msg(err.args[0], title=M_MACRO)
+
+    def onChanged(self, selfobj, prop):
+        """ Run when a proterty change.
+        """
+        if M_DEBUG:
+            print("running PointArray.onChanged !")
+            print("Change property : " + str(prop))
+
+        WF_Object.onChanged(self, selfobj, prop)
+
+        if prop == "Parametric":
+            propertiesPoint(selfobj.Label, self.color)
+            return
+
+        if prop in self.outputProperties or prop == "Generator":
+            return
+        # Inputs are Edges, Points and the parameters added by the
+        # generator command into the PointArray group
+        if prop in selfobj.PropertiesList and \
+                selfobj.getGroupOfProperty(prop) == "PointArray":
+            selfobj.Proxy.requestExecute(selfobj)
+
+    def viewProperties(self, selfobj):
+        propertiesPoint(selfobj.Label, self.color)
+
+
+class ViewProviderPointArray:
+    icon = M_ICON_NAME
+
+    def __init__(self, vobj):
+        """ Set this object to the proxy object of the actual view provider """
+        vobj.Proxy = self
+
+    # this method is mandatory
+    def attach(self, vobj):
+        self.ViewObject = vobj
+        self.Object = vobj.Object
+
+    def setEdit(self, vobj, mode):
+        return False
+
+    def unsetEdit(self, vobj, mode):
+        return
+
+    def __getstate__(self):
+        return None
+
+    def __setstate__(self, state):
+        return None
+
+    # subelements is a tuple of strings
+    def onDelete(self, feature, subelements):
+        return True
+
+    # This method is optional and if not defined a default icon is shown.
+    def getIcon(self):
+        """ Return the icon which will appear in the tree view. """
+        m_icon = self.icon
+        m_generator = getattr(self.Object, 'Generator', None)
+        if m_generator in M_GENERATORS:
+            m_icon = M_GENERATORS[m_generator][2]
+        return os.path.join(PATH_WF_ICONS, m_icon)
+
+    def setIcon(self, icon=M_ICON_NAME):
+        self.icon = icon
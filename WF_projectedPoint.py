@@ -9,6 +9,11 @@ Create projected point(s) on the chosen (main) Plane(s).
 
 Projected Plane(s):
 You can either select one or several of the MAIN plane(s) : XY, XZ, YZ
+or a "Defined plane" : one or several selected planar Face(s) or WF
+Plane(s).
+All Points are projected at once (see WF_batch.projectPointPlaneBatch);
+with the array output (see setOutputArray) the Points projected on each
+plane are held by one single PointArray.
 
 Options:
 You can choose to generated projection dashed lines.
@@ -21,17 +26,17 @@ How to
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from FreeCAD import Base
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Point
+from WF_Objects_base import WF_Point, isExecuteSuspended
 from WF_Objects_base import WF_Line
 import WF_twoPointsLine as twoPL
 import WF_alongLinePoint as aLP
+from WF_pointArray import makePointArrayFeature
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -50,10 +55,13 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import *
+    from WF_links import getLinkPoint, getLinkSubShape, getLinkListPoints
+    from WF_batch import projectPointPlaneBatch, toArray, toVectors
+    from WF_bulk import BulkBuilder
     from WF_command import Command
 except ImportError:
     print("ERROR: Cannot load WF modules !")
@@ -67,6 +75,7 @@ M_EXCEPTION_MSG = """
 Unable to create a Projected Point(s) :
  - Select one or several Points(s) and/or
  - Select one or several Line/Edge(s) to process 2 ends points
+ - With "Defined plane", select also one or several Plane/Face(s)
 
 and go to Parameter(s) Window in Task Panel!"""
 # - Select one or several Plane/Face(s) to process all Points at once and/or
@@ -79,6 +88,7 @@ M_TOOL_TIP = """<b>Create projected point(s)</b> on chosen or main Planes.<br>
 <br>
 - Select one or several Points and/or<br>
  - Select one or several Line/Edge(s) to process 2 ends points and/or<br>
+ - With "Defined plane", select also one or several Plane/Face(s)<br>
 
 - Then Click on the Button/Icon<br>
 <br>
@@ -110,6 +120,12 @@ M_SEL_PLANE_LIST = ["Defined plane",
 M_PROJ_LINE = False
 M_GROUP = None
 M_NUMBER_SYM_POINTS = 0
+M_OUTPUT_ARRAY = False
+# MAIN plane -> (normal, point)
+M_MAIN_PLANES = {"XY plane": (Base.Vector(0.0, 0.0, 1.0), Base.Vector()),
+                 "YZ plane": (Base.Vector(1.0, 0.0, 0.0), Base.Vector()),
+                 "XZ plane": (Base.Vector(0.0, 1.0, 0.0), Base.Vector()),
+                 }
 ###############
 
 
@@ -119,14 +135,14 @@ def setSelectedPlane(selected_plane):
     Parameters
     -------
     *selected_plane* : (String, Mandatory)
-            either "XY plane", "YZ plane" or "XZ plane".
+            either "Defined plane", "XY plane", "YZ plane" or "XZ plane".
     """
     global M_SEL_PLANE
     if selected_plane in M_SEL_PLANE_LIST:
         M_SEL_PLANE = selected_plane
     else:
         raise Exception(
-            "Not valid 'selected_plane' option : must be either 'XY plane', 'YZ plane' or 'XZ plane'")
+            "Not valid 'selected_plane' option : must be either 'Defined plane', 'XY plane', 'YZ plane' or 'XZ plane'")
 
 
 def getSelectedPlane():
@@ -134,7 +150,7 @@ def getSelectedPlane():
 
     Return
     -------
-    either "XY plane", "YZ plane" or "XZ plane".
+    either "Defined plane", "XY plane", "YZ plane" or "XZ plane".
 
     """
     return M_SEL_PLANE
@@ -183,6 +199,46 @@ def getNumberSymmetrics():
     return M_NUMBER_SYM_POINTS
 
 
+def setOutputArray(output_array):
+    """ Set the output of the command when several points are created.
+
+    Parameters
+    -------
+    *output_array* : (Boolean, Mandatory)
+            if True one single PointArray feature holds all points
+            projected on each plane (no projection lines nor
+            symmetric points are generated),
+            if False one ProjectedPoint feature is created per point.
+    """
+    global M_OUTPUT_ARRAY
+    M_OUTPUT_ARRAY = bool(output_array)
+
+
+def isOutputArray():
+    """ Get the output of the command when several points are created.
+
+    Return
+    -------
+    True if one single PointArray feature is created per plane.
+    """
+    return M_OUTPUT_ARRAY
+
+
+def projectionPlane(at, plane):
+    """ Return (normal, point) of the projection plane.
+
+    *at*    : "Defined plane" or one of the MAIN planes.
+    *plane* : link to the planar Face used for "Defined plane".
+    """
+    if at == "Defined plane":
+        if plane is None:
+            raise Exception("No selected plane for 'Defined plane' !")
+        return planeOfFace(getLinkSubShape(plane, 'Face'))
+    if at in M_MAIN_PLANES:
+        return M_MAIN_PLANES[at]
+    raise Exception("Not valid plane option!")
+
+
 class ProjectedPointPanel:
     """ The ProjectedPointPanel (GUI).
     """
@@ -199,6 +255,11 @@ class ProjectedPointPanel:
 
         self.form.UI_ProjectePoint_spin_numberSymPoint.setValue(
             M_NUMBER_SYM_POINTS)
+        self.form.UI_ProjectePoint_checkBox_array.setCheckState(
+            QtCore.Qt.Unchecked)
+        if M_OUTPUT_ARRAY:
+            self.form.UI_ProjectePoint_checkBox_array.setCheckState(
+                QtCore.Qt.Checked)
 
     def accept(self):
         """ Run when click on OK button.
@@ -206,20 +267,24 @@ class ProjectedPointPanel:
         global M_SEL_PLANE
         global M_PROJ_LINE
         global M_NUMBER_SYM_POINTS
+        global M_OUTPUT_ARRAY
         M_SEL_PLANE = self.form.UI_ProjectePoint_comboBox.currentText()
         M_PROJ_LINE = self.form.UI_ProjectePoint_checkBox.isChecked()
         M_NUMBER_SYM_POINTS = self.form.UI_ProjectePoint_spin_numberSymPoint.value()
+        M_OUTPUT_ARRAY = self.form.UI_ProjectePoint_checkBox_array.isChecked()
 
         if WF.verbose():
             print_msg("M_SEL_PLANE = " + str(M_SEL_PLANE))
             print_msg("M_PROJ_LINE = " + str(M_PROJ_LINE))
             print_msg("M_NUMBER_SYM_POINTS = " + str(M_NUMBER_SYM_POINTS))
+            print_msg("M_OUTPUT_ARRAY = " + str(M_OUTPUT_ARRAY))
 
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                projected_point_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    projected_point_command()
         return True
 
     def reject(self):
@@ -231,8 +296,7 @@ class ProjectedPointPanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
 
 
 def makeProjectedPointFeature(group):
@@ -250,7 +314,8 @@ def makeProjectedPointFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         ProjectedPoint(m_obj)
-        ViewProviderProjectedPoint(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderProjectedPoint(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -323,38 +388,26 @@ class ProjectedPoint(WF_Point):
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             vector_point = None
             if selfobj.Point is not None:
-                # n = eval(selfobj.Point[1][0].lstrip('Vertex'))
-                m_n = re.sub('[^0-9]', '', selfobj.Point1[1][0])
-                m_n = int(m_n)
                 if M_DEBUG:
-                    print_msg(str(selfobj.Point1))
-                    print_msg("m_n = " + str(m_n))
-
-                point1 = selfobj.Point[0].Shape.Vertexes[m_n - 1].Point
-                x = point1.x
-                y = point1.y
-                z = point1.z
-
-                if selfobj.Plane is None:
-                    # No selected plane so projection on one of MAIN planes
-                    if selfobj.At == "XY plane":
-                        vector_point = Base.Vector(x, y, 0.0)
-                    elif selfobj.At == "YZ plane":
-                        vector_point = Base.Vector(0.0, y, z)
-                    elif selfobj.At == "XZ plane":
-                        vector_point = Base.Vector(x, 0.0, z)
-                    else:
-                        printError_msg(
-                            "Not valid plane option!", title=M_MACRO)
-                else:
-                    # A selected plane
-                    pass
-#                     p=App.Vector(1,1,1)
-#                     p.projectToPlane(App.Vector(0,0,0),App.Vector(1,0,1))
-# projectToPlane parameters are (point on plane,normal direction)
+                    print_msg(str(selfobj.Point))
+
+                point1 = getLinkPoint(selfobj.Point)
+
+                # Projection on the selected plane ("Defined plane")
+                # or on one of MAIN planes
+                plane_normal, plane_point = projectionPlane(selfobj.At,
+                                                            selfobj.Plane)
+                vector_point = toVectors(projectPointPlaneBatch(
+                    [point1], plane_normal, plane_point))[0]
 
             if vector_point is not None:
                 point = Part.Point(vector_point)
@@ -387,6 +440,7 @@ class ProjectedPoint(WF_Point):
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -409,8 +463,8 @@ class ProjectedPoint(WF_Point):
                     selfobj.setEditorMode("At", 0)
             propertiesPoint(selfobj.Label, self.color)
 
-        if prop == "At":
-            selfobj.Proxy.execute(selfobj)
+        if prop in ["At", "Plane"]:
+            selfobj.Proxy.requestExecute(selfobj)
         if M_DEBUG:
             print("running ProjectedPoint.onChanged done!")
 
@@ -430,7 +484,7 @@ class ProjectedPoint(WF_Point):
 #                                 s1.append((o.Object, el))
 #         selfobj.Points = list(s1)
 
-        selfobj.Proxy.execute(selfobj)
+        selfobj.Proxy.requestExecute(selfobj)
         # self.execute(selfobj)
 
 
@@ -472,6 +526,42 @@ class ViewProviderProjectedPoint:
         self.icon = icon
 
 
+def projectedPointArray(selfobj):
+    """ PointArray generator : returns the projections of all input
+    Points on the plane defined by At (and Plane), as a (N,3) array.
+    """
+    plane_normal, plane_point = projectionPlane(selfobj.At, selfobj.Plane)
+    return projectPointPlaneBatch(toArray(getLinkListPoints(selfobj.Points)),
+                                  plane_normal,
+                                  plane_point)
+
+
+def buildArray(macro, group, vertexes, at, plane=None):
+    """ Build one PointArray feature object holding the projections
+    of all points on one plane.
+    """
+    if WF.verbose():
+        print_msg("vertexes = " + str(vertexes))
+        print_msg("at = " + str(at) + " plane = " + str(plane))
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makePointArrayFeature(group, "ProjectedPoint")
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.addProperty("App::PropertyLinkSub",
+                                "Plane",
+                                "PointArray",
+                                "Input Plane")
+            selfobj.addProperty("App::PropertyEnumeration",
+                                "At",
+                                "PointArray",
+                                "Indicates the projection plane")
+            selfobj.At = M_SEL_PLANE_LIST
+            selfobj.At = at
+            if plane is not None:
+                selfobj.Plane = tuple(plane)
+            selfobj.Points = [tuple(m_vertex) for m_vertex in vertexes]
+        m_bulk.add(selfobj)
+
+
 class CommandProjectedPoint:
     """ Command to create ProjectedPoint feature object. """
 
@@ -482,12 +572,14 @@ class CommandProjectedPoint:
                 'ToolTip': M_TOOL_TIP}
 
     def Activated(self):
-        m_act_doc = App.activeDocument()
-        if m_act_doc is not None:
-            if len(Gui.Selection.getSelectionEx(m_act_doc.Name)) == 0:
-                Gui.Control.showDialog(ProjectedPointPanel())
+        # One selection snapshot for the panel and the command
+        with SelectionSnapshot():
+            m_act_doc = App.activeDocument()
+            if m_act_doc is not None:
+                if not hasSelection():
+                    Gui.Control.showDialog(ProjectedPointPanel())
 
-        projected_point_command()
+            projected_point_command()
 
     def IsActive(self):
         if App.ActiveDocument:
@@ -500,60 +592,41 @@ if App.GuiUp:
     Gui.addCommand("ProjectedPoint", CommandProjectedPoint())
 
 
+@collectErrors(M_MACRO)
 def projected_point_command():
+    """ This command use the selected object(s) to try to build
+    ProjectedPoint feature object(s) (or PointArray(s)).
+    """
     global M_GROUP
     m_sel, m_act_doc = getSel(WF.verbose())
-
-    def touch(selfobj):
-        if str(selfobj.Parametric) == 'Interactive':
-            selfobj.Parametric = 'Dynamic'
-            selfobj.touch()
-            selfobj.Parametric = 'Interactive'
-        if str(selfobj.Parametric) == 'Not':
-            selfobj.Parametric = 'Dynamic'
-            selfobj.touch()
-            selfobj.Parametric = 'Not'
-
-    try:
-        number_of_vertexes, vertex_list = m_sel.get_pointsNames(
-            getfrom=["Points",
-                     "Segments",
-                     "Curves",
-                     "Planes",
-                     "Objects"
-                     ])
-        if WF.verbose():
-            print_msg("number_of_vertexes = " + str(number_of_vertexes))
-            print_msg("vertex_list = " + str(vertex_list))
-
-        if number_of_vertexes < 1:
-            raise Exception(M_EXCEPTION_MSG)
-
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Segments", "Curves", "Planes", "Objects"]
+        planes_from = ["Planes", "Objects"]
         try:
-            m_main_dir = "WorkPoints_P"
-            m_sub_dir = "Set001"
-            M_GROUP = createFolders(str(m_main_dir))
-            m_error_msg = "Could not Create '"
-            m_error_msg += str(m_sub_dir) + "' Objects Group!"
-
-            # Create a sub group if needed
-            if number_of_vertexes > 1 or M_SEL_PLANE in M_SEL_MULTI or M_PROJ_LINE:
-                try:
-                    m_ob = App.ActiveDocument.getObject(
-                        str(m_main_dir)).newObject(
-                        "App::DocumentObjectGroup", str(m_sub_dir))
-                    M_GROUP = m_act_doc.getObject(str(m_ob.Label))
-                except Exception as err:
-                    printError_msg(err.args[0], title=M_MACRO)
-                    printError_msg(m_error_msg)
-
-            if WF.verbose():
-                print_msg("Group = " + str(M_GROUP.Label))
-
-            for point in vertex_list:
-                if WF.verbose():
-                    print_msg("Selected plane" + str(M_SEL_PLANE))
-
+            # Projection on selected plane(s) : the points of the
+            # selected planes are not projected
+            if M_SEL_PLANE == "Defined plane":
+                points_from = ["Points", "Segments", "Curves", "Objects"]
+                number_of_planes, plane_list = m_sel.get_planesNames(
+                    getfrom=planes_from)
+                if number_of_planes < 1:
+                    raise Exception(M_EXCEPTION_MSG)
+                m_planes = []
+                m_not_planar = []
+                for m_plane in plane_list:
+                    try:
+                        projectionPlane("Defined plane", m_plane)
+                        m_planes.append(("Defined plane", m_plane))
+                    except Exception:
+                        m_not_planar.append(str(m_plane[0].Label) + "." +
+                                            str(m_plane[1]))
+                if m_not_planar:
+                    printError_msgWithTimer(
+                        "Not planar Face(s) skipped : " +
+                        ", ".join(m_not_planar), title=M_MACRO)
+                if not m_planes:
+                    raise Exception(M_EXCEPTION_MSG)
+            else:
                 # Possible selections
                 # "XY plane",
                 # "YZ plane",
@@ -562,47 +635,64 @@ def projected_point_command():
                 # "XY, XZ planes",
                 # "YZ, XZ planes",
                 # "XY, YZ, XZ planes"
-                # "Already Selected planes",
-
-                if M_SEL_PLANE in ["XY plane",
-                                   "XY, YZ planes",
-                                   "XY, XZ planes",
-                                   "XY, YZ, XZ planes"]:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj = makeProjectedPointFeature(M_GROUP)
-                    selfobj.Point = point
-                    selfobj.At = "XY plane"
-                    selfobj.Proxy.execute(selfobj)
-                    WF.touch(selfobj)
-
-                if M_SEL_PLANE in ["YZ plane",
-                                   "XY, YZ planes",
-                                   "YZ, XZ planes",
-                                   "XY, YZ, XZ planes"]:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj = makeProjectedPointFeature(M_GROUP)
-                    selfobj.Point = point
-                    selfobj.At = "YZ plane"
-                    selfobj.Proxy.execute(selfobj)
-                    WF.touch(selfobj)
-                if M_SEL_PLANE in ["XZ plane",
-                                   "XY, XZ planes",
-                                   "YZ, XZ planes",
-                                   "XY, YZ, XZ planes"]:
-                    App.ActiveDocument.openTransaction(M_MACRO)
-                    selfobj = makeProjectedPointFeature(M_GROUP)
-                    selfobj.Point = point
-                    selfobj.At = "XZ plane"
-                    selfobj.Proxy.execute(selfobj)
-                    WF.touch(selfobj)
-        except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
+                m_planes = [(m_at, None) for m_at in ["XY plane",
+                                                      "YZ plane",
+                                                      "XZ plane"]
+                            if m_at[:2] in M_SEL_PLANE]
 
-        App.ActiveDocument.commitTransaction()
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
+            if WF.verbose():
+                print_msg("number_of_vertexes = " + str(number_of_vertexes))
+                print_msg("vertex_list = " + str(vertex_list))
+
+            if number_of_vertexes < 1:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                m_main_dir = "WorkPoints_P"
+                m_sub_dir = "Set001"
+                M_GROUP = createFolders(str(m_main_dir))
+                m_error_msg = "Could not Create '"
+                m_error_msg += str(m_sub_dir) + "' Objects Group!"
+
+                # One PointArray per plane
+                m_array = M_OUTPUT_ARRAY and number_of_vertexes > 1
+
+                # Create a sub group if needed
+                if not m_array and (number_of_vertexes > 1 or
+                                    len(m_planes) > 1 or M_PROJ_LINE):
+                    try:
+                        m_ob = App.ActiveDocument.getObject(
+                            str(m_main_dir)).newObject(
+                            "App::DocumentObjectGroup", str(m_sub_dir))
+                        M_GROUP = m_act_doc.getObject(str(m_ob.Label))
+                    except Exception as err:
+                        printError_msg(err.args[0], title=M_MACRO)
+                        printError_msg(m_error_msg)
 
-    except Exception as err:
-        printError_msg(err.args[0], title=M_MACRO)
+                if WF.verbose():
+                    print_msg("Group = " + str(M_GROUP.Label))
+                    print_msg("Selected plane" + str(M_SEL_PLANE))
+
+                for m_at, m_plane in m_planes:
+                    if m_array:
+                        buildArray(M_MACRO, M_GROUP, vertex_list, m_at,
+                                   m_plane)
+                        continue
+                    for point in vertex_list:
+                        selfobj = makeProjectedPointFeature(M_GROUP)
+                        with selfobj.Proxy.batchEdit(selfobj):
+                            selfobj.Point = tuple(point)
+                            if m_plane is not None:
+                                selfobj.Plane = tuple(m_plane)
+                            selfobj.At = m_at
+                        m_builder.add(selfobj)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 if __name__ == '__main__':
     projected_point_command()
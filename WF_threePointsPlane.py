@@ -15,13 +15,12 @@ Width and Length of the plane in current units.
 """
 import sys
 import os.path
-import re
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Plane
+from WF_Objects_base import WF_Plane, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -40,11 +39,13 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import isEqualVectors, isColinearVectors, minMaxVectorsLimits, meanVectorsPoint, propertiesPlane
+    from WF_links import getLinkPoint
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: cannot load WF modules !")
     sys.exit(1)
@@ -123,8 +124,9 @@ class ThreePointsPlanePanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                three_points_plane_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    three_points_plane_command()
         return True
 
     def reject(self):
@@ -136,8 +138,7 @@ class ThreePointsPlanePanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return (len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0)
+        return not hasSelection()
 
 
 def makeThreePointsPlaneFeature(group):
@@ -155,7 +156,8 @@ def makeThreePointsPlaneFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         ThreePointsPlane(m_obj)
-        ViewProviderThreePointsPlane(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderThreePointsPlane(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -225,53 +227,49 @@ class ThreePointsPlane(WF_Plane):
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             plane = None
             if selfobj.Point1 is not None and selfobj.Point2 is not None and selfobj.Point3 is not None:
-                # n1 = eval(selfobj.Point1[1][0].lstrip('Vertex'))
-                # n2 = eval(selfobj.Point2[1][0].lstrip('Vertex'))
-                # n3 = eval(selfobj.Point3[1][0].lstrip('Vertex'))
-                m_n1 = re.sub('[^0-9]', '', selfobj.Point1[1][0])
-                m_n2 = re.sub('[^0-9]', '', selfobj.Point2[1][0])
-                m_n3 = re.sub('[^0-9]', '', selfobj.Point3[1][0])
-                m_n1 = int(m_n1)
-                m_n2 = int(m_n2)
-                m_n3 = int(m_n3)
                 if M_DEBUG:
                     print_msg(str(selfobj.Point1))
                     print_msg(str(selfobj.Point2))
                     print_msg(str(selfobj.Point3))
-                    print_msg("m_n1 = " + str(m_n1))
-                    print_msg("m_n2 = " + str(m_n2))
-                    print_msg("m_n3 = " + str(m_n3))
 
                 points = []
-                point_a = selfobj.Point1[0].Shape.Vertexes[m_n1 - 1].Point
-                point_b = selfobj.Point2[0].Shape.Vertexes[m_n2 - 1].Point
-                point_c = selfobj.Point3[0].Shape.Vertexes[m_n3 - 1].Point
+                point_a = getLinkPoint(selfobj.Point1)
+                point_b = getLinkPoint(selfobj.Point2)
+                point_c = getLinkPoint(selfobj.Point3)
+                m_tolerance = WF.tolerance()
 
-                if isEqualVectors(point_a, point_b):
+                if isEqualVectors(point_a, point_b, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 1 and 2 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isEqualVectors(point_a, point_c):
+                if isEqualVectors(point_a, point_c, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 1 an 3 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isEqualVectors(point_b, point_c):
+                if isEqualVectors(point_b, point_c, m_tolerance):
                     m_msg = """Unable to create Plane from 2 equals Points :
                     Points 2 an 3 are equals !
                     """
                     printError_msg(m_msg, title=M_MACRO)
                     return
 
-                if isColinearVectors(point_a, point_b, point_c):
+                if isColinearVectors(point_a, point_b, point_c,
+                                     m_tolerance):
                     printError_msg(M_EXCEPTION_MSG, title=M_MACRO)
                     return
 
@@ -312,6 +310,7 @@ class ThreePointsPlane(WF_Plane):
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -335,7 +334,7 @@ class ThreePointsPlane(WF_Plane):
             propertiesPlane(selfobj.Label, self.color)
 
         if prop == "Extension":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
 
 class ViewProviderThreePointsPlane:
@@ -386,54 +385,52 @@ def buildFromThreePoints(macro, group, vertexes, extension):
         print_msg("vertex2 = " + str(vertex2))
         print_msg("vertex3 = " + str(vertex3))
 
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeThreePointsPlaneFeature(group)
-    selfobj.Point1 = vertex1
-    selfobj.Point2 = vertex2
-    selfobj.Point3 = vertex3
-    selfobj.Extension = extension
-    selfobj.Proxy.execute(selfobj)
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeThreePointsPlaneFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Point1 = vertex1
+            selfobj.Point2 = vertex2
+            selfobj.Point3 = vertex3
+            selfobj.Extension = extension
+        m_bulk.add(selfobj)
 
 
+@collectErrors(M_MACRO)
 def three_points_plane_command():
     """ This command use the selected object(s) to try to build a
     ThreePointsPlane feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Curves", "Objects"]
+        try:
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
 
-    points_from = ["Points", "Curves", "Objects"]
-    try:
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
+            if number_of_vertexes < 3:
+                raise Exception(M_EXCEPTION_MSG)
 
-        if number_of_vertexes < 3:
-            raise Exception(M_EXCEPTION_MSG)
+            try:
+                m_main_dir = "WorkPlanes_P"
+                m_sub_dir = "Set000"
+                m_group = createFolders(str(m_main_dir))
 
-        try:
-            m_main_dir = "WorkPlanes_P"
-            m_sub_dir = "Set000"
-            m_group = createFolders(str(m_main_dir))
-
-            # Create a sub group if needed
-            if number_of_vertexes > 6:
-                m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
-
-            # Case of only 3 points
-            if number_of_vertexes == 3:
-                buildFromThreePoints(
-                    M_MACRO, m_group, vertex_list, M_PLANE_EXT)
-            else:
-                raise Exception(M_EXCEPTION_MSG)
+                # Create a sub group if needed
+                if number_of_vertexes > 6:
+                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
 
-        except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
+                # Case of only 3 points
+                if number_of_vertexes == 3:
+                    buildFromThreePoints(
+                        M_MACRO, m_group, vertex_list, M_PLANE_EXT)
+                else:
+                    raise Exception(M_EXCEPTION_MSG)
 
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
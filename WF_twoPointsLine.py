@@ -28,13 +28,12 @@ How to
 - Then Click on the icon
 """
 import sys
-import re
 import FreeCAD as App
 import Part
 from PySide import QtCore
 from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
 import WF
-from WF_Objects_base import WF_Line
+from WF_Objects_base import WF_Line, isExecuteSuspended
 
 if App.GuiUp:
     import FreeCADGui as Gui
@@ -53,11 +52,13 @@ if not sys.path.__contains__(str(PATH_WF_UTILS)):
     sys.path.append(str(PATH_WF_UI))
 
 try:
-    from WF_selection import getSel
-    from WF_print import printError_msg, print_msg, printError_msgWithTimer
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
     from WF_directory import createFolders, addObjectToGrp, createSubGroup
     from WF_geometry import isEqualVectors, coordVectorPoint, propertiesLine
+    from WF_links import getLinkPoint
     from WF_command import Command
+    from WF_bulk import BulkBuilder
 except ImportError:
     print("ERROR: cannot load WF modules !")
     sys.exit(1)
@@ -169,8 +170,9 @@ class TwoPointsLinePanel:
         Gui.Control.closeDialog()
         m_act_doc = App.activeDocument()
         if m_act_doc is not None:
-            if Gui.Selection.getSelectionEx(m_act_doc.Name):
-                two_points_line_command()
+            with SelectionSnapshot():
+                if hasSelection():
+                    two_points_line_command()
         return True
 
     def reject(self):
@@ -182,8 +184,7 @@ class TwoPointsLinePanel:
     def shouldShow(self):
         """ Must show when nothing selected.
         """
-        return len(Gui.Selection.getSelectionEx(
-            App.activeDocument().Name)) == 0
+        return not hasSelection()
 
 
 def makeTwoPointsLineFeatureFromList(selectionset, group):
@@ -201,7 +202,8 @@ def makeTwoPointsLineFeatureFromList(selectionset, group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         TwoPointsLine(m_obj)
-        ViewProviderTwoPointsLine(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderTwoPointsLine(m_obj.ViewObject)
         m_obj.Proxy.addSubobjects(m_obj, selectionset)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
@@ -226,7 +228,8 @@ def makeTwoPointsLineFeature(group):
         if group is not None:
             addObjectToGrp(m_obj, group, info=1)
         TwoPointsLine(m_obj)
-        ViewProviderTwoPointsLine(m_obj.ViewObject)
+        if App.GuiUp:
+            ViewProviderTwoPointsLine(m_obj.ViewObject)
     except Exception as err:
         printError_msg("Not able to add an object to Model!")
         printError_msg(err.args[0], title=M_MACRO)
@@ -293,23 +296,21 @@ Negative number allowed.
             if selfobj.Parametric == 'Interactive' and self.created:
                 return
 
+        if isExecuteSuspended():
+            return
+
+        if self.restoreResult(selfobj):
+            return
+
         try:
             line = None
             if selfobj.Point1 is not None and selfobj.Point2 is not None:
-                # n1 = eval(selfobj.Point1[1][0].lstrip('Vertex'))
-                # n2 = eval(selfobj.Point2[1][0].lstrip('Vertex'))
-                m_n1 = re.sub('[^0-9]', '', selfobj.Point1[1][0])
-                m_n2 = re.sub('[^0-9]', '', selfobj.Point2[1][0])
-                m_n1 = int(m_n1)
-                m_n2 = int(m_n2)
                 if M_DEBUG:
                     print_msg(str(selfobj.Point1))
                     print_msg(str(selfobj.Point2))
-                    print_msg("m_n1 = " + str(m_n1))
-                    print_msg("m_n2 = " + str(m_n2))
 
-                point1 = selfobj.Point1[0].Shape.Vertexes[m_n1 - 1].Point
-                point2 = selfobj.Point2[0].Shape.Vertexes[m_n2 - 1].Point
+                point1 = getLinkPoint(selfobj.Point1)
+                point2 = getLinkPoint(selfobj.Point2)
 
                 if isEqualVectors(point1, point2):
                     m_msg = """Unable to create Line(s) from 2 Points :
@@ -343,6 +344,7 @@ Negative number allowed.
                 # To be compatible with previous version 2018
                 if 'Parametric' in selfobj.PropertiesList:
                     self.created = True
+                    self.storeResult(selfobj)
         except AttributeError as err:
             print("AttributeError" + str(err))
         except Exception as err:
@@ -366,12 +368,12 @@ Negative number allowed.
             propertiesLine(selfobj.Label, self.color)
 
         if prop == "Extension":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
         if prop == "Point1":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
         if prop == "Point2":
-            selfobj.Proxy.execute(selfobj)
+            selfobj.Proxy.requestExecute(selfobj)
 
     def addSubobjects(self, selfobj, pointlinks):
         "adds pointlinks to this TwoPointsLine object"
@@ -386,7 +388,7 @@ Negative number allowed.
                         if o.Object.Name != selfobj.Name:
                             objs.append((o.Object, el))
         selfobj.Points = objs
-        selfobj.Proxy.execute(selfobj)
+        selfobj.Proxy.requestExecute(selfobj)
         # self.execute(selfobj)
 
 
@@ -438,12 +440,13 @@ def buildFromOnePointAndOneObject(vertex1, object1, group):
             print_msg("vertex1 = " + str(vertex1))
             print_msg("object1 = " + str(object1))
 
-        App.ActiveDocument.openTransaction("Macro TwoPointsLine")
-        selfobj = makeTwoPointsLineFeature(group)
-        selfobj.Point1 = vertex1
-        selfobj.Point2 = [object1, "Vertex1"]
-        selfobj.Extension = 0.0
-        selfobj.Proxy.execute(selfobj)
+        with BulkBuilder("Macro TwoPointsLine") as m_bulk:
+            selfobj = makeTwoPointsLineFeature(group)
+            with selfobj.Proxy.batchEdit(selfobj):
+                selfobj.Point1 = vertex1
+                selfobj.Point2 = [object1, "Vertex1"]
+                selfobj.Extension = 0.0
+            m_bulk.add(selfobj)
         try:
             Gui.ActiveDocument.getObject(selfobj.Label).DrawStyle = "Dotted"
         except Exception as err:
@@ -462,70 +465,89 @@ def buildFromPoints(
         print_msg("vertex1 = " + str(vertex1))
         print_msg("vertex2 = " + str(vertex2))
 
-    App.ActiveDocument.openTransaction(macro)
-    selfobj = makeTwoPointsLineFeature(group)
-    selfobj.Point1 = vertex1
-    selfobj.Point2 = vertex2
-    selfobj.Extension = line_ext
-    selfobj.Proxy.execute(selfobj)
-    WF.touch(selfobj)
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makeTwoPointsLineFeature(group)
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.Point1 = vertex1
+            selfobj.Point2 = vertex2
+            selfobj.Extension = line_ext
+        m_bulk.add(selfobj)
 
 
+@collectErrors(M_MACRO)
 def two_points_line_command():
     """ This command use the selected object(s) to try to build a
     TwoPointsLine feature object.
     """
     m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        points_from = ["Points", "Curves", "Objects"]
+        try:
+            number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
+                get_from=points_from)
 
-    points_from = ["Points", "Curves", "Objects"]
-    try:
-        number_of_vertexes, vertex_list = m_sel.get_pointsWithNames(
-            get_from=points_from)
+            if number_of_vertexes < 2:
+                raise Exception(M_EXCEPTION_MSG)
 
-        if number_of_vertexes < 2:
-            raise Exception(M_EXCEPTION_MSG)
+            try:
+                m_main_dir = "WorkAxis_P"
+                m_sub_dir = "Set000"
+                m_group = createFolders(str(m_main_dir))
 
-        try:
-            m_main_dir = "WorkAxis_P"
-            m_sub_dir = "Set000"
-            m_group = createFolders(str(m_main_dir))
-
-            # Create a sub group if needed
-            if number_of_vertexes > 2:
-                m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
-
-            # Case of only 2 points
-            if number_of_vertexes == 2:
-                if WF.verbose():
-                    print_msg("Process only 2 points")
-                vertex1 = vertex_list[0]
-                vertex2 = vertex_list[1]
-
-                buildFromPoints(M_MACRO,
-                                m_group,
-                                vertex1, vertex2, M_LINE_EXT)
-
-            # Case of more than 2 points
-            else:
-                if M_BYPAIR:
+                # Create a sub group if needed
+                if number_of_vertexes > 2:
+                    m_group = createSubGroup(m_act_doc, m_main_dir, m_sub_dir)
+
+                # Case of only 2 points
+                if number_of_vertexes == 2:
                     if WF.verbose():
-                        print_msg("Process points by pair")
-                    # even
-                    if (number_of_vertexes % 2 == 0):
-                        if WF.verbose():
-                            print_msg("Even number of points")
-                        for i in range(0, number_of_vertexes - 1, 2):
-                            vertex1 = vertex_list[i]
-                            vertex2 = vertex_list[i + 1]
+                        print_msg("Process only 2 points")
+                    vertex1 = vertex_list[0]
+                    vertex2 = vertex_list[1]
 
-                            buildFromPoints(M_MACRO,
-                                            m_group,
-                                            vertex1, vertex2, M_LINE_EXT)
-                    # odd
+                    buildFromPoints(M_MACRO,
+                                    m_group,
+                                    vertex1, vertex2, M_LINE_EXT)
+
+                # Case of more than 2 points
+                else:
+                    if M_BYPAIR:
+                        if WF.verbose():
+                            print_msg("Process points by pair")
+                        # even
+                        if (number_of_vertexes % 2 == 0):
+                            if WF.verbose():
+                                print_msg("Even number of points")
+                            for i in range(0, number_of_vertexes - 1, 2):
+                                vertex1 = vertex_list[i]
+                                vertex2 = vertex_list[i + 1]
+
+                                buildFromPoints(M_MACRO,
+                                                m_group,
+                                                vertex1, vertex2, M_LINE_EXT)
+                        # odd
+                        else:
+                            if WF.verbose():
+                                print_msg("Odd number of points")
+                            for i in range(0, number_of_vertexes - 2, 2):
+                                vertex1 = vertex_list[i]
+                                vertex2 = vertex_list[i + 1]
+
+                                buildFromPoints(M_MACRO,
+                                                m_group,
+                                                vertex1, vertex2, M_LINE_EXT)
+
+                            if WF.closePolyline():
+                                vertex1 = vertex_list[-1]
+                                vertex2 = vertex_list[0]
+
+                                buildFromPoints(M_MACRO,
+                                                m_group,
+                                                vertex1, vertex2, M_LINE_EXT)
                     else:
                         if WF.verbose():
-                            print_msg("Odd number of points")
-                        for i in range(0, number_of_vertexes - 2, 2):
+                            print_msg("Process points as list")
+                        for i in range(number_of_vertexes - 1):
                             vertex1 = vertex_list[i]
                             vertex2 = vertex_list[i + 1]
 
@@ -540,33 +562,12 @@ def two_points_line_command():
                             buildFromPoints(M_MACRO,
                                             m_group,
                                             vertex1, vertex2, M_LINE_EXT)
-                else:
-                    if WF.verbose():
-                        print_msg("Process points as list")
-                    for i in range(number_of_vertexes - 1):
-                        vertex1 = vertex_list[i]
-                        vertex2 = vertex_list[i + 1]
 
-                        buildFromPoints(M_MACRO,
-                                        m_group,
-                                        vertex1, vertex2, M_LINE_EXT)
-
-                    if WF.closePolyline():
-                        vertex1 = vertex_list[-1]
-                        vertex2 = vertex_list[0]
-
-                        buildFromPoints(M_MACRO,
-                                        m_group,
-                                        vertex1, vertex2, M_LINE_EXT)
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
 
         except Exception as err:
-            printError_msg(err.args[0], title=M_MACRO)
-
-    except Exception as err:
-        printError_msgWithTimer(err.args[0], title=M_MACRO)
-
-    App.ActiveDocument.commitTransaction()
-    App.activeDocument().recompute()
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
 
 
 if App.GuiUp:
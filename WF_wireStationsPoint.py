@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   This file is part of Work Feature workbench                           *
+*                                                                         *
+*   Copyright (c) 2017-2019 <rentlau_64>                                  *
+***************************************************************************
+Create Points (stations) every Distance along whole Wire(s).
+
+The stations run across Edge boundaries : the Edges of each Wire are
+chained in order and their lengths concatenated into one arc length
+index, then all stations of all Wires are located at once
+(straight Edges in one vectorized pass, curved Edges with their arc
+length tables, see Utils/WF_arcLength.py).
+All points are stored into one single PointArray object.
+
+Distance between stations : (10.0 by default)
+Distance of the first station : (0.0 by default)
+from the start of each Wire.
+The end of an open Wire is a station if it falls on it; a closed Wire
+does not repeat its first station.
+
+How to
+- Select one or several Wire(s) (i.e. Sketch or Wire objects)
+- Then Click on the icon
+"""
+import sys
+import os.path
+import numpy as np
+import FreeCAD as App
+from WF_config import PATH_WF_ICONS, PATH_WF_UTILS, PATH_WF_UI
+import WF
+from WF_pointArray import makePointArrayFeature
+
+if App.GuiUp:
+    import FreeCADGui as Gui
+
+__title__ = "Macro WireStationsPoint"
+__author__ = "Rentlau_64"
+__brief__ = '''
+Macro WireStationsPoint.
+Creates a parametric PointArray of stations along Wires
+'''
+###############
+M_DEBUG = False
+###############
+if not sys.path.__contains__(str(PATH_WF_UTILS)):
+    sys.path.append(str(PATH_WF_UTILS))
+    sys.path.append(str(PATH_WF_UI))
+
+try:
+    from WF_selection import getSel, SelectionSnapshot, hasSelection
+    from WF_print import printError_msg, print_msg, printError_msgWithTimer, collectErrors
+    from WF_directory import createFolders
+    from WF_geometry import isStraightEdge
+    from WF_arcLength import getArcLengthTable
+    from WF_batch import toArray
+    from WF_links import getLinkListSubShapes
+    from WF_command import Command
+    from WF_bulk import BulkBuilder
+except ImportError:
+    print("ERROR: Cannot load WF modules !")
+    sys.exit(1)
+
+###############
+M_ICON_NAME = "WF_wireStationsPoint.svg"
+M_DIALOG = "WF_UI_wireStationsPoint.ui"
+M_DIALOG_TITLE = "Define distance between stations."
+M_EXCEPTION_MSG = """
+Unable to create Points along Wire(s) :
+- Select one or several Wire(s) (i.e. Sketch or Wire objects);
+
+and go to Parameter(s) Window in Task Panel!"""
+M_RESULT_MSG = " : Points along Wire(s) created !"
+M_MENU_TEXT = "Point(s) = stations(Wire)"
+M_ACCEL = ""
+M_TOOL_TIP = """<b>Create Points</b> every Distance along whole Wire(s),<br>
+across Edge boundaries.<br>
+All points are stored into one single PointArray object.<br>
+<br>
+- Select one or several Wire(s) (i.e. Sketch or Wire objects)<br>
+- Then Click on the Button/Icon<br>
+<br>
+<i>Click in view window without selection will popup<br>
+ - a Warning Window and<br>
+ - a Parameter(s) Window in Task Panel!</i>
+"""
+###############
+M_MACRO = "Macro WireStationsPoint"
+M_STEP = 10.0
+M_OFFSET = 0.0
+###############
+
+
+def setStep(step):
+    """ Set distance between stations.
+
+    Parameters
+    -------
+    *step* : (Float, Mandatory)
+            Distance along the Wire in between two consecutive points
+            (must be positive).
+    """
+    global M_STEP
+    if float(step) <= 0.0:
+        raise ValueError("Distance between stations must be positive !")
+    M_STEP = float(step)
+
+
+def getStep():
+    """ Get distance between stations.
+
+    Return
+    -------
+    A Float.
+    """
+    return M_STEP
+
+
+def setOffset(offset):
+    """ Set distance of the first station from the start of the Wire.
+
+    Parameters
+    -------
+    *offset* : (Float, Mandatory)
+            The stations before the start of the Wire
+            (negative offset) are not created.
+    """
+    global M_OFFSET
+    M_OFFSET = float(offset)
+
+
+def getOffset():
+    """ Get distance of the first station from the start of the Wire.
+
+    Return
+    -------
+    A Float.
+    """
+    return M_OFFSET
+
+
+class WireStationsPointPanel:
+    """ The WireStationsPointPanel (GUI).
+    """
+
+    def __init__(self):
+        self.form = Gui.PySideUic.loadUi(os.path.join(PATH_WF_UI, M_DIALOG))
+        self.form.setWindowTitle(M_DIALOG_TITLE)
+
+        self.form.UI_Step.setText(str(M_STEP))
+        self.form.UI_Offset.setText(str(M_OFFSET))
+
+    def accept(self):
+        """ Run when click on OK button.
+        """
+        try:
+            setStep(self.form.UI_Step.text())
+            setOffset(self.form.UI_Offset.text())
+        except ValueError as err:
+            printError_msg(err.args[0], title=M_MACRO)
+            return False
+
+        if WF.verbose():
+            print_msg("M_STEP = " + str(M_STEP))
+            print_msg("M_OFFSET = " + str(M_OFFSET))
+
+        Gui.Control.closeDialog()
+        m_act_doc = App.activeDocument()
+        if m_act_doc is not None:
+            with SelectionSnapshot():
+                if hasSelection():
+                    wire_stations_point_command()
+        return True
+
+    def reject(self):
+        """ Run when click on CANCEL button.
+        """
+        Gui.Control.closeDialog()
+        return False
+
+    def shouldShow(self):
+        """ Must show when nothing selected.
+        """
+        return not hasSelection()
+
+
+def wireEdges(wire):
+    """ Returns the Edges of a Wire chained in order, as a list of
+    (edge, reversed, point at FirstParameter, point at LastParameter)
+    where reversed is True if the Edge runs from its LastParameter to its
+    FirstParameter in the direction of the Wire.
+    """
+    m_edges = getattr(wire, 'OrderedEdges', None) or wire.Edges
+    m_ends = [(m_edge.valueAt(m_edge.FirstParameter),
+               m_edge.valueAt(m_edge.LastParameter)) for m_edge in m_edges]
+    m_chain = []
+    m_end = None
+    for m_edge, (m_first, m_last) in zip(m_edges, m_ends):
+        if m_end is not None:
+            m_reversed = m_last.distanceToPoint(m_end) < \
+                m_first.distanceToPoint(m_end)
+        elif len(m_edges) > 1:
+            # The first Edge ends where the second one is connected
+            m_next = m_ends[1]
+            m_reversed = min(m_first.distanceToPoint(m_next[0]),
+                             m_first.distanceToPoint(m_next[1])) < \
+                min(m_last.distanceToPoint(m_next[0]),
+                    m_last.distanceToPoint(m_next[1]))
+        else:
+            m_reversed = False
+        m_chain.append((m_edge, m_reversed, m_first, m_last))
+        m_end = m_first if m_reversed else m_last
+    return m_chain
+
+
+def wireStationsPointArray(selfobj):
+    """ PointArray generator : returns the points every Step along each
+    input Wire (starting at Offset), as a (N,3) array.
+    """
+    m_step = selfobj.Step
+    if m_step <= 0.0:
+        raise Exception("Distance between stations must be positive !")
+
+    # One concatenated arc length index for the Edges of all Wires
+    m_chain = []
+    m_wire_edges = []
+    for m_wire in getLinkListSubShapes(selfobj.Wires, 'Wire'):
+        m_wire_chain = wireEdges(m_wire)
+        if m_wire_chain:
+            m_chain.extend(m_wire_chain)
+            m_wire_edges.append(len(m_wire_chain))
+    if len(m_chain) == 0:
+        return np.empty((0, 3))
+
+    m_edges = [m_link[0] for m_link in m_chain]
+    m_reversed = np.array([m_link[1] for m_link in m_chain], dtype=bool)
+    vectors_a = toArray([m_link[2] for m_link in m_chain])
+    vectors_b = toArray([m_link[3] for m_link in m_chain])
+    m_lengths = np.array([m_edge.Length for m_edge in m_edges])
+    m_ends = np.cumsum(m_lengths)
+    m_starts = m_ends - m_lengths
+    m_last_edges = np.cumsum(m_wire_edges) - 1
+    m_first_edges = m_last_edges - np.array(m_wire_edges) + 1
+    m_wire_starts = m_starts[m_first_edges]
+    m_wire_lengths = m_ends[m_last_edges] - m_wire_starts
+
+    # Ends of the Edges in the direction of the Wires
+    m_firsts = np.where(m_reversed[:, None], vectors_b, vectors_a)
+    m_lasts = np.where(m_reversed[:, None], vectors_a, vectors_b)
+    m_closed = np.linalg.norm(m_firsts[m_first_edges] -
+                              m_lasts[m_last_edges], axis=1) <= WF.tolerance()
+
+    # Number of stations of each Wire
+    m_offset = selfobj.Offset
+    m_tolerance = WF.tolerance()
+    # No station before the start of the Wires
+    if m_offset < 0.0:
+        m_offset += max(np.ceil((-m_offset - m_tolerance) / m_step),
+                        0.0) * m_step
+    m_counts = np.floor((m_wire_lengths - m_offset + m_tolerance) /
+                        m_step).astype(int) + 1
+    m_counts[m_wire_lengths - m_offset < -m_tolerance] = 0
+    m_counts[m_closed] = np.minimum(
+        m_counts[m_closed],
+        np.ceil((m_wire_lengths[m_closed] - m_offset - m_tolerance) /
+                m_step).astype(int))
+    m_counts = np.maximum(m_counts, 0)
+    if m_counts.sum() == 0:
+        return np.empty((0, 3))
+
+    # All stations at once into the concatenated index
+    m_ranks = np.arange(m_counts.sum()) - np.repeat(
+        np.cumsum(m_counts) - m_counts, m_counts)
+    m_stations = np.repeat(m_wire_starts, m_counts) + \
+        np.clip(m_offset + m_ranks * m_step, 0.0,
+                np.repeat(m_wire_lengths, m_counts))
+    m_index = np.clip(np.searchsorted(m_starts, m_stations, side='right') - 1,
+                      0, len(m_edges) - 1)
+    # Stay on the last Edge of its own Wire
+    m_index = np.minimum(m_index, np.repeat(m_last_edges, m_counts))
+    m_local = np.clip(m_stations - m_starts[m_index], 0.0,
+                      m_lengths[m_index])
+    m_local = np.where(m_reversed[m_index],
+                       m_lengths[m_index] - m_local,
+                       m_local)
+
+    # Straight Edges in one pass
+    m_ratio = np.where(m_lengths[m_index] > 0.0,
+                       m_local / np.where(m_lengths[m_index] > 0.0,
+                                          m_lengths[m_index], 1.0),
+                       0.0)
+    m_points = vectors_a[m_index] + \
+        (vectors_b[m_index] - vectors_a[m_index]) * m_ratio[:, None]
+
+    # Curved Edges : one arc length table per Edge
+    for m_i, m_edge in enumerate(m_edges):
+        if isStraightEdge(m_edge):
+            continue
+        m_rows = m_index == m_i
+        if np.any(m_rows):
+            m_points[m_rows] = getArcLengthTable(m_edge).pointsAt(
+                m_local[m_rows])
+    return m_points
+
+
+def buildArray(macro, group, wires, step, offset):
+    """ Build one PointArray feature object holding the stations of
+    all wires.
+    """
+    if WF.verbose():
+        print_msg("wires = " + str(wires))
+    with BulkBuilder(macro) as m_bulk:
+        selfobj = makePointArrayFeature(group, "WireStationsPoint")
+        with selfobj.Proxy.batchEdit(selfobj):
+            selfobj.addProperty("App::PropertyLinkSubList",
+                                "Wires",
+                                "PointArray",
+                                "Input wires")
+            selfobj.addProperty("App::PropertyFloat",
+                                "Step",
+                                "PointArray",
+                                "Distance between stations")
+            selfobj.addProperty("App::PropertyFloat",
+                                "Offset",
+                                "PointArray",
+                                "Distance of the first station")
+            selfobj.Step = step
+            selfobj.Offset = offset
+            selfobj.Wires = [tuple(m_wire) for m_wire in wires]
+        m_bulk.add(selfobj)
+
+
+@collectErrors(M_MACRO)
+def wire_stations_point_command():
+    """ This command use the selected object(s) to try to build a
+    PointArray of stations along Wires.
+    """
+    m_sel, m_act_doc = getSel(WF.verbose())
+    with BulkBuilder(M_MACRO) as m_builder:
+        try:
+            number_of_wires, wire_list = m_sel.get_curvesWithNames()
+
+            if number_of_wires == 0:
+                raise Exception(M_EXCEPTION_MSG)
+
+            try:
+                if WF.verbose():
+                    print_msg("Step = " + str(M_STEP))
+
+                m_main_dir = "WorkPoints_P"
+                m_group = createFolders(str(m_main_dir))
+
+                buildArray(M_MACRO,
+                           m_group,
+                           wire_list,
+                           M_STEP, M_OFFSET)
+
+            except Exception as err:
+                printError_msg(err.args[0], title=M_MACRO)
+
+        except Exception as err:
+            printError_msgWithTimer(err.args[0], title=M_MACRO)
+
+
+if App.GuiUp:
+    Gui.addCommand("WireStationsPoint", Command(M_ICON_NAME,
+                                                M_MENU_TEXT,
+                                                M_ACCEL,
+                                                M_TOOL_TIP,
+                                                WireStationsPointPanel,
+                                                wire_stations_point_command))
+
+
+if __name__ == '__main__':
+    wire_stations_point_command()
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the WF geometry and selection kernels, run without FreeCAD
+on the stand-in modules (see Utils/WF_standin.py).
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import numpy as np
+import pytest
+
+PATH_WF = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for m_path in [os.path.join(PATH_WF, 'Utils'), PATH_WF]:
+    if m_path not in sys.path:
+        sys.path.insert(0, m_path)
+
+import WF_standin
+WF_standin.install(gui=True)
+
+import FreeCAD as App
+import FreeCADGui as Gui
+import Part
+import WF_geometry as geom
+import WF_batch
+import WF_fit
+import WF_selection
+import WF_arcLength
+
+
+def _vectors(array):
+    return [App.Vector(x, y, z) for x, y, z in np.asarray(array).tolist()]
+
+
+@pytest.fixture
+def doc():
+    m_doc = App.newDocument("WF_Tests")
+    yield m_doc
+    WF_selection.setSelection(None)
+    Gui.Selection.clearSelection()
+    App.closeDocument(m_doc.Name)
+
+
+@pytest.fixture
+def rng():
+    return np.random.RandomState(0)
+
+
+def test_equal_vectors_batch(rng):
+    m_a = rng.uniform(-10, 10, (50, 3))
+    m_b = m_a.copy()
+    m_b[::2] += rng.uniform(-1e-13, 1e-13, (25, 3))
+    m_b[1::2] += rng.uniform(-1.0, 1.0, (25, 3))
+    m_mask = WF_batch.isEqualVectorsBatch(m_a, m_b, 1e-12)
+    m_expected = [geom.isEqualVectors(m_va, m_vb, 1e-12) for m_va, m_vb in
+                  zip(_vectors(m_a), _vectors(m_b))]
+    assert m_mask.tolist() == m_expected
+
+
+def test_along_two_points_batch(rng):
+    m_a = rng.uniform(-10, 10, (20, 3))
+    m_b = rng.uniform(-10, 10, (20, 3))
+    m_index = np.arange(20) % 5
+    m_points, m_valid = WF_batch.alongTwoPointsPointBatch(m_a, m_b,
+                                                          m_index, 4)
+    assert m_valid.all()
+    for m_i, (m_va, m_vb) in enumerate(zip(_vectors(m_a), _vectors(m_b))):
+        m_point = geom.alongTwoPointsPoint(m_va, m_vb, int(m_index[m_i]), 4)
+        assert np.allclose(m_points[m_i], tuple(m_point))
+
+
+def test_closest_points_segments_batch(rng):
+    m_vects = [rng.uniform(-10, 10, (20, 3)) for _ in range(4)]
+    m_p, m_q = WF_batch.closestPointsSegmentsBatch(*m_vects)
+    for m_i, m_args in enumerate(zip(*[_vectors(m_v) for m_v in m_vects])):
+        m_point_p, m_point_q = geom.closestPointsSegments(*m_args)
+        assert np.allclose(m_p[m_i], tuple(m_point_p))
+        assert np.allclose(m_q[m_i], tuple(m_point_q))
+
+
+def test_intersect_perpendicular_line_batch(rng):
+    m_a = rng.uniform(-10, 10, (20, 3))
+    m_b = rng.uniform(-10, 10, (20, 3))
+    m_c = rng.uniform(-10, 10, (20, 3))
+    m_t, m_distance, m_tprime, m_valid = \
+        WF_batch.intersectPerpendicularLineBatch(m_a, m_b, m_c)
+    assert m_valid.all()
+    for m_i, m_args in enumerate(zip(_vectors(m_a), _vectors(m_b),
+                                     _vectors(m_c))):
+        m_point_t, m_dist, m_point_tprime = \
+            geom.intersectPerpendicularLine(*m_args)
+        assert np.allclose(m_t[m_i], tuple(m_point_t))
+        assert np.isclose(m_distance[m_i], m_dist)
+        assert np.allclose(m_tprime[m_i], tuple(m_point_tprime))
+
+
+def test_unique_points_index(rng):
+    m_points = np.round(rng.uniform(0, 3, (300, 3)), 1) + \
+        rng.normal(0.0, 1e-10, (300, 3))
+    m_kept = []
+    for m_i, m_point in enumerate(m_points):
+        if not any(np.all(np.abs(m_point - m_points[m_j]) <= 1e-9)
+                   for m_j in m_kept):
+            m_kept.append(m_i)
+    assert WF_batch.uniquePointsIndex(m_points, 1e-9).tolist() == m_kept
+
+
+def test_fit_line(rng):
+    m_t = rng.uniform(-10, 10, 200)
+    m_points = np.outer(m_t, [1.0, 2.0, 2.0]) + [1.0, 0.0, -1.0]
+    m_center, m_singular, m_axes = WF_fit.fitLine(m_points)
+    assert abs(abs(m_axes[0].dot([1.0, 2.0, 2.0]) / 3.0) - 1.0) < 1e-9
+    assert m_singular[1] < 1e-6
+    # Same result whatever the chunk size
+    m_chunked = WF_fit.fitLine(m_points, chunk_size=7)
+    assert np.allclose(m_chunked[0], m_center)
+
+
+def test_fit_plane(rng):
+    m_xy = rng.uniform(-10, 10, (200, 2))
+    m_points = np.column_stack((m_xy, 0.5 * m_xy[:, 0] + 3.0))
+    m_center, _, m_axes, m_rms = WF_fit.fitPlane(m_points)
+    m_normal = np.array([0.5, 0.0, -1.0]) / np.sqrt(1.25)
+    assert abs(abs(m_axes[2].dot(m_normal)) - 1.0) < 1e-9
+    assert m_rms < 1e-6
+    assert WF_fit.maxPlaneDeviation(m_points, m_center, m_axes[2]) < 1e-9
+
+
+def test_ransac_line(rng):
+    m_t = rng.uniform(0, 10, 80)
+    m_points = np.vstack((np.outer(m_t, [1.0, 0.0, 0.0]),
+                          rng.uniform(-20, 20, (20, 3))))
+    _, _, m_axes, m_inliers = WF_fit.ransacLine(m_points, tolerance=1e-6)
+    assert m_inliers >= 80
+    assert abs(abs(m_axes[0][0]) - 1.0) < 1e-9
+
+
+class _ArcEdge():
+    """ Circular arc edge of radius r, center origin, in XY plane
+    (only what the arc length tables use).
+    """
+
+    def __init__(self, radius, first, last):
+        self.radius = radius
+        self.FirstParameter = first
+        self.LastParameter = last
+        self.Length = radius * (last - first)
+
+    def hashCode(self):
+        return id(self)
+
+    def valueAt(self, u):
+        return App.Vector(self.radius * np.cos(u), self.radius * np.sin(u),
+                          0.0)
+
+    def derivative1At(self, u):
+        return App.Vector(-self.radius * np.sin(u),
+                          self.radius * np.cos(u), 0.0)
+
+    def derivative2At(self, u):
+        return App.Vector(-self.radius * np.cos(u),
+                          -self.radius * np.sin(u), 0.0)
+
+
+def test_arc_length_table():
+    m_edge = _ArcEdge(5.0, 0.0, 1.5 * np.pi)
+    m_table = WF_arcLength.ArcLengthTable(m_edge)
+    assert np.isclose(m_table.length, m_edge.Length)
+    m_distances = np.linspace(0.0, m_edge.Length, 7)
+    assert np.allclose(m_table.parameterAt(m_distances), m_distances / 5.0)
+    # Points off the arc, far ones included
+    for m_point, m_expected in [((0, 7, 0), 2.5 * np.pi),
+                                ((0, 12, 0), 2.5 * np.pi),
+                                ((0, 20, 0), 2.5 * np.pi),
+                                ((3, 4, 0), 5.0 * np.arctan2(4, 3)),
+                                ((-5, -0.1, 0),
+                                 5.0 * (np.pi + np.arctan2(0.1, 5))),
+                                ((1, -9, 0), m_edge.Length),
+                                ((9, -1, 0), 0.0)]:
+        assert np.isclose(m_table.distanceOf(App.Vector(*m_point)),
+                          m_expected, atol=1e-9)
+
+
+def test_selection_names(doc):
+    m_obj = doc.addObject("Part::Feature", "Square")
+    m_obj.Shape = Part.makePolygon([App.Vector(0, 0, 0),
+                                    App.Vector(4, 0, 0),
+                                    App.Vector(4, 4, 0),
+                                    App.Vector(0, 4, 0),
+                                    App.Vector(0, 0, 0)])
+    Gui.Selection.addSelection(m_obj, ["Edge1", "Edge3", "Vertex2"])
+
+    m_sel, _ = WF_selection.getSel()
+    assert m_sel.numberOfEntities == 3
+    m_number, m_edges = m_sel.get_segmentsWithNames(get_from=["Segments"])
+    assert m_number == 2
+    assert [m_name for _, m_name in m_edges] == ["Edge1", "Edge3"]
+    # Names are 1-based
+    m_number, m_points = m_sel.get_pointsWithNames(
+        get_from=["Points", "Segments"], dedupe=False)
+    assert m_points[0][1] == "Vertex2"
+    assert "Vertex0" not in [m_name for _, m_name in m_points]
+    # Picked points are never merged, the found ones are
+    m_number, m_points = m_sel.get_pointsWithNames(
+        get_from=["Points", "Segments"], dedupe=True)
+    assert [m_name for _, m_name in m_points] == \
+        ["Vertex2", "Vertex1", "Vertex3", "Vertex4"]
+
+    # The observer gives the same selection
+    WF_selection.startObserver()
+    try:
+        Gui.Selection.clearSelection()
+        Gui.Selection.addSelection(m_obj, ["Edge1", "Edge3", "Vertex2"])
+        m_observed, _ = WF_selection.getSel()
+        assert m_observed.get_segmentsWithNames(
+            get_from=["Segments"])[1] == m_edges
+    finally:
+        WF_selection.stopObserver()
+
+
+def test_selection_compound_of_wires(doc):
+    # i.e. a Sketch with many Wires, selected as a whole object
+    m_obj = doc.addObject("Part::Feature", "Sketch")
+    m_obj.Shape = Part.makeCompound([
+        Part.makePolygon([App.Vector(0, 0, 0), App.Vector(1, 0, 0),
+                          App.Vector(1, 1, 0)]),
+        Part.makePolygon([App.Vector(5, 0, 0), App.Vector(6, 0, 0)])])
+    WF_selection.setSelection([(m_obj, [])])
+    m_sel, _ = WF_selection.getSel()
+    m_number, m_wires = m_sel.get_curvesWithNames()
+    assert m_number == 2
+    assert [m_name for _, m_name in m_wires] == ["Wire1", "Wire2"]
+
+
+def test_center_line_point_division(doc):
+    import WF_centerLinePoint
+    m_obj = doc.addObject("Part::Feature", "Line")
+    m_obj.Shape = Part.makePolygon([App.Vector(0, 0, 0),
+                                    App.Vector(10, 0, 0)])
+    m_location = WF_centerLinePoint.getLocation()
+    m_number = WF_centerLinePoint.getNumberLinePart()
+    try:
+        WF_centerLinePoint.setLocation("Division")
+        WF_centerLinePoint.setNumberLinePart(4)
+        WF_selection.setSelection([(m_obj, ["Edge1"])])
+        WF_centerLinePoint.center_line_point_command()
+    finally:
+        WF_centerLinePoint.setLocation(m_location)
+        WF_centerLinePoint.setNumberLinePart(m_number)
+
+    m_arrays = [m_o for m_o in doc.Objects
+                if "Coordinates" in m_o.PropertiesList]
+    assert len(m_arrays) == 1
+    m_array = m_arrays[0]
+    assert m_array.NumberOfPoints == 5
+    m_points = np.array(m_array.Coordinates).reshape(-1, 3)
+    assert np.allclose(m_points[:, 0], [0.0, 2.5, 5.0, 7.5, 10.0])
+    assert len(m_array.Shape.Vertexes) == 5